@@ -3,7 +3,7 @@ from pathlib import Path
 from django.conf import settings
 from django.db.models import Prefetch
 from django.http import (
-    HttpResponse,
+    FileResponse,
     Http404,
 )
 from django.shortcuts import get_object_or_404
@@ -15,6 +15,7 @@ from apps.public.book.models import (
 from django.views.generic import DetailView, ListView
 
 from apps.public.book.toc import read_toc
+from base.http import get_byte_range_response
 from erudit.utils import qs_cache_key
 
 
@@ -81,7 +82,6 @@ def chapter_pdf_view(request, collection_slug, slug, chapter_id):
         # no chapter with that id in this book
         raise Http404
     pdf_file = open(str(Path(settings.BOOKS_DIRECTORY) / chapter.pdf_path), "rb")
-    response = HttpResponse(content=pdf_file)
-    response["Content-Type"] = "application/pdf"
+    response = FileResponse(pdf_file, content_type="application/pdf")
     response["Content-Disposition"] = 'filename="{}.pdf"'.format(chapter_id)
-    return response
+    return get_byte_range_response(request, response)
@@ -1,14 +1,21 @@
 import datetime
+import functools
 import io
 import re
 import sentry_sdk
 import structlog
+import threading
+import time
+import typing
 
 from arabic_reshaper import reshape
 from bidi.algorithm import get_display
 from bs4 import BeautifulSoup, Tag
+from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils import formats, timezone
+from django.utils import translation
 from django.utils.translation import gettext as _, get_language
 from pathlib import Path
 from reportlab.lib import colors
@@ -22,6 +29,9 @@ from reportlab.platypus import Flowable, Image, KeepInFrame, Paragraph, SimpleDo
 from reportlab.platypus.tables import Table, TableStyle
 from urllib.parse import urlparse
 
+from base.pdf import pdf_process_pool
+from erudit.cache import cache_set
+from erudit.cache import single_flight
 from erudit.models.journal import Article
 from erudit.fedora.cache import get_cached_datastream_content
 
@@ -30,98 +40,144 @@ logger = structlog.get_logger()
 STATIC_ROOT = str(Path(__file__).parents[3] / "static")
 FONTS_DIR = str(Path(STATIC_ROOT) / "fonts")
 
-# NotoSerif font
-registerFont(TTFont("NotoSerif", FONTS_DIR + "/Noto/NotoSerif-Regular.ttf"))
-registerFont(TTFont("NotoSerif-Bold", FONTS_DIR + "/Noto/NotoSerif-Bold.ttf"))
-registerFont(TTFont("NotoSerif-Italic", FONTS_DIR + "/Noto/NotoSerif-Italic.ttf"))
-registerFont(TTFont("NotoSerif-BoldItalic", FONTS_DIR + "/Noto/NotoSerif-BoldItalic.ttf"))
-registerFontFamily(
-    "NotoSerif",
-    normal="NotoSerif",
-    bold="NotoSerif-Bold",
-    italic="NotoSerif-Italic",
-    boldItalic="NotoSerif-BoldItalic",
-)
-addMapping("NotoSerif", 0, 0, "NotoSerif")
-addMapping("NotoSerif-Bold", 1, 0, "NotoSerif Bold")
-addMapping("NotoSerif-Italic", 0, 1, "NotoSerif Italic")
-addMapping("NotoSerif-BoldItalic", 1, 1, "NotoSerif Bold Italic")
-
-# SpectralSC font (small caps)
-registerFont(TTFont("SpectralSC", FONTS_DIR + "/Spectral/SpectralSC-Regular.ttf"))
-registerFont(TTFont("SpectralSC-Bold", FONTS_DIR + "/Spectral/SpectralSC-Bold.ttf"))
-registerFont(TTFont("SpectralSC-Italic", FONTS_DIR + "/Spectral/SpectralSC-Italic.ttf"))
-registerFont(TTFont("SpectralSC-BoldItalic", FONTS_DIR + "/Spectral/SpectralSC-BoldItalic.ttf"))
-registerFontFamily(
-    "SpectralSC",
-    normal="SpectralSC",
-    bold="SpectralSC-Bold",
-    italic="SpectralSC-Italic",
-    boldItalic="SpectralSC-BoldItalic",
-)
-addMapping("SpectralSC", 0, 0, "SpectralSC")
-addMapping("SpectralSC-Bold", 1, 0, "SpectralSC Bold")
-addMapping("SpectralSC-Italic", 0, 1, "SpectralSC Italic")
-addMapping("SpectralSC-BoldItalic", 1, 1, "SpectralSC Bold Italic")
-
-# Symbola font (emojis)
-registerFont(TTFont("Symbola", FONTS_DIR + "/Symbola/Symbola.ttf"))
-registerFontFamily("Symbola", normal="Symbola")
-addMapping("Symbola", 0, 0, "Symbola")
-
-# NotoSerifCJK font (chinese, japanese, korean)
-registerFont(TTFont("NotoSerifCJKsc", FONTS_DIR + "/Noto/NotoSerifCJKsc-Regular.ttf"))
-registerFont(TTFont("NotoSerifCJKsc-Bold", FONTS_DIR + "/Noto/NotoSerifCJKsc-Bold.ttf"))
-registerFont(TTFont("NotoSerifCJKsc-Italic", FONTS_DIR + "/Noto/NotoSerifCJKsc-Regular.ttf"))
-registerFont(TTFont("NotoSerifCJKsc-BoldItalic", FONTS_DIR + "/Noto/NotoSerifCJKsc-Bold.ttf"))
-registerFontFamily(
-    "NotoSerifCJKsc",
-    normal="NotoSerifCJKsc",
-    bold="NotoSerifCJKsc-Bold",
-    italic="NotoSerifCJKsc-Italic",
-    boldItalic="NotoSerifCJKsc-BoldItalic",
-)
-addMapping("NotoSerifCJKsc", 0, 0, "NotoSerifCJKsc")
-addMapping("NotoSerifCJKsc-Bold", 1, 0, "NotoSerifCJKsc Bold")
-addMapping("NotoSerifCJKsc-Italic", 0, 1, "NotoSerifCJKsc Italic")
-addMapping("NotoSerifCJKsc-BoldItalic", 1, 1, "NotoSerifCJKsc Bold Italic")
-
-# NotoSansCanadianAboriginal font
-registerFont(
-    TTFont(
-        "NotoSansCanadianAboriginal",
-        FONTS_DIR + "/Noto/NotoSansCanadianAboriginal-Regular.ttf",
-    )
-)
-registerFontFamily("NotoSansCanadianAboriginal", normal="NotoSansCanadianAboriginal")
-addMapping("NotoSansCanadianAboriginal", 0, 0, "NotoSansCanadianAboriginal")
-
-# Amiri font (arabic)
-registerFont(TTFont("Amiri", FONTS_DIR + "/Amiri/Amiri-Regular.ttf"))
-registerFont(TTFont("Amiri-Bold", FONTS_DIR + "/Amiri/Amiri-Bold.ttf"))
-registerFont(TTFont("Amiri-Italic", FONTS_DIR + "/Amiri/Amiri-Slanted.ttf"))
-registerFont(TTFont("Amiri-BoldItalic", FONTS_DIR + "/Amiri/Amiri-BoldSlanted.ttf"))
-registerFontFamily(
-    "Amiri",
-    normal="Amiri",
-    bold="Amiri-Bold",
-    italic="Amiri-Italic",
-    boldItalic="Amiri-BoldItalic",
-)
-addMapping("Amiri", 0, 0, "Amiri")
-addMapping("Amiri-Bold", 1, 0, "Amiri Bold")
-addMapping("Amiri-Italic", 0, 1, "Amiri Italic")
-addMapping("Amiri-BoldItalic", 1, 1, "Amiri Bold Italic")
-
-# Dicts of supported characters in our fonts.
-noto_chars = TTFont("NotoSerif", FONTS_DIR + "/Noto/NotoSerif-Regular.ttf").face.charWidths
-cjk_chars = TTFont("NotoSerifCJKsc", FONTS_DIR + "/Noto/NotoSerifCJKsc-Regular.ttf").face.charWidths
-symbola_chars = TTFont("Symbola", FONTS_DIR + "/Symbola/Symbola.ttf").face.charWidths
-aboriginal_chars = TTFont(
-    "NotoSansCanadianAboriginal",
-    FONTS_DIR + "/Noto/NotoSansCanadianAboriginal-Regular.ttf",
-).face.charWidths
-arabic_chars = TTFont("Amiri", FONTS_DIR + "/Amiri/Amiri-Regular.ttf").face.charWidths
+# Font families used in the coverpages: the files of their regular, bold, italic and bold italic
+# variants. Fonts are registered on first use, see `register_font_family()`.
+FONT_FAMILIES = {
+    "NotoSerif": (
+        "Noto/NotoSerif-Regular.ttf",
+        "Noto/NotoSerif-Bold.ttf",
+        "Noto/NotoSerif-Italic.ttf",
+        "Noto/NotoSerif-BoldItalic.ttf",
+    ),
+    # Small caps.
+    "SpectralSC": (
+        "Spectral/SpectralSC-Regular.ttf",
+        "Spectral/SpectralSC-Bold.ttf",
+        "Spectral/SpectralSC-Italic.ttf",
+        "Spectral/SpectralSC-BoldItalic.ttf",
+    ),
+    # Emojis.
+    "Symbola": ("Symbola/Symbola.ttf",),
+    # Chinese, japanese and korean.
+    "NotoSerifCJKsc": (
+        "Noto/NotoSerifCJKsc-Regular.ttf",
+        "Noto/NotoSerifCJKsc-Bold.ttf",
+        "Noto/NotoSerifCJKsc-Regular.ttf",
+        "Noto/NotoSerifCJKsc-Bold.ttf",
+    ),
+    "NotoSansCanadianAboriginal": ("Noto/NotoSansCanadianAboriginal-Regular.ttf",),
+    # Arabic.
+    "Amiri": (
+        "Amiri/Amiri-Regular.ttf",
+        "Amiri/Amiri-Bold.ttf",
+        "Amiri/Amiri-Slanted.ttf",
+        "Amiri/Amiri-BoldSlanted.ttf",
+    ),
+}
+
+_registered_font_families = set()
+_font_registration_lock = threading.Lock()
+
+
+def register_font_family(family: str):
+    """Registers the fonts of the family in ReportLab, if they are not registered yet.
+
+    Loading a font file takes time and memory, so the fonts are only registered when a coverpage
+    needs them. This is thread-safe.
+    """
+    if family in _registered_font_families:
+        return
+    with _font_registration_lock:
+        if family in _registered_font_families:
+            return
+        started_at = time.monotonic()
+        files = FONT_FAMILIES[family]
+        variants = ("", "-Bold", "-Italic", "-BoldItalic")[: len(files)]
+        for variant, file in zip(variants, files):
+            if variant:
+                registerFont(TTFont(f"{family}{variant}", f"{FONTS_DIR}/{file}"))
+            else:
+                # The regular font may already be loaded to check the characters it supports.
+                registerFont(load_font(family))
+        if len(files) == 1:
+            registerFontFamily(family, normal=family)
+        else:
+            registerFontFamily(
+                family,
+                normal=family,
+                bold=f"{family}-Bold",
+                italic=f"{family}-Italic",
+                boldItalic=f"{family}-BoldItalic",
+            )
+        for variant, (bold, italic) in zip(variants, ((0, 0), (1, 0), (0, 1), (1, 1))):
+            addMapping(f"{family}{variant}", bold, italic, f"{family}{variant.replace('-', ' ')}")
+        _registered_font_families.add(family)
+        logger.info(
+            "coverpage.font-registered",
+            family=family,
+            duration=round(time.monotonic() - started_at, 3),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(family: str) -> TTFont:
+    """ Loads the regular font of the family, without registering it. """
+    return TTFont(family, f"{FONTS_DIR}/{FONT_FAMILIES[family][0]}")
+
+
+def get_font_chars(family: str) -> typing.Dict[int, int]:
+    """Returns the widths of the characters supported by the regular font of the family.
+
+    Only the regular font is loaded, the family must be registered before its fonts are used.
+    """
+    return load_font(family).face.charWidths
+
+
+def get_cached_coverpage(article: Article) -> bytes:
+    """Returns the coverpage of the article, generating it only if it is not cached.
+
+    Coverpages are cached by article, language and modification date of the issue, and tagged with
+    the article pid. The generation date printed on a cached coverpage is the date of its first
+    generation.
+    """
+    issue_updated = article.issue.fedora_updated
+    cache_key = "coverpage-{pid}-{lang}-{updated}".format(
+        pid=article.pid,
+        lang=get_language(),
+        updated=issue_updated.timestamp() if issue_updated else None,
+    )
+    coverpage = cache.get(cache_key)
+    if coverpage is not None:
+        return coverpage
+    # Only one process generates the coverpage when the cache is missed, the others wait for it.
+    with single_flight(cache, cache_key) as coverpage:
+        if coverpage is None:
+            if pdf_process_pool.enabled:
+                # The article is retrieved again in the process of the pool, as it cannot be
+                # pickled.
+                coverpage = pdf_process_pool.run(
+                    get_coverpage_from_fedora_ids,
+                    article.issue.journal.code,
+                    article.issue.localidentifier,
+                    article.localidentifier,
+                    get_language(),
+                )
+            else:
+                coverpage = get_coverpage(article)
+            cache_set(
+                cache, cache_key, coverpage, settings.FEDORA_CACHE_TIMEOUT, pids=[article.pid]
+            )
+    return coverpage
+
+
+def get_coverpage_from_fedora_ids(
+    journal_code: str, issue_localidentifier: str, localidentifier: str, language: str
+) -> bytes:
+    """ Returns the coverpage of the article identified by its Fedora ids, in ``language``. """
+    with translation.override(language):
+        return get_coverpage(
+            Article.from_fedora_ids(journal_code, issue_localidentifier, localidentifier)
+        )
 
 
 def get_coverpage(article: Article) -> bytes:
@@ -657,6 +713,7 @@ def get_coverpage(article: Article) -> bytes:
 
 def get_stylesheet(language):
     font_name = "NotoSerifCJKsc" if language in ["zh", "ja", "ko"] else "NotoSerif"
+    register_font_family(font_name)
     stylesheet = StyleSheet1()
     stylesheet.add(
         ParagraphStyle(
@@ -768,6 +825,7 @@ def clean(text, article, font_weight=None):
         node.replace_with(node.text.upper())
     # Change the font of <span class="petitecap"> nodes.
     for node in soup.find_all("span", attrs={"class": "petitecap"}):
+        register_font_family("SpectralSC")
         del node["class"]
         node["fontName"] = "SpectralSC-Bold" if font_weight == "bold" else "SpectralSC"
     # Remove any footnotes.
@@ -783,29 +841,34 @@ def clean(text, article, font_weight=None):
 
     # Check if we have unsupported characters in Noto font.
     text_chars = {ord(c) for c in text}
-    chars_not_in_noto = text_chars.difference(set(noto_chars.keys()))
-    # If we have unsupported characters, check if they are supported by our other fonts.
+    chars_not_in_noto = text_chars.difference(get_font_chars("NotoSerif").keys())
+    # If we have unsupported characters, check if they are supported by our other fonts. These fonts
+    # are only loaded if the text has characters that are not supported by the Noto font.
     if chars_not_in_noto:
         is_arabic = False
         unsupported_characters = []
         for char in chars_not_in_noto:
-            if char in cjk_chars:
+            if char in get_font_chars("NotoSerifCJKsc"):
+                register_font_family("NotoSerifCJKsc")
                 char = chr(char)
                 font_name = "NotoSerifCJKsc-Bold" if font_weight == "bold" else "NotoSerifCJKsc"
                 text = text.replace(char, f'<span fontName="{font_name}">{char}</span>')
-            elif char in symbola_chars:
+            elif char in get_font_chars("Symbola"):
+                register_font_family("Symbola")
                 char = chr(char)
                 text = text.replace(char, f'<span fontName="Symbola">{char}</span>')
-            elif char in aboriginal_chars:
+            elif char in get_font_chars("NotoSansCanadianAboriginal"):
+                register_font_family("NotoSansCanadianAboriginal")
                 char = chr(char)
                 text = text.replace(
                     char,
                     f'<span fontName="NotoSansCanadianAboriginal">{char}</span>',
                 )
-            elif char in arabic_chars:
+            elif char in get_font_chars("Amiri"):
                 # We can't set font on each character because the reshaping of arabic characters
                 # based on their neighbours won't work. See below where we set the Amiri font and we
                 # reshape characters and inverse display right to left when `is_arabic` is True.
+                register_font_family("Amiri")
                 is_arabic = True
             else:
                 unsupported_characters.append(chr(char))
@@ -1,16 +1,16 @@
 from collections import defaultdict, OrderedDict
 from operator import itemgetter
 
-from django.conf import settings
 from django.core.cache import cache
 from django.utils.text import slugify
-import pysolr
 
+from erudit.solr import client as solr_client
+from erudit.solr.cache import cached_search
 from erudit.solr.models import SolrDocument
 
 
 def get_client():
-    return pysolr.Solr(settings.SOLR_ROOT, timeout=settings.SOLR_TIMEOUT)
+    return solr_client.get_client("journal-authors")
 
 
 def _get_first_letter(name):
@@ -30,7 +30,7 @@ def get_journal_authors_article_types(journal_code):
         "rows": "0",
         "facet.field": "TypeArticle_fac",
     }
-    solr_results = client.search(**args)
+    solr_results = cached_search("journal-authors", client, **args)
     facets = solr_results.facets["facet_fields"]["TypeArticle_fac"]
     # See comment for same line in get_journal_authors_letters()
     article_types = facets[::2]
@@ -57,7 +57,7 @@ def get_journal_authors_letters(journal_code, article_type, normalized=True):
         "facet.field": "AuteurNP_fac",
         "facet.limit": "99999",  # all authors
     }
-    solr_results = client.search(**args)
+    solr_results = cached_search("journal-authors", client, **args)
     facets = solr_results.facets["facet_fields"]["AuteurNP_fac"]
     # facets is a list of alternating name and number ['foo', 42, 'bar', 12]
     # You know that very *very* rarely used "step" field in python's list slicing? we're going to
@@ -112,7 +112,7 @@ def get_journal_authors_dict(journal_code, first_letter, article_type):
         "rows": "99999",
         "facet.limit": "0",
     }
-    solr_results = client.search(**args)
+    solr_results = cached_search("journal-authors", client, **args)
     result = defaultdict(list)
     for solr_data in solr_results.docs:
         article = SolrDocument(solr_data)
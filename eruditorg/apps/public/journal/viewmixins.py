@@ -323,8 +323,13 @@ class ArticleAccessLogMixin:
     def dispatch(self, request, *args, **kwargs):
         response = super().dispatch(request, *args, **kwargs)
 
-        # Do not log if status code is not 200.
-        if response.status_code != 200:
+        # Do not log if status code is not 200, except for the partial content responses to the
+        # range requests starting at the beginning of the content. Viewers request the other ranges
+        # of a PDF as it is read, so they are not logged as other accesses to the article.
+        if response.status_code != 200 and not (
+            response.status_code == 206
+            and response.get("Content-Range", "").startswith("bytes 0-")
+        ):
             return response
 
         article = self.get_object()
@@ -7,7 +7,6 @@ import io
 from typing import List
 
 import functools
-import pysolr
 from random import choice, shuffle
 import structlog
 import unicodedata
@@ -20,10 +19,8 @@ from django.urls import reverse
 from django.http import Http404
 from django.http.response import HttpResponsePermanentRedirect
 from django.shortcuts import get_object_or_404
-from django.template import loader
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
-from django.utils.encoding import force_bytes
 from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 from django.utils.translation import get_language, gettext_lazy as _
@@ -37,19 +34,25 @@ from django.core.cache import cache
 
 from rules.contrib.views import PermissionRequiredMixin
 from lxml import etree as et
+from waffle import switch_is_active
 
+from erudit.cache import cache_set
 from erudit.fedora.cache import get_cached_datastream_content
+from erudit.fedora.cache import get_cached_datastream_list
+from erudit.fedora.cache import get_cached_derived_content
 from erudit.fedora.views.generic import FedoraFileDatastreamView
 from erudit.models import Discipline
 from erudit.models import Article
 from erudit.models import Journal
 from erudit.models import Issue
+from erudit.solr.cache import cached_search
+from erudit.solr.client import get_client
 
 from eruditarticle.objects import SummaryArticle
 
 from erudit.utils import locale_aware_sort, qs_cache_key
 
-from base.pdf import add_coverpage_to_pdf, get_pdf_first_page
+from base.pdf import add_coverpage_to_pdf, get_pdf_first_page, pdf_process_pool
 from core.subscription.models import JournalAccessSubscription, InstitutionIPAddressRange
 from apps.public.campaign.models import Campaign
 
@@ -70,7 +73,9 @@ from .viewmixins import (
 
 from . import solr
 
-from .coverpage import get_coverpage
+from .coverpage import get_cached_coverpage
+from .xslt import get_article_html_params
+from .xslt import get_article_html_transform
 
 logger = structlog.get_logger(__name__)
 
@@ -421,6 +426,8 @@ class JournalRawLogoView(SingleJournalMixin, FedoraFileDatastreamView):
     """
 
     model = Journal
+    datastream_passthrough = True
+    max_age = settings.FEDORA_DATASTREAM_MAX_AGE
 
     @property
     def content_type(self) -> str:
@@ -430,6 +437,9 @@ class JournalRawLogoView(SingleJournalMixin, FedoraFileDatastreamView):
     def datastream_name(self) -> str:
         return "LOGO"
 
+    def get_last_modified(self):
+        return self.get_object().fedora_updated
+
 
 class IssueDetailView(
     ContentAccessCheckMixin,
@@ -614,6 +624,8 @@ class IssueRawCoverpageView(FedoraFileDatastreamView):
     """
 
     model = Issue
+    datastream_passthrough = True
+    max_age = settings.FEDORA_DATASTREAM_MAX_AGE
 
     @property
     def content_type(self) -> str:
@@ -626,6 +638,9 @@ class IssueRawCoverpageView(FedoraFileDatastreamView):
     def get_object(self):
         return get_object_or_404(Issue, localidentifier=self.kwargs["localidentifier"])
 
+    def get_last_modified(self):
+        return self.get_object().fedora_updated
+
 
 class IssueRawCoverpageHDView(FedoraFileDatastreamView):
     """
@@ -633,6 +648,8 @@ class IssueRawCoverpageHDView(FedoraFileDatastreamView):
     """
 
     model = Issue
+    datastream_passthrough = True
+    max_age = settings.FEDORA_DATASTREAM_MAX_AGE
 
     @property
     def content_type(self) -> str:
@@ -645,6 +662,9 @@ class IssueRawCoverpageHDView(FedoraFileDatastreamView):
     def get_object(self):
         return get_object_or_404(Issue, localidentifier=self.kwargs["localidentifier"])
 
+    def get_last_modified(self):
+        return self.get_object().fedora_updated
+
 
 class IssueReaderView(ContentAccessCheckMixin, PrepublicationTokenRequiredMixin, DetailView):
     """
@@ -690,6 +710,8 @@ class IssueReaderPageView(
     """
 
     model = Issue
+    datastream_passthrough = True
+    accept_byte_ranges = True
 
     @property
     def content_type(self) -> str:
@@ -706,6 +728,9 @@ class IssueReaderPageView(
         issue = self.get_object()
         return "{}.p{}".format(issue.pid, self.kwargs["page"])
 
+    def get_last_modified(self):
+        return self.get_object().fedora_updated
+
     def get(self, request, *args, **kwargs):
         issue = self.get_object()
         # If the user does not have access to the issue, we only grant access to the 5 first pages.
@@ -730,6 +755,9 @@ class IssueXmlView(
     def get_object(self, queryset=None):
         return get_object_or_404(Issue, localidentifier=self.kwargs["localidentifier"])
 
+    def get_last_modified(self):
+        return self.get_object().fedora_updated
+
 
 class BaseArticleDetailView(
     ArticleAccessLogMixin,
@@ -889,10 +917,41 @@ class BaseArticleDetailView(
     def dispatch(self, *args, **kwargs):
         return super(BaseArticleDetailView, self).dispatch(*args, **kwargs)
 
+    def get_render_xml_content_cache_key(self, article, context):
+        """Returns the cache key of the article's HTML content.
+
+        The issue's Fedora modification timestamp is part of the key so that a new version of the
+        article's XML is never rendered from a stale cache entry. The scheme and the domain of the
+        request are part of the key because the HTML content embeds absolute URLs.
+        """
+        issue = article.issue
+        issue_fedora_updated = issue.fedora_updated.timestamp() if issue.fedora_updated else None
+        access = "full" if context.get("content_access_granted") else "preview"
+        return "render_xml_content-{}-{}-{}-{}-{}-{}-{}-{}-{}-{}".format(
+            article.pid,
+            self.__class__.__name__,
+            access,
+            get_language(),
+            self.request.scheme,
+            self.request.site.domain,
+            issue_fedora_updated,
+            issue.is_published,
+            context.get("in_citation_list"),
+            switch_is_active("maintenance"),
+        )
+
     def render_xml_content(self, context):
         """ Renders the given article instance as HTML. """
 
         article = self.get_object()
+
+        # The rendered HTML content is cached so that neither the article's XML nor the XSLT
+        # transformation are needed on a cache hit.
+        cache_key = self.get_render_xml_content_cache_key(article, context)
+        html_content = cache.get(cache_key)
+        if html_content is not None:
+            return mark_safe(html_content)
+
         context["is_of_type_roc"] = article.erudit_object.is_of_type_roc
         if "article" not in context:
             context["article"] = article
@@ -905,20 +964,21 @@ class BaseArticleDetailView(
             else:
                 context["can_display_first_pdf_page"] = article.can_display_first_pdf_page
 
-        # Renders the templates corresponding to the XSL stylesheet that
-        # will allow us to convert ERUDITXSD300 articles to HTML
-        xsl_template = loader.get_template("public/journal/eruditxsd300_to_html.xsl")
-        xsl = xsl_template.render(context=context, request=self.request)
-
-        # Performs the XSLT transformation
-        lxsl = et.parse(io.BytesIO(force_bytes(xsl)))
-        html_transform = et.XSLT(lxsl)
-        html_content = html_transform(article.erudit_object._dom)
+        # Performs the XSLT transformation with the compiled XSL stylesheet that allows us to
+        # convert ERUDITXSD300 articles to HTML. Everything that depends on the current article
+        # or on the current request is passed to the stylesheet as parameters.
+        html_transform = get_article_html_transform()
+        html_content = html_transform(
+            article.erudit_object._dom,
+            **get_article_html_params(context, self.request),
+        )
 
         # Combine unicode characters (like "a") followed by a unicode combining character (like "˘")
         # by the unicode pre-combined version (like ă).
         html_content = unicodedata.normalize("NFC", str(html_content))
 
+        cache_set(cache, cache_key, html_content, settings.FEDORA_CACHE_TIMEOUT, pids=[article.pid])
+
         return mark_safe(html_content)
 
 
@@ -1115,6 +1175,9 @@ class ArticleXmlView(ArticleFormatDownloadView):
     def datastream_name(self) -> str:
         return "ERUDITXSD300"
 
+    def get_last_modified(self):
+        return self.get_object().issue.fedora_updated
+
     def get_access_type(self) -> ArticleAccessType:
         article = self.get_object()
         if not article.publication_allowed:
@@ -1129,6 +1192,7 @@ class ArticleRawPdfView(ArticleFormatDownloadView):
 
     raise_exception = True
     tracking_view_type = "pdf"
+    accept_byte_ranges = True
 
     @property
     def content_type(self) -> str:
@@ -1142,17 +1206,34 @@ class ArticleRawPdfView(ArticleFormatDownloadView):
             return self.request.GET.get("ds_name")
         return self.object.pdf_datastream_name
 
-    def write_datastream_content(self, response, content):
-        coverpage = get_coverpage(self.get_object())
-        response.content = add_coverpage_to_pdf(coverpage, content)
+    def get_datastream_content(self):
+        # The PDF with its coverpage is cached, so that it is not generated again for each download
+        # and for each of the byte ranges requested by PDF viewers, which must all be taken from
+        # the same file.
+        article = self.get_object()
+        issue_updated = article.issue.fedora_updated
+        cache_key = "article-pdf-{pid}-{datastream_name}-{lang}-{updated}".format(
+            pid=article.pid,
+            datastream_name=self.datastream_name,
+            lang=get_language(),
+            updated=issue_updated.timestamp() if issue_updated else None,
+        )
+        get_pdf_content = super().get_datastream_content
+
+        def get_content():
+            # Get the PDF first, so that the coverpage is not generated for missing PDFs.
+            content = get_pdf_content()
+            coverpage = get_cached_coverpage(article)
+            return pdf_process_pool.run(add_coverpage_to_pdf, coverpage, content)
+
+        return get_cached_derived_content(
+            cache_key, get_content, pids=[article.pid, article.issue.pid]
+        )
 
-    def get_response_object(self):
-        response = super().get_response_object()
+    def get_content_disposition(self):
         if "embed" not in self.request.GET:
-            response["Content-Disposition"] = "inline; filename={}.pdf".format(
-                self.kwargs["localid"]
-            )
-        return response
+            return "inline; filename={}.pdf".format(self.kwargs["localid"])
+        return None
 
     def get_access_type(self) -> ArticleAccessType:
         article = self.get_object()
@@ -1193,13 +1274,10 @@ class ArticleRawPdfFirstPageView(
     def get_content(self):
         return self.get_object()
 
-    def get_response_object(self):
-        response = super().get_response_object()
+    def get_content_disposition(self):
         if "embed" not in self.request.GET:
-            response["Content-Disposition"] = "attachment; filename={}.pdf".format(
-                self.kwargs["localid"]
-            )
-        return response
+            return "attachment; filename={}.pdf".format(self.kwargs["localid"])
+        return None
 
     def get_permission_object(self):
         return self.get_content()
@@ -1208,8 +1286,21 @@ class ArticleRawPdfFirstPageView(
         obj = self.get_permission_object()
         return obj.publication_allowed and obj.can_display_first_pdf_page
 
-    def write_datastream_content(self, response, content):
-        response.content = get_pdf_first_page(content)
+    def get_datastream_content(self):
+        # The first page is cached, so that it is not extracted from the PDF for each preview.
+        article = self.get_object()
+        issue_updated = article.issue.fedora_updated
+        cache_key = "article-pdf-first-page-{pid}-{datastream_name}-{updated}".format(
+            pid=article.pid,
+            datastream_name=self.datastream_name,
+            updated=issue_updated.timestamp() if issue_updated else None,
+        )
+        get_pdf_content = super().get_datastream_content
+        return get_cached_derived_content(
+            cache_key,
+            lambda: pdf_process_pool.run(get_pdf_first_page, get_pdf_content()),
+            pids=[article.pid, article.issue.pid],
+        )
 
     def get_access_type(self) -> ArticleAccessType:
         article = self.get_object()
@@ -1226,8 +1317,17 @@ class ArticleMediaView(SingleArticleMixin, FedoraFileDatastreamView):
     Returns an image file embedded in the INFOIMG datastream.
     """
 
+    datastream_passthrough = True
+    accept_byte_ranges = True
+
     @property
     def content_type(self):
+        # Use the mimetype declared in Fedora for audio and video files, so that we do not have to
+        # get their content before streaming it.
+        datastreams = get_cached_datastream_list(self._object_pid) or {}
+        mimetype = datastreams.get(self.datastream_name)
+        if mimetype and not mimetype.startswith("image/"):
+            return mimetype
         content = self.get_datastream_content()
         im = Image.open(io.BytesIO(content))
         return Image.MIME[im.format]
@@ -1355,7 +1455,7 @@ class JournalStatisticsView(PermissionRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super(JournalStatisticsView, self).get_context_data(**kwargs)
-        solr = pysolr.Solr(settings.SOLR_ROOT, timeout=settings.SOLR_TIMEOUT)
+        solr = get_client("journal-statistics")
         search_kwargs = {
             "fq": [
                 "Corpus_fac:(Article OR Culturel)",
@@ -1368,7 +1468,7 @@ class JournalStatisticsView(PermissionRequiredMixin, TemplateView):
             "facet.limit": -1,
             "rows": 0,
         }
-        results = solr.search("*:*", **search_kwargs)
+        results = cached_search("journal-statistics", solr, "*:*", **search_kwargs)
         facet_fields = results.raw_response["facet_counts"]["facet_fields"]
         # Journal types.
         # Facet counts are returned as a flat list, alterning between the facet name and the facet
@@ -0,0 +1,221 @@
+import io
+import os
+import threading
+
+from django.conf import settings
+from django.template import loader
+from django.template.defaultfilters import slugify
+from django.template.defaultfilters import truncatewords_html
+from django.urls import reverse
+from django.utils import formats
+from django.utils.encoding import force_bytes
+from django.utils.translation import get_language
+from lxml import etree as et
+from waffle import switch_is_active
+
+from .templatetags.public_journal_tags import issue_coverpage_url
+from .templatetags.public_journal_tags import journal_logo_url
+
+ARTICLE_XSL_TEMPLATE = "public/journal/eruditxsd300_to_html.xsl"
+
+# Templates included in the stylesheet, which must be compiled again when they are modified.
+ARTICLE_XSL_INCLUDED_TEMPLATES = ("public/journal/partials/article_detail_toc_nav.html",)
+
+EXTENSIONS_NAMESPACE = "http://erudit.org/xslt/extensions"
+
+_transforms = threading.local()
+
+
+def fragment(context, markup):
+    """XSLT extension function which parses a string of HTML markup into nodes.
+
+    Whitespace-only text nodes are dropped, just like they would be if the markup was part of the
+    stylesheet itself.
+    """
+    root = et.fromstring(f"<fragment>{markup}</fragment>")
+    for element in root.iter():
+        if element.text is not None and not element.text.strip(" \t\r\n"):
+            element.text = None
+        if element is not root and element.tail is not None and not element.tail.strip(" \t\r\n"):
+            element.tail = None
+    return [root]
+
+
+EXTENSIONS = {
+    (EXTENSIONS_NAMESPACE, "fragment"): fragment,
+}
+
+
+def get_article_html_transform():
+    """Returns the compiled XSLT transformation used to convert ERUDITXSD300 articles to HTML.
+
+    The stylesheet is a Django template which only contains translations, so it is rendered and
+    compiled once per language and kept for the lifetime of the current thread. It is compiled again
+    if the template file, or one of the templates it includes, is modified.
+    """
+    template = loader.get_template(ARTICLE_XSL_TEMPLATE)
+    mtime = max(
+        os.path.getmtime(t.origin.name)
+        for t in [template] + [loader.get_template(name) for name in ARTICLE_XSL_INCLUDED_TEMPLATES]
+    )
+    language = get_language()
+
+    if not hasattr(_transforms, "cache"):
+        _transforms.cache = {}
+    cached = _transforms.cache.get(language)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    xsl = template.render()
+    transform = et.XSLT(et.parse(io.BytesIO(force_bytes(xsl))), extensions=EXTENSIONS)
+    _transforms.cache[language] = (mtime, transform)
+    return transform
+
+
+def _boolean(value):
+    return "true()" if value else "false()"
+
+
+def _string(value):
+    # Values are converted the same way Django templates would display them.
+    return et.XSLT.strparam(str(formats.localize(value)))
+
+
+def _infoimg(article):
+    variables = et.Element("{variables-node}variables", nsmap={"v": "variables-node"})
+    for imid, infoimg in article.infoimg_dict.items():
+        for name in ("plgr", "width", "height"):
+            variable = et.SubElement(variables, "{variables-node}variable")
+            variable.set("n", f"{name}-{imid}")
+            variable.set("value", str(formats.localize(infoimg[name])))
+    return et.tostring(variables, encoding="unicode")
+
+
+def get_article_html_params(context, request):
+    """ Returns the parameters of the article's XSLT transformation for the given context. """
+    article = context["article"]
+    issue = article.issue
+    journal = issue.journal
+    content_access_granted = bool(context.get("content_access_granted"))
+    display_full_article = bool(context.get("display_full_article"))
+    display_abstracts = bool(context.get("display_abstracts"))
+    can_display_first_pdf_page = bool(context.get("can_display_first_pdf_page"))
+    has_abstracts = bool(article.abstracts)
+    publication_allowed = bool(article.publication_allowed)
+
+    article_url_args = (
+        journal.code,
+        issue.volume_slug,
+        issue.localidentifier,
+        article.localidentifier,
+    )
+    issue_url = reverse("public:journal:issue_detail", args=article_url_args[:3])
+    article_url = reverse("public:journal:article_detail", args=article_url_args)
+    journal_url = "{}://{}{}".format(
+        "https" if request.is_secure() else "http",
+        request.site.domain,
+        reverse("public:journal:journal_detail", args=(journal.code,)),
+    )
+
+    params = {
+        "content_access_granted": _boolean(content_access_granted),
+        "display_full_article": _boolean(display_full_article),
+        "display_abstracts": _boolean(display_abstracts),
+        "display_biblio": _boolean(context.get("display_biblio")),
+        "display_full_toc": _boolean(context.get("display_full_toc")),
+        "page_title_suffix": _string(context.get("page_title_suffix") or ""),
+        "in_citation_list": _boolean(article.solr_id in request.saved_citations),
+        "maintenance": _boolean(switch_is_active("maintenance")),
+        "media_url_prefix": _string(context.get("media_url_prefix", "")),
+        "article_localidentifier": _string(article.localidentifier or ""),
+        "article_slug": _string(slugify(article.localidentifier)),
+        "article_title": _string(article.title),
+        "article_url": _string(article_url),
+        "processing": _string(article.processing),
+        "publication_allowed": _boolean(publication_allowed),
+        "has_abstracts": _boolean(has_abstracts),
+        "is_of_type_roc": _boolean(context.get("is_of_type_roc")),
+        "peer_reviewed": _boolean(
+            getattr(journal.type, "code", None) == "S"
+            and article.erudit_object.get_article_type() == "article"
+        ),
+        "url_doi": _string(article.url_doi or ""),
+        "infoimg": _string(_infoimg(article)),
+        "pdf_exists": _boolean(context.get("pdf_exists")),
+        "can_display_first_pdf_page": _boolean(can_display_first_pdf_page),
+        "issue_url": _string(issue_url),
+        "issue_is_published": _boolean(issue.is_published),
+        "issue_html_title": _string(issue.html_title or ""),
+        "issue_volume_title_with_pages": _string(issue.volume_title_with_pages),
+        "issue_date_published": _string(issue.date_published),
+        "journal_code": _string(journal.code),
+        "journal_url": _string(journal_url),
+        "journal_formatted_title": _string(issue.journal_formatted_title),
+    }
+
+    if issue.has_coverpage:
+        params.update(
+            {
+                "has_coverpage": _boolean(True),
+                "coverpage_url": _string(issue_coverpage_url(issue)),
+                "coverpage_width": _string(settings.ISSUE_COVERPAGE_AVERAGE_SIZE["width"]),
+                "coverpage_height": _string(settings.ISSUE_COVERPAGE_AVERAGE_SIZE["height"]),
+            }
+        )
+    elif journal.has_logo:
+        params.update(
+            {
+                "journal_has_logo": _boolean(True),
+                "journal_logo_url": _string(journal_logo_url(journal)),
+            }
+        )
+
+    # PDF URLs of unpublished issues need the prepublication ticket.
+    ticket = "" if issue.is_published else issue.prepublication_ticket
+    if article.localidentifier:
+        pdf_url = reverse("public:journal:article_raw_pdf", args=article_url_args)
+        pdf_first_page_url = reverse(
+            "public:journal:article_raw_pdf_firstpage", args=article_url_args
+        )
+        embed_query = f"?embed&ds_name={article.pdf_datastream_name}"
+        if ticket:
+            embed_query += f"&ticket={ticket}"
+        params.update(
+            {
+                "pdf_url": _string(f"{pdf_url}?ticket={ticket}" if ticket else pdf_url),
+                "pdf_viewer_url": _string(pdf_url + embed_query),
+                "pdf_first_page_viewer_url": _string(pdf_first_page_url + embed_query),
+            }
+        )
+
+    # Only the first 600 words of the article's body are displayed when the user cannot access it.
+    if (
+        publication_allowed
+        and not (content_access_granted and display_full_article)
+        and not has_abstracts
+        and display_abstracts
+        and article.processing == "C"
+    ):
+        params["html_body"] = _string(truncatewords_html(article.html_body, 600))
+
+    # The toc navigation links use the ticket of the context, which is only set for unpublished
+    # issues.
+    ticket_query = f"?ticket={context['ticket']}" if context.get("ticket") else ""
+    for name in ("previous", "next"):
+        summary_article = context.get(f"{name}_article")
+        if summary_article:
+            url = reverse(
+                "public:journal:article_detail",
+                args=article_url_args[:3] + (summary_article.localidentifier,),
+            )
+            params.update(
+                {
+                    f"has_{name}_article": _boolean(True),
+                    f"{name}_article_title": _string(summary_article.html_title),
+                }
+            )
+        else:
+            url = issue_url
+        params[f"{name}_url"] = _string(url + ticket_query)
+
+    return params
@@ -1,5 +1,6 @@
-import erudit.solr.models
 from core.solrq import Search as BaseSearch
+from erudit.solr.cache import cached_search
+from erudit.solr.client import get_client
 
 
 class Search(BaseSearch):
@@ -33,7 +34,10 @@ class Search(BaseSearch):
         ],
     }
 
+    def send(self, q, **params):
+        return cached_search("search", self.client, q, **params)
+
 
 def get_search():
     """ Returns a search object allowing to perform queries. """
-    return Search(erudit.solr.models.client)
+    return Search(get_client("search"))
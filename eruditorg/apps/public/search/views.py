@@ -11,7 +11,7 @@ from django.views.generic.base import TemplateResponseMixin
 from django.views.generic.edit import FormMixin
 from django.utils.translation import gettext
 
-from erudit.solr.models import get_model_instance
+from erudit.solr.models import get_model_instances
 from base.http import JsonAckResponse
 from base.http import JsonErrorResponse
 
@@ -187,7 +187,7 @@ class SearchResultsView(TemplateResponseMixin, ContextMixin, View):
         except PaginationOutOfBoundsException:
             return HttpResponseRedirect(reverse("public:search:advanced_search"))
 
-        solr_objects = [get_model_instance(document) for document in documents]
+        solr_objects = get_model_instances(documents)
         results = {
             "pagination": pagination_info,
             "results": solr_objects,
@@ -1,15 +1,15 @@
 from collections import namedtuple
 
-from django.conf import settings
 from django.core.cache import cache
 from django.utils.text import slugify
-import pysolr
 
+from erudit.solr import client as solr_client
+from erudit.solr.cache import cached_search
 from erudit.utils import pairify
 
 
 def get_client():
-    return pysolr.Solr(settings.SOLR_ROOT, timeout=settings.SOLR_TIMEOUT)
+    return solr_client.get_client("theses")
 
 
 def get_thesis_count():
@@ -20,7 +20,7 @@ def get_thesis_count():
         "rows": "0",
         "facet.limit": "0",
     }
-    solr_results = client.search(**args)
+    solr_results = cached_search("theses", client, **args)
     return solr_results.hits
 
 
@@ -41,7 +41,7 @@ def get_repository_summary(repository_name):
         "facet.field": ["AnneePublication", "AuteurNP_fac"],
         "facet.limit": "99999",  # all authors
     }
-    solr_results = client.search(**args)
+    solr_results = cached_search("theses", client, **args)
     result = RepositorySummary(
         solr_results.hits,
         list(solr_results.docs),
@@ -72,7 +72,7 @@ def get_theses(repository_name, rows=50, page=1, sort=None, year=None, author_le
         "sort": sort,
         "facet.limit": "0",
     }
-    solr_results = client.search(**args)
+    solr_results = cached_search("theses", client, **args)
     result = Theses(
         solr_results.hits,
         list(solr_results.docs),
@@ -1,7 +1,18 @@
 # -*- coding: utf-8 -*-
 
+import os
+import re
+import typing
+
+from django.http import FileResponse
+from django.http import HttpResponse
 from django.http import JsonResponse
 
+# Size of the chunks in which a byte range of a file is read, in bytes.
+BYTE_RANGE_CHUNK_SIZE = 64 * 1024
+
+BYTE_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 
 def JsonAckResponse(**kwargs):
     """ Returns a JsonResponse that acknowledges the success of an operation. """
@@ -15,3 +26,95 @@ def JsonErrorResponse(error, **kwargs):
     json_dict = {"status": "nok", "error": error}
     json_dict.update(kwargs)
     return JsonResponse(json_dict)
+
+
+def parse_byte_range(header: str, size: int) -> typing.Optional[typing.Tuple[int, int]]:
+    """Returns the first and last positions of the byte range requested by a ``Range`` header.
+
+    Returns None if the header is malformed or requests several ranges, in which case the whole
+    content should be sent. Raises ValueError if the range cannot be satisfied for a content of
+    ``size`` bytes.
+    """
+    match = BYTE_RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes of the content.
+        length = int(last)
+        if not length or not size:
+            raise ValueError("Unsatisfiable byte range.")
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if last < first:
+        if first < size:
+            # The last position is before the first one, the header is invalid.
+            return None
+        raise ValueError("Unsatisfiable byte range.")
+    return first, last
+
+
+def get_byte_range_response(request, response):
+    """Returns the response to send for the byte range requested by the ``Range`` header, if any.
+
+    ``response`` must be the full response to the request. Byte ranges are supported for the
+    ``HttpResponse`` objects and for the ``FileResponse`` objects serving a file: they are
+    advertised with the ``Accept-Ranges`` header and a ``Range`` header turns the response into a
+    206 Partial Content response, or into a 416 Range Not Satisfiable response. Other responses, as
+    well as the responses whose file is served by nginx, are returned as is.
+    """
+    if response.status_code != 200 or response.has_header("X-Accel-Redirect"):
+        return response
+    if isinstance(response, FileResponse):
+        try:
+            size = os.fstat(response.file_to_stream.fileno()).st_size
+        except (AttributeError, OSError):
+            # The response does not stream a file of the disk.
+            return response
+    elif not response.streaming:
+        size = len(response.content)
+    else:
+        return response
+
+    response["Accept-Ranges"] = "bytes"
+    header = request.META.get("HTTP_RANGE")
+    if not header:
+        return response
+    # Send the whole content if it changed since the client got the first part of it.
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and if_range not in (response.get("ETag"), response.get("Last-Modified")):
+        return response
+
+    try:
+        byte_range = parse_byte_range(header, size)
+    except ValueError:
+        response.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    if byte_range is None:
+        return response
+
+    first, last = byte_range
+    if response.streaming:
+        file = response.file_to_stream
+        file.seek(first)
+        response.streaming_content = _read_byte_range(file, last - first + 1)
+    else:
+        response.content = response.content[first : last + 1]
+    response.status_code = 206
+    response["Content-Range"] = f"bytes {first}-{last}/{size}"
+    response["Content-Length"] = str(last - first + 1)
+    return response
+
+
+def _read_byte_range(file, length: int) -> typing.Iterator[bytes]:
+    while length > 0:
+        chunk = file.read(min(length, BYTE_RANGE_CHUNK_SIZE))
+        if not chunk:
+            break
+        length -= len(chunk)
+        yield chunk
@@ -0,0 +1,65 @@
+import concurrent.futures
+import importlib
+import multiprocessing
+import resource
+import time
+
+import django
+from django.core.management.base import BaseCommand
+
+
+def measure(fn, *args):
+    # The maximum resident set size is in kibibytes on Linux. It is a high-water mark, so the
+    # measures are only meaningful in a process that did not do anything else.
+    started_at = time.monotonic()
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    fn(*args)
+    return (
+        time.monotonic() - started_at,
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - maxrss,
+    )
+
+
+def measure_import():
+    return measure(importlib.import_module, "apps.public.journal.coverpage")
+
+
+def measure_registration(*families):
+    from apps.public.journal.coverpage import register_font_family
+
+    return measure(lambda: [register_font_family(family) for family in families])
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the time and memory needed to import the coverpage module and to register each of "
+        "the coverpage font families."
+    )
+    requires_system_checks = []
+
+    def handle(self, *args, **options):
+        from apps.public.journal.coverpage import FONT_FAMILIES
+
+        duration, memory = self.measure_in_new_process(measure_import)
+        self.stdout.write(f"Import of the coverpage module: {duration:.3f} s, {memory} KiB")
+
+        for family in FONT_FAMILIES:
+            duration, memory = self.measure_in_new_process(measure_registration, family)
+            self.stdout.write(f"Registration of the {family} fonts: {duration:.3f} s, {memory} KiB")
+
+        duration, memory = self.measure_in_new_process(measure_registration, *FONT_FAMILIES)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Registration of all the fonts, as was done at startup before they were loaded "
+                f"lazily: {duration:.3f} s, {memory} KiB"
+            )
+        )
+
+    def measure_in_new_process(self, fn, *args):
+        # Each measure is done in a new process, in which nothing was loaded but Django.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as executor:
+            return executor.submit(fn, *args).result()
@@ -9,7 +9,9 @@ import datetime as dt
 from django.utils.translation import get_language
 from django.utils.translation import LANGUAGE_SESSION_KEY
 from django.conf import settings
+from django.http import HttpResponse
 
+from .process_pool import ProcessPoolBusy
 
 logger = structlog.get_logger(__name__)
 
@@ -68,3 +70,13 @@ class LogHttp404Middleware(MiddlewareMixin):
         if response.status_code == 404:
             logger.warning("http_404", path=request.path)
         return response
+
+
+class ProcessPoolBusyMiddleware(MiddlewareMixin):
+    """ Asks the client to retry later when a process pool is too busy to handle the request. """
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, ProcessPoolBusy):
+            response = HttpResponse(status=503)
+            response["Retry-After"] = str(exception.retry_after)
+            return response
@@ -5,8 +5,21 @@ import pikepdf
 import mimetypes
 import structlog
 
+from django.conf import settings
+
+from .process_pool import ProcessPool
+
 logger = structlog.getLogger(__name__)
 
+# Pool of processes in which the PDFs are generated, see the PDF_PROCESS_POOL_* settings.
+pdf_process_pool = ProcessPool(
+    "pdf",
+    max_workers=settings.PDF_PROCESS_POOL_SIZE,
+    timeout=settings.PDF_PROCESS_POOL_TIMEOUT,
+    max_queue_size=settings.PDF_PROCESS_POOL_MAX_QUEUE_SIZE,
+    retry_after=settings.PDF_PROCESS_POOL_RETRY_AFTER,
+)
+
 # Make sure mimetypes knows of all the extensions used in the pdf
 mimetypes.add_type("application/vnd.ms-fontobject", ".eot")
 mimetypes.add_type("font/woff", ".woff")
@@ -55,3 +68,15 @@ def get_pdf_first_page(content: bytes) -> bytes:
             del pdf.pages[1:]
             pdf.save(output)
         return output.getvalue()
+
+
+def get_pdf_page_count(content: bytes) -> int:
+    """Return the number of pages of the PDF"""
+    try:
+        with fitz.Document(stream=content, filetype="pdf") as pdf:
+            return len(pdf)
+
+    except RuntimeError:
+        logger.error("RuntimeError in fitz", exc_info=True)
+        with pikepdf.open(BytesIO(content)) as pdf:
+            return len(pdf.pages)
@@ -0,0 +1,129 @@
+import concurrent.futures
+import multiprocessing
+import threading
+import time
+import typing
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+import structlog
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+
+logger = structlog.getLogger(__name__)
+
+process_pool_jobs = Gauge(
+    "eruditorg_process_pool_jobs",
+    "Nombre de tâches en cours ou en attente dans les pools de processus",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+process_pool_job_duration = Histogram(
+    "eruditorg_process_pool_job_duration_seconds",
+    "Durée des tâches exécutées dans les pools de processus, attente comprise",
+    ["pool", "job"],
+)
+
+
+class ProcessPoolBusy(Exception):
+    """ Raised when a process pool cannot run a job in time because it has too many jobs. """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ProcessPool:
+    """Runs CPU-bound jobs in a pool of processes, so that they do not block the current process.
+
+    The pool is started when the first job is submitted, so that it is not shared by the processes
+    forked by the web server. Its processes are spawned and set up Django on their own. Jobs must
+    be module-level functions whose arguments and results can be pickled.
+
+    At most ``max_workers`` jobs run at the same time and at most ``max_queue_size`` other jobs wait
+    for a process. ``ProcessPoolBusy`` is raised when a job is submitted to a full pool, or when
+    its result is not available after ``timeout`` seconds. The views should then answer with a 503
+    response asking the client to retry after ``retry_after`` seconds.
+
+    If ``max_workers`` is 0, jobs are run in the current process.
+    """
+
+    def __init__(
+        self, name: str, max_workers: int, timeout: float, max_queue_size: int, retry_after: int
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_queue_size = max_queue_size
+        self.retry_after = retry_after
+        self.jobs = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def run(self, fn: typing.Callable, *args):
+        """ Runs ``fn(*args)`` in a process of the pool and returns its result. """
+        if not self.enabled:
+            return fn(*args)
+
+        with self._lock:
+            if self.jobs >= self.max_workers + self.max_queue_size:
+                logger.warning("process-pool.full", pool=self.name, job=fn.__name__)
+                raise ProcessPoolBusy(f"The {self.name} process pool is full.", self.retry_after)
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A process of the pool died while it was idle.
+                self._executor = None
+                executor = self._get_executor()
+                future = executor.submit(fn, *args)
+            self.jobs += 1
+            process_pool_jobs.labels(pool=self.name).inc()
+
+        submitted_at = time.monotonic()
+
+        def job_done(future):
+            # Jobs that timed out keep their process busy until they are done.
+            with self._lock:
+                self.jobs -= 1
+            process_pool_jobs.labels(pool=self.name).dec()
+            process_pool_job_duration.labels(pool=self.name, job=fn.__name__).observe(
+                time.monotonic() - submitted_at
+            )
+
+        future.add_done_callback(job_done)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning("process-pool.timeout", pool=self.name, job=fn.__name__)
+            raise ProcessPoolBusy(
+                f"The {self.name} process pool did not run the job in time.", self.retry_after
+            )
+        except BrokenProcessPool:
+            # A process of the pool died, a new pool will be started for the next jobs.
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+
+    def shutdown(self, wait: bool = True):
+        """ Stops the processes of the pool. A new pool is started for the next jobs. """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        return self._executor
@@ -34,6 +34,20 @@ env = environ.Env(
     RESTRICTION_DATABASE_URL=(str, "mysql://root@localhost/restriction"),
     CACHE_URL=(str, "locmemcache://"),
     FEDORA_CACHE_TIMEOUT=(int, 60 * 60 * 24 * 30),
+    FEDORA_NEGATIVE_CACHE_TIMEOUT=(int, 60 * 5),
+    FEDORA_STALE_CACHE_TIMEOUT=(int, 60 * 60 * 24 * 7),
+    FEDORA_BLOB_STORE_ROOT=(str, None),
+    FEDORA_BLOB_STORE_MAX_SIZE=(int, 10 * 1024 * 1024 * 1024),
+    FEDORA_BLOB_STORE_ACCEL_REDIRECT_URL=(str, None),
+    FEDORA_BLOB_DATASTREAMS=(list, ["PDF", "PDF_ERUDIT", "IMAGE", "COVERPAGE_HD", "CONTENT"]),
+    FEDORA_STREAMING_THRESHOLD=(int, 5 * 1024 * 1024),
+    FEDORA_DATASTREAM_MAX_AGE=(int, 60 * 60 * 24 * 7),
+    SINGLE_FLIGHT_LOCK_TIMEOUT=(int, 30),
+    SINGLE_FLIGHT_WAIT_TIMEOUT=(float, 5),
+    PDF_PROCESS_POOL_SIZE=(int, 0),
+    PDF_PROCESS_POOL_TIMEOUT=(int, 30),
+    PDF_PROCESS_POOL_MAX_QUEUE_SIZE=(int, 10),
+    PDF_PROCESS_POOL_RETRY_AFTER=(int, 10),
     EMAIL_HOST=(str, None),
     EMAIL_PORT=(int, 25),
     EMAIL_HOST_USER=(str, None),
@@ -230,6 +244,7 @@ MIDDLEWARE = (
     "core.citations.middleware.SavedCitationListMiddleware",
     "waffle.middleware.WaffleMiddleware",
     "base.middleware.LogHttp404Middleware",
+    "base.middleware.ProcessPoolBusyMiddleware",
     "base.middleware.PolyglotLocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
 )
@@ -322,6 +337,51 @@ ADV_CACHE_VERSIONING = True
 ADV_CACHE_COMPRESS = True
 
 FEDORA_CACHE_TIMEOUT = env("FEDORA_CACHE_TIMEOUT")
+# Datastreams missing from Fedora are cached for a shorter time, so that they show up quickly once
+# they are added.
+FEDORA_NEGATIVE_CACHE_TIMEOUT = env("FEDORA_NEGATIVE_CACHE_TIMEOUT")
+# The content fetched from Fedora is kept in the cache FEDORA_STALE_CACHE_TIMEOUT seconds after it
+# expires, so that it can still be served when Fedora is unavailable. Set it to 0 to disable this.
+# The contents of the FEDORA_BLOB_DATASTREAMS datastreams are only kept if they are stored in the
+# blob store, since they can be large.
+FEDORA_STALE_CACHE_TIMEOUT = env("FEDORA_STALE_CACHE_TIMEOUT")
+
+# If FEDORA_BLOB_STORE_ROOT is set, the contents of the FEDORA_BLOB_DATASTREAMS datastreams, as well
+# as the PDFs generated from them (article PDFs with their coverpage and their first page), are
+# stored in this directory on the local disk instead of in the cache. The least recently used files
+# are removed when their total size exceeds FEDORA_BLOB_STORE_MAX_SIZE bytes. If
+# FEDORA_BLOB_STORE_ACCEL_REDIRECT_URL is set, those files are served by nginx from this internal
+# location with X-Accel-Redirect.
+FEDORA_BLOB_STORE_ROOT = env("FEDORA_BLOB_STORE_ROOT")
+FEDORA_BLOB_STORE_MAX_SIZE = env("FEDORA_BLOB_STORE_MAX_SIZE")
+FEDORA_BLOB_STORE_ACCEL_REDIRECT_URL = env("FEDORA_BLOB_STORE_ACCEL_REDIRECT_URL")
+FEDORA_BLOB_DATASTREAMS = env("FEDORA_BLOB_DATASTREAMS")
+
+# Datastreams larger than FEDORA_STREAMING_THRESHOLD bytes that are not cached yet are streamed from
+# Fedora to the client by the views that send them as is.
+FEDORA_STREAMING_THRESHOLD = env("FEDORA_STREAMING_THRESHOLD")
+
+# Public datastreams that rarely change, like logos and coverpages, can be reused by browsers and
+# proxies for FEDORA_DATASTREAM_MAX_AGE seconds without being validated again.
+FEDORA_DATASTREAM_MAX_AGE = env("FEDORA_DATASTREAM_MAX_AGE")
+
+# When a cache key is missing, only one process at a time computes its value (see
+# `erudit.cache.single_flight`). The lock held by this process expires after
+# SINGLE_FLIGHT_LOCK_TIMEOUT seconds and the other processes wait for the key to be filled for at
+# most SINGLE_FLIGHT_WAIT_TIMEOUT seconds before computing the value themselves.
+SINGLE_FLIGHT_LOCK_TIMEOUT = env("SINGLE_FLIGHT_LOCK_TIMEOUT")
+SINGLE_FLIGHT_WAIT_TIMEOUT = env("SINGLE_FLIGHT_WAIT_TIMEOUT")
+
+# The coverpages and the PDFs sent with them are generated in a pool of PDF_PROCESS_POOL_SIZE
+# processes started by each web server process, so that generating them does not block the other
+# requests. At most PDF_PROCESS_POOL_MAX_QUEUE_SIZE jobs wait for a process of the pool and their
+# result is waited for at most PDF_PROCESS_POOL_TIMEOUT seconds. Otherwise, a 503 response asks the
+# client to retry after PDF_PROCESS_POOL_RETRY_AFTER seconds. Set PDF_PROCESS_POOL_SIZE to 0 to
+# generate them in the web server process.
+PDF_PROCESS_POOL_SIZE = env("PDF_PROCESS_POOL_SIZE")
+PDF_PROCESS_POOL_TIMEOUT = env("PDF_PROCESS_POOL_TIMEOUT")
+PDF_PROCESS_POOL_MAX_QUEUE_SIZE = env("PDF_PROCESS_POOL_MAX_QUEUE_SIZE")
+PDF_PROCESS_POOL_RETRY_AFTER = env("PDF_PROCESS_POOL_RETRY_AFTER")
 
 # Emails
 # -----------------------------------------------------------------------------
@@ -390,6 +450,18 @@ FEDORA_PASSWORD = env("FEDORA_PASSWORD")
 # Solr settings
 SOLR_ROOT = env("SOLR_ROOT")
 SOLR_TIMEOUT = 10
+# Number of seconds during which identical Solr requests are answered from the cache, by call site
+# (see `erudit.solr.cache.cached_search()`). The requests of the other call sites are not cached.
+SOLR_CACHE_TIMEOUTS = {
+    "search": 60,
+    "document": 60,
+    "articles": 60 * 5,
+    "journal-authors": 60 * 5,
+    "journal-statistics": 60 * 5,
+    "theses": 60 * 5,
+}
+# Solr responses larger than this number of bytes (once pickled) are not cached.
+SOLR_CACHE_MAX_SIZE = 1024 * 1024
 
 # Victor settings
 VICTOR_SOAP_URL = env("VICTOR_SOAP_URL")
@@ -153,8 +153,8 @@ class Query:
         :return: the new querystring
         """
         qs = base_qs
-        # Inserts kwargs params
-        for k, v in params_dict.items():
+        # Inserts kwargs params, sorted so that equivalent queries get the same querystring
+        for k, v in sorted(params_dict.items()):
             if not safe:
                 v = solr_escape(v)
             else:
@@ -172,6 +172,6 @@ class Query:
         params.update(kwargs)
         if self._fq:
             params["fq"] = self._fq
-        return self.search.client.search(self._q, **params)
+        return self.search.send(self._q, **params)
 
     results = property(get_results)
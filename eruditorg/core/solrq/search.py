@@ -45,6 +45,10 @@ class Search:
         """ Returns a Query instance for the considered parameters. """
         return Query(self).filter(*args, **kwargs)
 
+    def send(self, q, **params):
+        """ Sends a search request to the Solr index and returns its results. """
+        return self.client.search(q, **params)
+
     def get_results(self, **kwargs):
         """ Returns the results of the search. """
         return self.filter().get_results(**kwargs)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SubscriptionConfig(AppConfig):
+    label = "subscription"
+    name = "core.subscription"
+
+    def ready(self):
+        from . import receivers  # noqa
@@ -0,0 +1,51 @@
+import functools
+import typing
+
+import redis
+from Crypto.Cipher import AES
+from django.conf import settings
+from django_redis.pool import get_connection_factory
+from prometheus_client import Histogram
+
+casa_authorization_duration = Histogram(
+    "eruditorg_casa_authorization_duration_seconds",
+    "Durée de la validation des jetons Google CASA",
+)
+casa_nonce_count_duration = Histogram(
+    "eruditorg_casa_nonce_count_duration_seconds",
+    "Durée du décompte des utilisations des nonces Google CASA dans Redis",
+)
+
+
+def get_redis_client() -> typing.Optional[redis.Redis]:
+    """Returns a Redis client to the ``REDIS_HOST``, ``REDIS_PORT`` and ``REDIS_INDEX`` database,
+    or None if Redis is not configured.
+
+    The clients share the connection pools of django-redis, so the connections are reused between
+    requests, and with the cache if it uses the same database.
+    """
+    redis_host = settings.REDIS_HOST
+    redis_port = settings.REDIS_PORT
+    redis_index = settings.REDIS_INDEX
+    if not redis_host or redis_port is None or redis_index is None:
+        return None
+    return get_connection_factory(options={}).connect(
+        f"redis://{redis_host}:{redis_port}/{redis_index}"
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def decrypt_casa_payload(key: bytes, nonce: bytes, payload: bytes) -> typing.Optional[bytes]:
+    """Decrypts and verifies the payload of a CASA token.
+
+    The result is kept for each nonce, since the same token is sent every time the user clicks on
+    the search result.
+
+    :returns: The decrypted payload, or None if it was modified or didn't come from Google Scholar.
+    """
+    try:
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+        # The payload includes a 16-byte signature at the end used for the verify.
+        return cipher.decrypt_and_verify(payload[:-16], payload[-16:])
+    except ValueError:
+        return None
@@ -0,0 +1,209 @@
+import bisect
+import heapq
+import ipaddress
+import re
+import threading
+import typing
+import uuid
+from urllib.parse import urlparse
+
+import structlog
+from django.core.cache import cache
+
+logger = structlog.getLogger(__name__)
+
+# Cache key of the version of the subscriptions. It is shared by all the processes and changed
+# whenever a subscription, or one of its IP address ranges, is saved or deleted, so that each
+# process knows when to rebuild its indexes.
+SUBSCRIPTIONS_VERSION_KEY = "subscriptions-version"
+
+
+def get_subscriptions_version() -> str:
+    version = cache.get(SUBSCRIPTIONS_VERSION_KEY)
+    if version is None:
+        # The version was evicted, or never set: the indexes must be rebuilt.
+        version = uuid.uuid4().hex
+        if not cache.add(SUBSCRIPTIONS_VERSION_KEY, version, None):
+            version = cache.get(SUBSCRIPTIONS_VERSION_KEY, version)
+    return version
+
+
+def bump_subscriptions_version():
+    cache.set(SUBSCRIPTIONS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+class IPAddressIndex:
+    """Index of IP address ranges, to find the subscription of an IP address with a binary search.
+
+    The ranges, which may overlap, are split into disjoint intervals, each mapped to the lowest id
+    of the subscriptions whose ranges contain it. IPv4 and IPv6 addresses are indexed separately.
+    """
+
+    def __init__(self, ranges: typing.Iterable[typing.Tuple[str, str, int]]):
+        ranges_by_version = {4: [], 6: []}
+        for ip_start, ip_end, subscription_id in ranges:
+            try:
+                start = ipaddress.ip_address(ip_start)
+                end = ipaddress.ip_address(ip_end)
+            except ValueError:
+                logger.warning("subscription.invalid-ip-range", start=ip_start, end=ip_end)
+                continue
+            if start.version != end.version or start > end:
+                logger.warning("subscription.invalid-ip-range", start=ip_start, end=ip_end)
+                continue
+            ranges_by_version[start.version].append((int(start), int(end), subscription_id))
+        self._intervals = {
+            version: self._get_disjoint_intervals(ranges)
+            for version, ranges in ranges_by_version.items()
+        }
+
+    @staticmethod
+    def _get_disjoint_intervals(ranges):
+        # Sweep the boundaries of the ranges in order, keeping track of the ranges that contain the
+        # current interval.
+        boundaries = sorted({start for start, _, _ in ranges} | {end + 1 for _, end, _ in ranges})
+        ranges = sorted(ranges)
+        starts, ends, subscription_ids = [], [], []
+        active = []
+        i = 0
+        for start, next_start in zip(boundaries, boundaries[1:]):
+            while i < len(ranges) and ranges[i][0] == start:
+                heapq.heappush(active, (ranges[i][2], ranges[i][1]))
+                i += 1
+            while active and active[0][1] < start:
+                heapq.heappop(active)
+            if not active:
+                continue
+            subscription_id = active[0][0]
+            if ends and ends[-1] == start - 1 and subscription_ids[-1] == subscription_id:
+                ends[-1] = next_start - 1
+            else:
+                starts.append(start)
+                ends.append(next_start - 1)
+                subscription_ids.append(subscription_id)
+        return starts, ends, subscription_ids
+
+    def get(self, ip: str) -> typing.Optional[int]:
+        """ Returns the id of the subscription of the IP address, or None. """
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        starts, ends, subscription_ids = self._intervals[address.version]
+        i = bisect.bisect_right(starts, int(address)) - 1
+        if i >= 0 and int(address) <= ends[i]:
+            return subscription_ids[i]
+        return None
+
+
+def parse_referer(referer: str) -> typing.Optional[typing.Tuple[str, str]]:
+    """ Returns the netloc, without its "www." prefix, and the path of a referer. """
+    if not referer:
+        return None
+    parsed_referer = urlparse(referer)
+    if parsed_referer.netloc == "":
+        return None
+    return re.sub(r"^www\.", "", parsed_referer.netloc.lower()), parsed_referer.path
+
+
+class RefererIndex:
+    """Index of referers, to find the subscription of a referer with a dictionary lookup.
+
+    The referers of the subscriptions are indexed by netloc. A referer matches the subscription
+    whose referer has the same netloc and the longest path that is a prefix of its path.
+    """
+
+    def __init__(self, referers: typing.Iterable[typing.Tuple[str, int]]):
+        self._paths = {}
+        for referer, subscription_id in referers:
+            parsed_referer = parse_referer(referer)
+            if parsed_referer is None:
+                continue
+            netloc, path = parsed_referer
+            self._paths.setdefault(netloc, []).append((path, subscription_id))
+        for paths in self._paths.values():
+            paths.sort(key=lambda item: (-len(item[0]), item[1]))
+
+    def get(self, referer: str) -> typing.Optional[int]:
+        """ Returns the id of the subscription of the referer, or None. """
+        parsed_referer = parse_referer(referer)
+        if parsed_referer is None:
+            return None
+        netloc, path = parsed_referer
+        for subscription_path, subscription_id in self._paths.get(netloc, ()):
+            if path.startswith(subscription_path):
+                return subscription_id
+        return None
+
+
+class VersionedIndex:
+    """An index kept in the memory of the process and rebuilt when the subscriptions change.
+
+    ``build`` is called to build the index the first time it is used, and every time it is used
+    after the version of the subscriptions has changed.
+    """
+
+    def __init__(self, build: typing.Callable):
+        self.build = build
+        self._index = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        version = get_subscriptions_version()
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    self._index = self.build()
+                    self._version = version
+        return self._index
+
+
+def _build_ip_address_index() -> IPAddressIndex:
+    from .models import InstitutionIPAddressRange
+    from .models import JournalAccessSubscription
+
+    valid_subscriptions = (
+        JournalAccessSubscription.valid_objects.institutional().prefetch_related(None).values("pk")
+    )
+    return IPAddressIndex(
+        InstitutionIPAddressRange.objects.filter(subscription__in=valid_subscriptions).values_list(
+            "ip_start", "ip_end", "subscription_id"
+        )
+    )
+
+
+def _build_referer_index() -> RefererIndex:
+    from .models import JournalAccessSubscription
+
+    return RefererIndex(
+        JournalAccessSubscription.valid_objects.institutional()
+        .prefetch_related(None)
+        .filter(referer__isnull=False)
+        .exclude(referer="")
+        .values_list("referer", "pk")
+        .distinct()
+    )
+
+
+ip_address_index = VersionedIndex(_build_ip_address_index)
+referer_index = VersionedIndex(_build_referer_index)
+
+
+def get_subscription_id_for_ip_address(ip: str) -> typing.Optional[int]:
+    """Returns the id of the valid institutional subscription of the IP address, or None.
+
+    If many subscriptions have IP address ranges containing the IP address, the one with the lowest
+    id is returned.
+    """
+    if not ip:
+        return None
+    return ip_address_index.get().get(ip)
+
+
+def get_subscription_id_for_referer(referer: str) -> typing.Optional[int]:
+    """Returns the id of the valid institutional subscription of the referer, or None.
+
+    If many subscriptions match the referer, the one with the longest path is returned.
+    """
+    return referer_index.get().get(referer)
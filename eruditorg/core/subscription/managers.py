@@ -1,14 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import structlog
-import re
 import ipaddress
 
-from urllib.parse import urlparse
-
 from django.db import models
 from django.db.models import Q
 
+from .indexes import get_subscription_id_for_referer
+
 logger = structlog.getLogger(__name__)
 
 
@@ -23,30 +22,13 @@ class JournalAccessSubscriptionQueryset(models.QuerySet):
         ).distinct()
 
     def get_for_referer(self, referer):
-        """ Return all the subscriptions for the given referer """
-        if not referer:
-            return
-
-        parsed_user_referer = urlparse(referer)
-
-        if parsed_user_referer.netloc == "":
-            return
-
-        user_netloc = re.sub("^www.", "", parsed_user_referer.netloc)
-
-        referer_subscription = self.filter(referer__contains=user_netloc).first()
-
-        if referer_subscription:
-            parsed_institution_referer = urlparse(referer_subscription.referer)
-
-            institution_netloc = re.sub("^www.", "", parsed_institution_referer.netloc)
+        """Return the subscription for the given referer
 
-            if (
-                # Compare full netloc
-                institution_netloc == user_netloc
-                and parsed_institution_referer.path in parsed_user_referer.path
-            ):
-                return referer_subscription
+        Only the valid institutional subscriptions can be found with their referer.
+        """
+        subscription_id = get_subscription_id_for_referer(referer)
+        if subscription_id is not None:
+            return self.filter(pk=subscription_id).first()
 
 
 class JournalAccessSubscriptionValidManager(models.Manager):
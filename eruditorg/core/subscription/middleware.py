@@ -4,16 +4,23 @@ import structlog
 
 from base64 import urlsafe_b64decode
 from binascii import unhexlify
-from Crypto.Cipher import AES
 from datetime import datetime
 from ipaddress import ip_address, ip_network
 from ipware import get_client_ip
 from typing import Union
 from urllib.parse import unquote
 
+from .casa import casa_authorization_duration
+from .casa import casa_nonce_count_duration
+from .casa import decrypt_casa_payload
+from .casa import get_redis_client
+from .indexes import get_subscription_id_for_ip_address
+from .indexes import get_subscription_id_for_referer
 from .models import JournalAccessSubscription
 from core.subscription.models import UserSubscriptions
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from django.utils.functional import empty
 
 logger = logging.getLogger(__name__)
 structlogger = structlog.getLogger(__name__)
@@ -51,31 +58,49 @@ class SubscriptionMiddleware:
         return response
 
     def process_request(self, request):
+        # The subscriptions are only resolved when a view needs them, so that the requests that do
+        # not check access to some content do not query the database.
+        request.subscriptions = SimpleLazyObject(lambda: self._get_user_subscriptions(request))
+
+        # The referer of a subscribed organisation is kept in the session, so that the user keeps
+        # access to the content when following links.
+        referer = self._get_user_referer_for_subscription(request)
+        if get_subscription_id_for_referer(referer) is not None:
+            request.session["HTTP_REFERER"] = referer
+
+    def _get_user_subscriptions(self, request):
+        subscriptions = UserSubscriptions()
+
         # Tries to determine if the user's IP address is contained into
         # an institutional IP address range.
-
         ip = self._get_user_ip_address(request)
         if request.user.is_active and request.user.is_staff:
             ip = request.META.get("HTTP_CLIENT_IP", ip)
 
-        request.subscriptions = UserSubscriptions()
-        subscription = (
-            JournalAccessSubscription.valid_objects.institutional()
-            .get_for_ip_address(ip)
-            .select_related("organisation")
-            .first()
-        )
-        if subscription:
-            request.subscriptions.add_subscription(subscription)
+        # The IP address ranges are looked up in an index kept in memory, so that the database is
+        # only queried when the IP address belongs to an institution.
+        subscription_id = get_subscription_id_for_ip_address(ip)
+        if subscription_id is not None:
+            subscription = (
+                JournalAccessSubscription.valid_objects.institutional()
+                .select_related("organisation")
+                .filter(pk=subscription_id)
+                .first()
+            )
+            if subscription:
+                subscriptions.add_subscription(subscription)
 
         # Tries to determine if the subscriber is refered by a subscribed organisation
         referer = self._get_user_referer_for_subscription(request)
-        subscription = JournalAccessSubscription.valid_objects.institutional().get_for_referer(
-            referer
-        )
-        if subscription:
-            request.subscriptions.add_subscription(subscription)
-            request.session["HTTP_REFERER"] = referer
+        subscription_id = get_subscription_id_for_referer(referer)
+        if subscription_id is not None:
+            subscription = (
+                JournalAccessSubscription.valid_objects.institutional()
+                .filter(pk=subscription_id)
+                .first()
+            )
+            if subscription:
+                subscriptions.add_subscription(subscription)
 
         # Tries to determine if the user has an individual account
         if request.user.is_authenticated:
@@ -84,20 +109,27 @@ class SubscriptionMiddleware:
                 .select_related("sponsor", "organisation")
                 .filter(user=request.user)
             ):
-                request.subscriptions.add_subscription(subscription)
+                subscriptions.add_subscription(subscription)
 
         casa_key = getattr(settings, "GOOGLE_CASA_KEY", None)
         casa_token = request.GET.get("casa_token", None)
         user_ip = self._get_user_ip_address(request)
         if casa_key and casa_token and user_ip:
-            subscription_id = self.casa_authorize(casa_key, casa_token, user_ip)
+            with casa_authorization_duration.time():
+                subscription_id = self.casa_authorize(casa_key, casa_token, user_ip)
             try:
                 subscription = JournalAccessSubscription.valid_objects.get(pk=subscription_id)
-                request.subscriptions.add_subscription(subscription)
+                subscriptions.add_subscription(subscription)
             except JournalAccessSubscription.DoesNotExist:
                 pass
 
+        return subscriptions
+
     def log_http_transaction(self, request, response):
+        if getattr(request.subscriptions, "_wrapped", None) is empty:
+            # The subscriptions were not needed to respond to the request, so the access to the
+            # content was not granted by a referer.
+            return
         active_subscription = request.subscriptions.active_subscription
 
         referer = self._get_user_referer_for_subscription(request)
@@ -153,11 +185,8 @@ class SubscriptionMiddleware:
         payload = urlsafe_b64decode(components[1] + "=" * (4 - len(components[1]) % 4))
 
         # Decrypt and verify the payload.
-        try:
-            cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
-            # The payload includes a 16-byte signature at the end used for the verify.
-            data = cipher.decrypt_and_verify(payload[:-16], payload[-16:])
-        except ValueError:
+        data = decrypt_casa_payload(key, nonce, payload)
+        if data is None:
             # Either the message has been modified or it didn’t come from Google Scholar.
             structlogger.info(
                 "CASA",
@@ -238,16 +267,14 @@ class SubscriptionMiddleware:
         """
         try:
             # Try to store in Redis the number of times a particular nonce has been seen.
-            redis_host = settings.REDIS_HOST
-            redis_port = settings.REDIS_PORT
-            redis_index = settings.REDIS_INDEX
-            if not redis_host or not redis_port or not redis_index:
+            r = get_redis_client()
+            if r is None:
                 raise redis.exceptions.ConnectionError
-            r = redis.Redis(host=redis_host, port=redis_port, db=redis_index)
             key = "google_casa_nonce_{}".format(nonce)
-            count = r.get(key)
-            count = int(count) + 1 if count is not None else 1
-            r.set(key, count, 3600)
+            # The count is incremented atomically, so that concurrent requests can't reuse a
+            # token more than allowed.
+            with casa_nonce_count_duration.time(), r.pipeline() as pipeline:
+                count, _ = pipeline.incr(key).expire(key, 3600).execute()
             return count
         except redis.exceptions.ConnectionError:
             # No access to Redis so we have no way to know how many times this nonce has been seen.
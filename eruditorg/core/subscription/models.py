@@ -6,6 +6,7 @@ from functools import reduce
 
 import structlog
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -24,6 +25,17 @@ from .managers import JournalAccessSubscriptionValidManager
 logger = structlog.get_logger(__name__)
 
 
+def get_journal_id(article=None, issue=None, journal=None):
+    """ Returns the id of the journal of the given article, issue or journal. """
+    if article:
+        return article.issue.journal_id
+    if issue:
+        return issue.journal_id
+    if journal:
+        return journal.pk
+    raise ValueError("One of article, issue, journal must be specified.")
+
+
 class UserSubscriptions:
     """ Helper model that aggregates the subscriptions of a user """
 
@@ -63,18 +75,8 @@ class UserSubscriptions:
 
         :returns: True if it provides access content
         """
-        if not any(
-            (
-                article,
-                issue,
-                journal,
-            )
-        ):
-            raise ValueError("One of article, issue, journal must be specified.")
-        for subscription in self._subscriptions:
-            if subscription.provides_access_to(article=article, issue=issue, journal=journal):
-                return True
-        return False
+        journal_id = get_journal_id(article=article, issue=issue, journal=journal)
+        return any(journal_id in subscription.journal_ids for subscription in self._subscriptions)
 
 
 class AccessBasket(models.Model):
@@ -190,27 +192,33 @@ class JournalAccessSubscription(AbstractSubscription):
         """Returns if the subscription has access to the given article, issue
         or journal"""
 
-        if not any(
-            (
-                article,
-                issue,
-                journal,
-            )
-        ):
-            raise ValueError("One of article, issue, journal must be specified.")
-
-        if article:
-            journal = article.issue.journal
-        elif issue:
-            journal = issue.journal
+        return get_journal_id(article=article, issue=issue, journal=journal) in self.journal_ids
 
-        if journal in self.journals.all():
-            return True
+    @staticmethod
+    def get_journal_ids_cache_key(pk):
+        return f"subscription-journal-ids-{pk}"
 
-        if self.basket and journal in self.basket.journals.all():
-            return True
+    @cached_property
+    def journal_ids(self):
+        """The ids of the journals that can be accessed with the subscription, including the
+        journals of its basket.
 
-        return False
+        They are cached until the journals of the subscription, or of its basket, change.
+        """
+        cache_key = self.get_journal_ids_cache_key(self.pk)
+        journal_ids = cache.get(cache_key)
+        if journal_ids is None:
+            # The journals are usually prefetched along with the subscription.
+            journal_ids = {journal.pk for journal in self.journals.all()}
+            if self.basket_id:
+                journal_ids.update(
+                    AccessBasket.journals.through.objects.filter(
+                        accessbasket_id=self.basket_id
+                    ).values_list("journal_id", flat=True)
+                )
+            journal_ids = frozenset(journal_ids)
+            cache.set(cache_key, journal_ids, settings.LONG_TTL)
+        return journal_ids
 
     def get_journals(self):
         """ Returns the Journal instances targeted by the subscription. """
@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .indexes import bump_subscriptions_version
+from .models import AccessBasket
+from .models import InstitutionIPAddressRange
+from .models import JournalAccessSubscription
+
+
+@receiver(post_save, sender=InstitutionIPAddressRange)
+@receiver(post_delete, sender=InstitutionIPAddressRange)
+@receiver(post_save, sender=JournalAccessSubscription)
+@receiver(post_delete, sender=JournalAccessSubscription)
+@receiver(m2m_changed, sender=JournalAccessSubscription.journals.through)
+def invalidate_subscription_indexes(sender, **kwargs):
+    # The subscription indexes kept in the memory of each process must be rebuilt.
+    bump_subscriptions_version()
+
+
+@receiver(post_save, sender=JournalAccessSubscription)
+@receiver(post_delete, sender=JournalAccessSubscription)
+def invalidate_subscription_journal_ids(sender, instance, **kwargs):
+    # The basket of the subscription may have changed.
+    cache.delete(JournalAccessSubscription.get_journal_ids_cache_key(instance.pk))
+
+
+@receiver(m2m_changed, sender=JournalAccessSubscription.journals.through)
+def invalidate_journal_ids_of_subscription(sender, instance, action, **kwargs):
+    # The journals have no reverse relations to the subscriptions and the baskets, so the instance
+    # is always the subscription, or the basket, whose journals changed.
+    if action.startswith("post_"):
+        cache.delete(JournalAccessSubscription.get_journal_ids_cache_key(instance.pk))
+
+
+@receiver(m2m_changed, sender=AccessBasket.journals.through)
+def invalidate_journal_ids_of_basket_subscriptions(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        cache.delete_many(
+            [
+                JournalAccessSubscription.get_journal_ids_cache_key(pk)
+                for pk in instance.accesses.values_list("pk", flat=True)
+            ]
+        )
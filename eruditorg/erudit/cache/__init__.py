@@ -1,5 +1,23 @@
+import contextlib
+import time
+import uuid
+
+from django.conf import settings
+from django_redis.client import DefaultClient
+
 from .client import EruditCacheClient
 
+# Number of seconds between two checks of a cache key being filled by another process.
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# Deletes a key only if it still holds the given value.
+COMPARE_AND_DELETE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 def cache_set(cache, key, value, timeout, pids=None):
     # Pass `pids` to our cache client only if we are using EruditCacheClient.
@@ -7,3 +25,61 @@ def cache_set(cache, key, value, timeout, pids=None):
         cache.client.set(key, value, timeout, pids=pids)
     else:
         cache.set(key, value, timeout)
+
+
+@contextlib.contextmanager
+def single_flight(cache, key):
+    """Coalesce the cache misses of ``key`` so that only one process computes its value.
+
+    The first process to miss ``key`` acquires a lock (an atomic ``SET NX`` when the cache is
+    backed by Redis) and gets ``None``: it must compute the value and set ``key`` itself. The other
+    processes wait for ``key`` to be filled and get its value. If it is not filled after
+    ``SINGLE_FLIGHT_WAIT_TIMEOUT`` seconds, or if the lock is released without the key being filled,
+    they get ``None`` and fall through to computing the value themselves.
+
+    The lock is released when the block exits: if the block returns an iterator that computes the
+    value lazily, the lock is released before the value is set, and the cache misses are not
+    coalesced while it is iterated over.
+
+    Usage::
+
+        with single_flight(cache, key) as value:
+            if value is None:
+                value = compute_value()
+                cache_set(cache, key, value, timeout)
+    """
+    lock_key = f"single-flight-{key}"
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, settings.SINGLE_FLIGHT_LOCK_TIMEOUT):
+        try:
+            yield None
+        finally:
+            # The lock may have expired while the value was computed, and been acquired by another
+            # process, so it is only released if it is still ours.
+            _release_lock(cache, lock_key, token)
+        return
+
+    value = None
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            break
+        if cache.get(lock_key) is None:
+            # The lock was released, either right after the key was filled or because the other
+            # process failed to compute the value.
+            value = cache.get(key)
+            break
+    yield value
+
+
+def _release_lock(cache, lock_key, token):
+    if hasattr(cache, "client") and isinstance(cache.client, DefaultClient):
+        # Compare and delete atomically in Redis.
+        client = cache.client.get_client(write=True)
+        client.eval(
+            COMPARE_AND_DELETE_SCRIPT, 1, cache.make_key(lock_key), cache.client.encode(token)
+        )
+    elif cache.get(lock_key) == token:
+        cache.delete(lock_key)
@@ -29,9 +29,33 @@ FEDORA_PASSWORD = (
     or "fedoraAdmin"
 )
 
+# Fedora HTTP connections
+FEDORA_CONNECT_TIMEOUT = getattr(settings, "ERUDIT_FEDORA_CONNECT_TIMEOUT", 3.05)
+FEDORA_READ_TIMEOUT = getattr(settings, "ERUDIT_FEDORA_READ_TIMEOUT", 30)
+FEDORA_POOL_MAXSIZE = getattr(settings, "ERUDIT_FEDORA_POOL_MAXSIZE", 10)
+FEDORA_MAX_RETRIES = getattr(settings, "ERUDIT_FEDORA_MAX_RETRIES", 3)
+FEDORA_RETRY_BACKOFF_FACTOR = getattr(settings, "ERUDIT_FEDORA_RETRY_BACKOFF_FACTOR", 0.3)
+FEDORA_CIRCUIT_BREAKER_FAILURE_THRESHOLD = getattr(
+    settings, "ERUDIT_FEDORA_CIRCUIT_BREAKER_FAILURE_THRESHOLD", 5
+)
+FEDORA_CIRCUIT_BREAKER_RESET_TIMEOUT = getattr(
+    settings, "ERUDIT_FEDORA_CIRCUIT_BREAKER_RESET_TIMEOUT", 30
+)
+
+# Solr HTTP connections, see erudit.solr.client. The read timeout is the SOLR_TIMEOUT setting.
+SOLR_CONNECT_TIMEOUT = getattr(settings, "ERUDIT_SOLR_CONNECT_TIMEOUT", 3.05)
+SOLR_POOL_MAXSIZE = getattr(settings, "ERUDIT_SOLR_POOL_MAXSIZE", 10)
+SOLR_MAX_RETRIES = getattr(settings, "ERUDIT_SOLR_MAX_RETRIES", 2)
+SOLR_RETRY_BACKOFF_FACTOR = getattr(settings, "ERUDIT_SOLR_RETRY_BACKOFF_FACTOR", 0.3)
+
 FEDORA_PIDSPACE = getattr(settings, "ERUDIT_FEDORA_PIDSPACE", "erudit")
 FEDORA_FILEBASED_CACHE_NAME = getattr(settings, "ERUDIT_FEDORA_FILEBASED_CACHE_NAME", "files")
 
+# Each process keeps the liberuditarticle objects it parsed in a LRU cache, bounded by a number of
+# objects and by the total size, in bytes, of the XML contents they were parsed from.
+OBJECT_CACHE_MAX_ENTRIES = getattr(settings, "ERUDIT_OBJECT_CACHE_MAX_ENTRIES", 200)
+OBJECT_CACHE_MAX_SIZE = getattr(settings, "ERUDIT_OBJECT_CACHE_MAX_SIZE", 50 * 1024 * 1024)
+
 
 # The JOURNAL_PROVIDERS setting defines the sets from which the journals can be retrieved using the
 # import commands.
@@ -0,0 +1,176 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import typing
+
+import structlog
+from django.conf import settings
+from prometheus_client import Counter
+
+logger = structlog.getLogger(__name__)
+
+fedora_blob_store_evictions = Counter(
+    "eruditorg_fedora_blob_store_evictions",
+    "Nombre de fichiers retirés du stockage local des flux de données Fedora",
+)
+
+# Number of seconds after which the total size of the blob store is computed again, to take into
+# account the files written by the other processes.
+BLOB_STORE_SCAN_INTERVAL = 60
+
+
+class Blob(typing.NamedTuple):
+    """ Reference to a file of the blob store, cached in place of the content of a datastream. """
+
+    checksum: str
+    size: int
+
+
+class BlobStore:
+    """Content-addressed store of datastream contents on the local disk.
+
+    Contents are stored in files named after their SHA-256 checksum, so that identical contents are
+    stored once. The total size of the files is bounded by ``max_size`` bytes: the least recently
+    used files (according to their modification time, which is updated on each use) are removed
+    when it is exceeded.
+    """
+
+    def __init__(self, root: str, max_size: int):
+        self.root = root
+        self.max_size = max_size
+        self._size = None
+        self._scanned_at = 0
+        self._lock = threading.Lock()
+
+    def get_relative_path(self, blob: Blob) -> str:
+        return os.path.join(blob.checksum[:2], blob.checksum)
+
+    def get_path(self, blob: Blob) -> str:
+        return os.path.join(self.root, self.get_relative_path(blob))
+
+    def open(self, blob: Blob) -> typing.Optional[str]:
+        """ Returns the path of the file of the blob, or None if it is not in the store. """
+        path = self.get_path(blob)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def read(self, blob: Blob) -> typing.Optional[bytes]:
+        """ Returns the content of the blob, or None if it is not in the store. """
+        path = self.open(blob)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, content: bytes) -> Blob:
+        """ Stores the content and returns its blob. """
+        blob = Blob(hashlib.sha256(content).hexdigest(), len(content))
+        if self.open(blob) is not None:
+            return blob
+        writer = self.open_writer()
+        writer.write(content)
+        return writer.commit()
+
+    def open_writer(self) -> "BlobWriter":
+        """ Returns a writer to store a content chunk by chunk. """
+        return BlobWriter(self)
+
+    def _add(self, size: int):
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            if (
+                self._size is None
+                or self._size > self.max_size
+                or time.monotonic() > self._scanned_at + BLOB_STORE_SCAN_INTERVAL
+            ):
+                self._cull()
+
+    def _cull(self):
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            if dirpath == self.root and "tmp" in dirnames:
+                # Files being written are not part of the store yet.
+                dirnames.remove("tmp")
+            for filename in filenames:
+                try:
+                    stat = os.stat(os.path.join(dirpath, filename))
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, os.path.join(dirpath, filename)))
+        size = sum(file_size for mtime, file_size, path in files)
+
+        if size > self.max_size:
+            # Remove the least recently used files until a tenth of the store is free, so that we do
+            # not have to cull the store on every write.
+            for mtime, file_size, path in sorted(files):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                fedora_blob_store_evictions.inc()
+                size -= file_size
+                if size <= self.max_size * 0.9:
+                    break
+            logger.info("fedora.blob-store-culled", size=size)
+
+        self._size = size
+        self._scanned_at = time.monotonic()
+
+
+class BlobWriter:
+    """Writes a content to the blob store chunk by chunk.
+
+    The content is written to a temporary file in the ``tmp`` directory of the store, which is moved
+    to its final path by ``commit()``, so that other processes never see a partial file.
+    ``abort()`` removes the temporary file.
+    """
+
+    def __init__(self, blob_store: BlobStore):
+        self.blob_store = blob_store
+        self.checksum = hashlib.sha256()
+        self.size = 0
+        tmp_dir = os.path.join(blob_store.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        self.file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        self.checksum.update(chunk)
+        self.size += len(chunk)
+        self.file.write(chunk)
+
+    def commit(self) -> Blob:
+        self.file.close()
+        blob = Blob(self.checksum.hexdigest(), self.size)
+        path = self.blob_store.get_path(blob)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self.tmp_path, path)
+        except BaseException:
+            self.abort()
+            raise
+        self.blob_store._add(blob.size)
+        return blob
+
+    def abort(self):
+        self.file.close()
+        try:
+            os.unlink(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+blob_store = (
+    BlobStore(settings.FEDORA_BLOB_STORE_ROOT, settings.FEDORA_BLOB_STORE_MAX_SIZE)
+    if settings.FEDORA_BLOB_STORE_ROOT
+    else None
+)
@@ -1,19 +1,60 @@
 # -*- coding: utf-8 -*-
+import time
 import typing
 import random
-import requests
 import structlog
 
 from django.conf import settings
 from django.core.cache import cache
 from django.utils.translation import get_language
-from requests.exceptions import HTTPError, ConnectionError
+from lxml import etree
+from prometheus_client import Counter
+from requests.exceptions import HTTPError, ConnectionError, Timeout
 from sentry_sdk import configure_scope
 
 from erudit.cache import cache_set
+from erudit.cache import single_flight
+
+from .blobs import Blob
+from .blobs import blob_store
+from .circuit_breaker import CircuitBreakerOpen
+from .session import session
 
 logger = structlog.getLogger(__name__)
 
+# Size of the chunks in which the datastreams streamed from Fedora are read, in bytes.
+STREAMING_CHUNK_SIZE = 64 * 1024
+
+# Value cached in place of the content of a datastream when Fedora answers with a client error
+# (4xx), so that missing datastreams are not requested again on every page view. Datastream contents
+# are bytes, so this string cannot be mistaken for the content of a datastream.
+MISSING_DATASTREAM = "erudit-fedora-missing-datastream"
+
+
+class CachedContent(typing.NamedTuple):
+    """Content fetched from Fedora, as it is cached.
+
+    The content is fresh until ``expires_at`` (a UNIX timestamp), after which it is fetched again
+    from Fedora. It is kept in the cache ``FEDORA_STALE_CACHE_TIMEOUT`` seconds longer, so that it
+    can still be served if Fedora is unavailable. The contents of the ``FEDORA_BLOB_DATASTREAMS``
+    datastreams are only kept longer if they are stored in the blob store.
+    """
+
+    content: typing.Any
+    expires_at: float
+
+
+fedora_negative_cache_hits = Counter(
+    "eruditorg_fedora_negative_cache_hits",
+    "Nombre de requêtes vers Fedora évitées grâce à la mise en cache des flux de données manquants",
+    ["datastream"],
+)
+fedora_stale_content_served = Counter(
+    "eruditorg_fedora_stale_content_served",
+    "Nombre de contenus périmés servis parce que Fedora était indisponible",
+    ["datastream"],
+)
+
 
 def cache_fedora_result(method, duration=settings.LONG_TTL):
     """Cache the result of a method called on a FedoraMixin object
@@ -46,15 +87,18 @@ def cache_fedora_result(method, duration=settings.LONG_TTL):
         val = cache.get(key)
 
         if not val:
-            duration_deviation = random.randint(-(duration // 4), duration // 4)
-            val = method(self, *args, **kwargs)
-            cache_set(
-                cache,
-                key,
-                val,
-                duration + duration_deviation,
-                pids=[self.pid],
-            )
+            # Only one process computes the result when the cache is missed, the others wait for it.
+            with single_flight(cache, key) as val:
+                if not val:
+                    duration_deviation = random.randint(-(duration // 4), duration // 4)
+                    val = method(self, *args, **kwargs)
+                    cache_set(
+                        cache,
+                        key,
+                        val,
+                        duration + duration_deviation,
+                        pids=[self.pid],
+                    )
         return val
 
     return wrapper
@@ -72,41 +116,258 @@ def get_cached_datastream_content(
     argument, if provided, or with a unique generated a cache key using the object pid and the
     datastream name.
 
-    If there is a client error (4xx HTTPError), this function will return None.
+    If there is a client error (4xx HTTPError), this function will return None. The absence of the
+    datastream is cached for ``FEDORA_NEGATIVE_CACHE_TIMEOUT`` seconds.
 
     If there is a server error (5xx HTTPError) or if there is a ConnectionError, this function
-    will raise the exception.
+    will return the expired content if it is still cached, or raise the exception.
     """
     content_key = f"erudit-fedora-file-{pid}-{datastream_name}" if not cache_key else cache_key
-    content = cache.get(content_key)
+    path = f"objects/{pid}/datastreams/{datastream_name}/content"
+    store_blob = datastream_name in settings.FEDORA_BLOB_DATASTREAMS
+    content = _get_cached_fedora_content(
+        pid, path, content_key, datastream_name, store_blob=store_blob
+    )
+    if isinstance(content, Blob):
+        content = blob_store.read(content)
+        if content is None:
+            # The blob was evicted from the blob store since it was looked up, fetch it again.
+            logger.info("fedora.evicted-blob", pid=pid, datastream=datastream_name)
+            content = _fetch_fedora_content(pid, path, content_key, store_blob=store_blob)
+            if isinstance(content, Blob):
+                content = blob_store.read(content)
+    return content
 
-    # If content is already cached, return it.
+
+def stream_datastream_content(
+    pid: str, datastream_name: str, stream: bool = True
+) -> typing.Union[None, bytes, Blob, typing.Iterator[bytes]]:
+    """
+    Given an object pid and a datastream name, returns the content of the datastream in the form
+    that is the most suitable to send it as is in a response:
+
+    * the ``Blob`` of the content if it is stored in the blob store;
+    * an iterator over the chunks of the content if it is not cached and is larger than
+      ``FEDORA_STREAMING_THRESHOLD`` bytes. If the datastream is one of the
+      ``FEDORA_BLOB_DATASTREAMS`` and the blob store is configured, the content is stored in the
+      blob store, and cached, once it has been entirely iterated over. Otherwise it is not cached,
+      so that it is never held in memory. This is disabled if ``stream`` is False;
+    * the content otherwise.
+
+    The concurrent cache misses of a streamed content are not coalesced: the lock of
+    ``single_flight`` is released as soon as the iterator is returned, before the content is
+    cached, so the processes that miss the cache meanwhile also fetch it from Fedora.
+
+    Errors are handled like in ``get_cached_datastream_content``.
+    """
+    return _get_cached_fedora_content(
+        pid,
+        f"objects/{pid}/datastreams/{datastream_name}/content",
+        f"erudit-fedora-file-{pid}-{datastream_name}",
+        datastream_name,
+        store_blob=datastream_name in settings.FEDORA_BLOB_DATASTREAMS,
+        stream=stream,
+    )
+
+
+def fetch_datastream_content(pid: str, datastream_name: str) -> typing.Optional[bytes]:
+    """
+    Given an object pid and a datastream name, returns the content of the datastream without
+    caching it, for the contents that are only read once, like the PDFs read when their issue is
+    imported, so that they do not fill the cache.
+
+    The content is fetched from the cache if it is already cached, even if it has expired, or
+    directly from Fedora.
+
+    If there is a client error (4xx HTTPError), this function will return None. Other errors are
+    raised.
+    """
+    content, _ = _get_fresh_content(cache.get(f"erudit-fedora-file-{pid}-{datastream_name}"))
+    if isinstance(content, Blob):
+        content = blob_store.read(content)
+    if content is not None:
+        return _get_cached_content(content, datastream_name)
+
+    response = session.get(
+        settings.FEDORA_ROOT + f"objects/{pid}/datastreams/{datastream_name}/content"
+    )
+    try:
+        response.raise_for_status()
+    except HTTPError as e:
+        if 400 <= e.response.status_code < 500:
+            return None
+        raise
+    return response.content
+
+
+def get_cached_derived_content(
+    content_key: str, get_content: typing.Callable[[], bytes], pids: typing.List[str]
+) -> typing.Union[bytes, Blob]:
+    """
+    Returns a content derived from Fedora datastreams, like a PDF with its coverpage, calling
+    ``get_content`` to generate it only if it is not cached.
+
+    The content is stored in the blob store and its ``Blob`` is cached for
+    ``FEDORA_CACHE_TIMEOUT`` seconds, tagged with ``pids`` so that it is invalidated when one of the
+    objects it is derived from is reimported. If the blob store is not configured, the content is
+    generated every time, so that large contents like PDFs are not kept in the cache.
+    """
+    if blob_store is None:
+        return get_content()
+
+    content = _get_available_content(cache.get(content_key))
     if content is not None:
         return content
 
+    # Only one process generates the content when the cache is missed, the others wait for it.
+    with single_flight(cache, content_key) as content:
+        content = _get_available_content(content)
+        if content is None:
+            content = blob_store.put(get_content())
+            cache_set(cache, content_key, content, settings.FEDORA_CACHE_TIMEOUT, pids=pids)
+    return content
+
+
+def get_cached_datastream_list(pid: str) -> typing.Optional[typing.Dict[str, str]]:
+    """
+    Given an object pid, returns the mimetypes of the datastreams of the object, by datastream id.
+
+    The list may be fetched from the cache, if it was previously cached, or directly from Fedora.
+    In the latter case, it will be cached for ``FEDORA_CACHE_TIMEOUT`` seconds, tagged with the
+    object pid.
+
+    Errors are handled like in ``get_cached_datastream_content``.
+    """
+    return _get_cached_fedora_content(
+        pid,
+        f"objects/{pid}/datastreams",
+        f"erudit-fedora-datastreams-{pid}",
+        "datastreams",
+        params={"format": "xml"},
+        parse=_parse_datastream_list,
+    )
+
+
+def _parse_datastream_list(content: bytes) -> typing.Dict[str, str]:
+    xml = etree.fromstring(content)
+    return {
+        datastream.get("dsid"): datastream.get("mimeType")
+        for datastream in xml.iterfind("datastream", namespaces=xml.nsmap)
+    }
+
+
+def _get_cached_fedora_content(
+    pid: str,
+    path: str,
+    content_key: str,
+    datastream_name: str,
+    params: typing.Optional[dict] = None,
+    parse: typing.Optional[typing.Callable] = None,
+    store_blob: bool = False,
+    stream: bool = False,
+):
+    content, expired = _get_fresh_content(cache.get(content_key))
+
+    # If content is already cached, return it.
+    if content is not None and not expired:
+        return _get_cached_content(content, datastream_name)
+
+    # Only one process fetches the content from Fedora when the cache is missed, the others wait
+    # for it to be cached. While the content is fetched again, the others get the expired content.
+    with single_flight(cache, content_key) as cached_content:
+        if cached_content is not None:
+            cached_content, _ = _get_fresh_content(cached_content)
+            if cached_content is not None:
+                return _get_cached_content(cached_content, datastream_name)
+        try:
+            return _fetch_fedora_content(
+                pid, path, content_key, params, parse, store_blob, stream
+            )
+        except (HTTPError, ConnectionError, Timeout):
+            # If Fedora is unavailable, serve the expired content if it is still cached.
+            if content is None:
+                raise
+            fedora_stale_content_served.labels(datastream=datastream_name).inc()
+            logger.warning("fedora.stale-content", pid=pid, datastream=datastream_name)
+            return _get_cached_content(content, datastream_name)
+
+
+def _get_fresh_content(cached_content) -> typing.Tuple[typing.Any, bool]:
+    """Returns the content of a cache entry, if it is available, and whether it has expired.
+
+    The contents that are not wrapped in ``CachedContent``, like the absence of a datastream, are
+    fresh until they are evicted from the cache.
+    """
+    if isinstance(cached_content, CachedContent):
+        return (
+            _get_available_content(cached_content.content),
+            cached_content.expires_at <= time.time(),
+        )
+    return _get_available_content(cached_content), False
+
+
+def _get_available_content(content):
+    # The files of the blob store are on the local disk, so the blobs cached by other servers, or
+    # evicted from the blob store, are handled as cache misses.
+    if isinstance(content, Blob) and (blob_store is None or blob_store.open(content) is None):
+        return None
+    return content
+
+
+def _get_cached_content(content, datastream_name: str) -> typing.Optional[bytes]:
+    if content == MISSING_DATASTREAM:
+        fedora_negative_cache_hits.labels(datastream=datastream_name).inc()
+        return None
+    return content
+
+
+def _fetch_fedora_content(
+    pid: str,
+    path: str,
+    content_key: str,
+    params: typing.Optional[dict] = None,
+    parse: typing.Optional[typing.Callable] = None,
+    store_blob: bool = False,
+    stream: bool = False,
+):
     try:
         # Otherwise, get the content from Fedora and cache it for future use.
-        response = requests.get(
-            settings.FEDORA_ROOT + f"objects/{pid}/datastreams/{datastream_name}/content",
-        )
+        if not stream:
+            response = session.get(settings.FEDORA_ROOT + path, params)
+        else:
+            response = session.get(settings.FEDORA_ROOT + path, params, stream=True)
         response.raise_for_status()
-        content = response.content
-
-        cache_set(
-            cache,
-            content_key,
-            content,
-            settings.FEDORA_CACHE_TIMEOUT,
-            pids=[pid],
+
+        if (
+            stream
+            and int(response.headers.get("Content-Length") or 0)
+            > settings.FEDORA_STREAMING_THRESHOLD
+        ):
+            return _stream_fedora_content(response, pid, content_key, store_blob)
+
+        content = parse(response.content) if parse else response.content
+        # Large contents are stored on the local disk, only their reference is cached.
+        if store_blob and blob_store is not None:
+            content = blob_store.put(content)
+        # Large contents are not kept after they expire, unless only their reference is cached.
+        _cache_fedora_content(
+            pid, content_key, content, keep_stale=not store_blob or isinstance(content, Blob)
         )
         return content
 
     except HTTPError as e:
-        # If there is a client error, return None.
+        # If there is a client error, cache the absence of the content and return None.
         if 400 <= e.response.status_code < 500:
             with configure_scope() as scope:
                 scope.fingerprint = ["fedora.warning"]
                 logger.warning("fedora.warning", message=str(e))
+            cache_set(
+                cache,
+                content_key,
+                MISSING_DATASTREAM,
+                settings.FEDORA_NEGATIVE_CACHE_TIMEOUT,
+                pids=[pid],
+            )
             return None
 
         # If there is a server error, raise a HTTPError.
@@ -116,9 +377,51 @@ def get_cached_datastream_content(
                 logger.error("fedora.server-error", message=str(e))
             raise
 
-    except ConnectionError as e:
-        # If Fedora is unreachable, raise a ConnectionError.
+    except CircuitBreakerOpen:
+        # Requests to Fedora are suspended, this was already reported when they failed.
+        raise
+
+    except (ConnectionError, Timeout) as e:
+        # If Fedora is unreachable or does not answer in time, raise the exception.
         with configure_scope() as scope:
             scope.fingerprint = ["fedora.connection-error"]
             logger.error("fedora.connection-error", message=str(e))
         raise
+
+
+def _cache_fedora_content(pid: str, content_key: str, content, keep_stale: bool = True):
+    if not keep_stale or not settings.FEDORA_STALE_CACHE_TIMEOUT:
+        cache_set(cache, content_key, content, settings.FEDORA_CACHE_TIMEOUT, pids=[pid])
+        return
+    # Keep the content after it expires, to serve it if Fedora is unavailable when it is fetched
+    # again.
+    cache_set(
+        cache,
+        content_key,
+        CachedContent(content, time.time() + settings.FEDORA_CACHE_TIMEOUT),
+        settings.FEDORA_CACHE_TIMEOUT + settings.FEDORA_STALE_CACHE_TIMEOUT,
+        pids=[pid],
+    )
+
+
+def _stream_fedora_content(
+    response, pid: str, content_key: str, store_blob: bool
+) -> typing.Iterator[bytes]:
+    # The chunks are written to the blob store as they are sent so that the content can be cached
+    # once it has been entirely received. Nothing is cached if the iteration is interrupted, for
+    # example if the client disconnects, or if there is no blob store to write the chunks to.
+    writer = blob_store.open_writer() if store_blob and blob_store is not None else None
+    completed = False
+    try:
+        for chunk in response.iter_content(chunk_size=STREAMING_CHUNK_SIZE):
+            if writer is not None:
+                writer.write(chunk)
+            yield chunk
+        completed = True
+    finally:
+        response.close()
+        if not completed and writer is not None:
+            writer.abort()
+
+    if writer is not None:
+        _cache_fedora_content(pid, content_key, writer.commit())
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import structlog
+from prometheus_client import Counter
+from requests.exceptions import ConnectionError
+
+logger = structlog.getLogger(__name__)
+
+fedora_circuit_breaker_opened = Counter(
+    "eruditorg_fedora_circuit_breaker_opened",
+    "Nombre de fois où les requêtes vers Fedora ont été suspendues après des échecs consécutifs",
+)
+
+
+class CircuitBreakerOpen(ConnectionError):
+    """ Raised instead of sending a request to Fedora while the circuit breaker is open. """
+
+
+class CircuitBreaker:
+    """Stops sending requests to a failing server.
+
+    The circuit breaker opens after ``failure_threshold`` consecutive failures. While it is open,
+    ``before_request()`` raises ``CircuitBreakerOpen`` so that no request is sent. After
+    ``reset_timeout`` seconds, a single request is let through to probe the server: the circuit
+    breaker closes if it succeeds and opens again if it fails.
+
+    The state of the circuit breaker is kept in the current process.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_request(self):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if self.probing or time.monotonic() < self.opened_at + self.reset_timeout:
+                raise CircuitBreakerOpen("Fedora requests are suspended after repeated failures.")
+            # Let this request through to check if the server is back.
+            self.probing = True
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("fedora.circuit-breaker-closed")
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or (
+                self.opened_at is None and self.failures >= self.failure_threshold
+            ):
+                if self.opened_at is None:
+                    fedora_circuit_breaker_opened.inc()
+                    logger.warning("fedora.circuit-breaker-opened", failures=self.failures)
+                self.opened_at = time.monotonic()
+                self.probing = False
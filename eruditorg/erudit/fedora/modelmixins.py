@@ -1,19 +1,14 @@
+from typing import Dict
 from typing import Optional
 import io
-import requests
-import structlog
 
-from django.conf import settings
 from django.utils.functional import cached_property
-from lxml import etree
 from PIL import Image
-from requests.exceptions import HTTPError, ConnectionError
 from eruditarticle.objects import EruditBaseObject
-from sentry_sdk import configure_scope
 
 from .cache import get_cached_datastream_content
-
-logger = structlog.getLogger(__name__)
+from .cache import get_cached_datastream_list
+from .object_cache import erudit_object_cache
 
 
 class FedoraMixin:
@@ -58,7 +53,9 @@ class FedoraMixin:
             self.get_erudit_object_datastream_name(),
             cache_key=self.localidentifier,
         )
-        return self.erudit_class(fedora_xml_content) if fedora_xml_content else None
+        if not fedora_xml_content:
+            return None
+        return erudit_object_cache.get(self.pid, fedora_xml_content, self.erudit_class)
 
     @cached_property
     def is_in_fedora(self):
@@ -104,43 +101,10 @@ class FedoraMixin:
         return not empty_image
 
     @cached_property
-    def datastream_list(self) -> Optional[etree._Element]:
-        """ Returns the xml list of datastreams of the considered fedora object. """
-        try:
-            response = requests.get(
-                settings.FEDORA_ROOT + f"objects/{self.pid}/datastreams",
-                {"format": "xml"},
-            )
-            response.raise_for_status()
-            return etree.fromstring(response.content)
-
-        except HTTPError as e:
-            # If there's a client error, return None
-            if 400 <= e.response.status_code < 500:
-                with configure_scope() as scope:
-                    scope.fingerprint = ["fedora.warning"]
-                    logger.warning("fedora.warning", message=str(e))
-                return None
-
-            # If there's a server error, raise a HTTPError.
-            elif 500 <= e.response.status_code < 600:
-                with configure_scope() as scope:
-                    scope.fingerprint = ["fedora.server-error"]
-                    logger.error("fedora.server-error", message=str(e))
-                raise
-
-        except ConnectionError as e:
-            # If Fedora is unreachable, raise a ConnectionError.
-            with configure_scope() as scope:
-                scope.fingerprint = ["fedora.connection-error"]
-                logger.error("fedora.connection-error", message=str(e))
-            raise
+    def datastream_list(self) -> Optional[Dict[str, str]]:
+        """ Returns the mimetypes of the datastreams of the considered fedora object, by id. """
+        return get_cached_datastream_list(self.pid)
 
     def has_datastream(self, datastream_name: str) -> bool:
         """ Returns True if the considered fedora object has a given datastream. """
-        if self.datastream_list is not None:
-            xml = self.datastream_list
-            datastream = xml.find(f"datastream[@dsid='{datastream_name}']", namespaces=xml.nsmap)
-            return datastream is not None
-        else:
-            return False
+        return self.datastream_list is not None and datastream_name in self.datastream_list
@@ -0,0 +1,107 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+from typing import Hashable
+from typing import Union
+
+from eruditarticle.objects import EruditBaseObject
+from prometheus_client import Counter
+
+from ..conf import settings
+
+erudit_object_cache_hits = Counter(
+    "eruditorg_erudit_object_cache_hits",
+    "Nombre d'objets liberuditarticle trouvés dans le cache du processus",
+)
+erudit_object_cache_misses = Counter(
+    "eruditorg_erudit_object_cache_misses",
+    "Nombre d'objets liberuditarticle absents du cache du processus",
+)
+erudit_object_cache_evictions = Counter(
+    "eruditorg_erudit_object_cache_evictions",
+    "Nombre d'objets liberuditarticle retirés du cache du processus",
+)
+
+
+class EruditObjectCache:
+    """LRU cache of the liberuditarticle objects parsed by the current process.
+
+    Objects are cached by pid and by a digest of the XML content they were parsed from, so a new
+    version of the content is parsed again. The cache is bounded both by its number of entries and
+    by the total size of the XML contents, which is used as an approximation of the memory used by
+    the parsed objects.
+
+    The cached objects are shared between requests and threads, so they must only be read.
+    """
+
+    def __init__(self, max_entries: int, max_size: int):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()
+        self._keys_by_pid = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(
+        self,
+        pid: str,
+        content: Union[bytes, str],
+        parse: Callable[[Union[bytes, str]], EruditBaseObject],
+    ) -> EruditBaseObject:
+        """ Returns the object parsed from ``content``, calling ``parse`` on a cache miss. """
+        key = (pid, self._get_digest(content))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                erudit_object_cache_hits.inc()
+                return entry[0]
+
+        erudit_object_cache_misses.inc()
+        erudit_object = parse(content)
+        size = len(content)
+        if size <= self.max_size:
+            with self._lock:
+                self._add(pid, key, erudit_object, size)
+        return erudit_object
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_pid.clear()
+            self.size = 0
+
+    def _add(self, pid: str, key: Hashable, erudit_object: EruditBaseObject, size: int):
+        # Objects parsed from a previous version of the content will never be requested again.
+        previous_key = self._keys_by_pid.get(pid)
+        if previous_key is not None:
+            self._remove(previous_key)
+        self._entries[key] = (erudit_object, size)
+        self._keys_by_pid[pid] = key
+        self.size += size
+        while len(self._entries) > self.max_entries or self.size > self.max_size:
+            self._remove(next(iter(self._entries)))
+            erudit_object_cache_evictions.inc()
+
+    def _remove(self, key: Hashable):
+        erudit_object, size = self._entries.pop(key)
+        self.size -= size
+        pid = key[0]
+        if self._keys_by_pid.get(pid) == key:
+            del self._keys_by_pid[pid]
+
+    @staticmethod
+    def _get_digest(content: Union[bytes, str]) -> bytes:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+
+erudit_object_cache = EruditObjectCache(
+    max_entries=settings.OBJECT_CACHE_MAX_ENTRIES,
+    max_size=settings.OBJECT_CACHE_MAX_SIZE,
+)
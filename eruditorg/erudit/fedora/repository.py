@@ -1,7 +1,13 @@
 from eulfedora.server import Repository
 
 from ..conf import settings
+from .session import adapter
+from .session import TIMEOUT
 
 
 repo = Repository(settings.FEDORA_ROOT, settings.FEDORA_USER, settings.FEDORA_PASSWORD)
+# The eulfedora API shares the connection pool and the timeouts of our Fedora session.
+repo.api.session.mount("http://", adapter)
+repo.api.session.mount("https://", adapter)
+repo.api.request_options["timeout"] = TIMEOUT
 api = repo.api
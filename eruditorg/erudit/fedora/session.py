@@ -0,0 +1,131 @@
+import os
+
+import requests
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from ..conf import settings
+from .circuit_breaker import CircuitBreaker
+
+# Connect and read timeouts of the requests sent to Fedora, in seconds.
+TIMEOUT = (settings.FEDORA_CONNECT_TIMEOUT, settings.FEDORA_READ_TIMEOUT)
+
+# Status codes of the responses which are counted as failures by the circuit breaker.
+OUTAGE_STATUS_CODES = (502, 503, 504)
+
+fedora_connections_created = Counter(
+    "eruditorg_fedora_connections_created",
+    "Nombre de connexions HTTP ouvertes vers Fedora",
+)
+fedora_connections_in_use = Gauge(
+    "eruditorg_fedora_connections_in_use",
+    "Nombre de connexions HTTP vers Fedora en cours d'utilisation",
+    multiprocess_mode="livesum",
+)
+fedora_requests = Counter(
+    "eruditorg_fedora_requests",
+    "Nombre de requêtes HTTP envoyées à Fedora",
+    ["method", "status_code"],
+)
+
+
+class MeteredConnectionPoolMixin:
+    """ Keeps track of the connections opened and used by a connection pool. """
+
+    def _new_conn(self):
+        fedora_connections_created.inc()
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        fedora_connections_in_use.inc()
+        return conn
+
+    def _put_conn(self, conn):
+        fedora_connections_in_use.dec()
+        super()._put_conn(conn)
+
+
+class MeteredHTTPConnectionPool(MeteredConnectionPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class MeteredHTTPSConnectionPool(MeteredConnectionPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class FedoraHTTPAdapter(HTTPAdapter):
+    """HTTP adapter used for all the requests sent to Fedora.
+
+    Connections are kept alive in a pool of ``FEDORA_POOL_MAXSIZE`` connections. Idempotent requests
+    are retried ``FEDORA_MAX_RETRIES`` times, with an exponential backoff, on connection errors and
+    on gateway errors.
+
+    After ``FEDORA_CIRCUIT_BREAKER_FAILURE_THRESHOLD`` consecutive failed requests (errors and
+    gateway errors), no request is sent to Fedora for ``FEDORA_CIRCUIT_BREAKER_RESET_TIMEOUT``
+    seconds: ``CircuitBreakerOpen`` is raised instead.
+    """
+
+    def __init__(self):
+        super().__init__(
+            pool_maxsize=settings.FEDORA_POOL_MAXSIZE,
+            max_retries=Retry(
+                total=settings.FEDORA_MAX_RETRIES,
+                backoff_factor=settings.FEDORA_RETRY_BACKOFF_FACTOR,
+                status_forcelist=OUTAGE_STATUS_CODES,
+                allowed_methods=frozenset(("GET", "HEAD")),
+                raise_on_status=False,
+            ),
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=settings.FEDORA_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.FEDORA_CIRCUIT_BREAKER_RESET_TIMEOUT,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": MeteredHTTPConnectionPool,
+            "https": MeteredHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        self.circuit_breaker.before_request()
+        try:
+            response = super().send(request, **kwargs)
+        except BaseException:
+            # Any error must be recorded, otherwise the circuit breaker would stay open after a
+            # failed probe.
+            self.circuit_breaker.record_failure()
+            raise
+        fedora_requests.labels(method=request.method, status_code=response.status_code).inc()
+        # Other server errors are usually caused by a broken object, not by an outage.
+        if response.status_code in OUTAGE_STATUS_CODES:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
+
+class FedoraSession(requests.Session):
+    """ Session sending requests to Fedora with our connection pool and default timeouts. """
+
+    def __init__(self, adapter):
+        super().__init__()
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", TIMEOUT)
+        return super().request(method, url, **kwargs)
+
+
+adapter = FedoraHTTPAdapter()
+session = FedoraSession(adapter)
+
+# Connections must not be shared between processes, so forked processes start with an empty pool.
+os.register_at_fork(after_in_child=adapter.poolmanager.clear)
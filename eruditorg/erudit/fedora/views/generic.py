@@ -5,15 +5,30 @@ This module defines generic class-based views to use in order to achieve common
 that involve Fedora and datastreams.
 """
 
+import datetime as dt
+import hashlib
+import os
 import structlog
+import typing
 
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse
 from django.http import Http404
 from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
 from django.views.generic import View
 from django.views.generic.detail import SingleObjectMixin
 
+from base.http import get_byte_range_response
+
+from ..blobs import Blob
+from ..blobs import blob_store
 from ..cache import get_cached_datastream_content
+from ..cache import stream_datastream_content
 
 logger = structlog.getLogger(__name__)
 
@@ -28,6 +43,21 @@ class FedoraFileDatastreamView(SingleObjectMixin, View):
         "get",
     ]
 
+    # Views that send the content of the datastream as is can set this to True so that the content
+    # is served directly from the file of the blob store when it is stored there, or streamed from
+    # Fedora when it is large and not cached yet.
+    datastream_passthrough = False
+
+    # Views can set this to True to support the byte range requests used by PDF viewers and media
+    # players to get parts of large files.
+    accept_byte_ranges = False
+
+    # Number of seconds during which browsers and proxies can reuse the response without validating
+    # it again. This must only be set by the views of public datastreams that rarely change: the
+    # responses of the other views that provide validators are cached privately and validated on
+    # each use.
+    max_age = None
+
     @property
     def content_type(self) -> str:
         raise NotImplementedError
@@ -37,7 +67,28 @@ class FedoraFileDatastreamView(SingleObjectMixin, View):
         raise NotImplementedError
 
     def get(self, request, **kwargs):
-        return self.write_to_response()
+        last_modified = self.get_last_modified()
+        if last_modified is not None:
+            # Answer conditional requests without getting the content of the datastream.
+            validators = HttpResponse()
+            self.set_validators(validators, last_modified)
+            response = get_conditional_response(
+                request,
+                etag=validators["ETag"],
+                last_modified=int(last_modified.timestamp()),
+                response=validators,
+            )
+            if response is not validators:
+                return response
+
+        response = self.write_to_response()
+        if response.status_code == 503:
+            return response
+        if last_modified is not None:
+            self.set_validators(response, last_modified)
+        if self.accept_byte_ranges:
+            response = get_byte_range_response(request, response)
+        return response
 
     def get_object_pid(self):
         """
@@ -60,17 +111,126 @@ class FedoraFileDatastreamView(SingleObjectMixin, View):
             )
         return obj.pid
 
+    def get_last_modified(self) -> typing.Optional[dt.datetime]:
+        """
+        Returns the date of the last modification of the datastream, or None if it is unknown.
+
+        If a date is returned, the responses provide ``ETag`` and ``Last-Modified`` validators and
+        the conditional requests are answered with 304 Not Modified responses. By default, views do
+        not provide validators.
+        """
+        return None
+
+    def get_etag(self, last_modified: dt.datetime) -> str:
+        """
+        Returns the strong ETag of the datastream, derived from the PID of the Fedora object, the
+        name of the datastream and the date of its last modification.
+        """
+        digest = hashlib.blake2b(
+            f"{self._object_pid}-{self.datastream_name}-{last_modified.timestamp()}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        return f'"{digest}"'
+
+    def set_validators(self, response, last_modified: dt.datetime):
+        """
+        Sets the validators and the caching policy of the response.
+        """
+        response["ETag"] = self.get_etag(last_modified)
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+        if self.max_age is not None:
+            patch_cache_control(response, public=True, max_age=self.max_age)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+
     def write_to_response(self):
         """
         Writes the content of the fedora object's datastream to an HttpResponse object
         and return it.
         """
+        if self.datastream_passthrough:
+            return self.get_passthrough_response_object()
+
         content = self.get_datastream_content()
+        if isinstance(content, Blob):
+            response = self.get_file_response_object(blob_store.get_path(content))
+            if response is not None:
+                return response
+            # The file was evicted from the blob store, the content has to be generated again.
+            content = self.get_datastream_content()
+            if isinstance(content, Blob):
+                content = blob_store.read(content)
+            if content is None:
+                # The file was evicted again before it was read: the blob store is too small for
+                # the contents it is asked to keep, so the client is asked to retry later.
+                logger.warning(
+                    "fedora.blob-evicted", pid=self._object_pid, datastream=self.datastream_name
+                )
+                response = HttpResponse(status=503)
+                response["Retry-After"] = "1"
+                return response
         response = self.get_response_object()
         self.write_datastream_content(response, content)
 
         return response
 
+    def get_passthrough_response_object(self):
+        """
+        Returns a response sending the content of the datastream as is.
+
+        The content is served from the file of the blob store when it is stored there, or streamed
+        from Fedora when it is large and not cached yet. The content is not streamed when a byte
+        range is requested: it is fetched and cached first, so that the range can be served from
+        the cache or from the blob store.
+        """
+        content = stream_datastream_content(
+            self._object_pid,
+            self.datastream_name,
+            stream=not (self.accept_byte_ranges and "HTTP_RANGE" in self.request.META),
+        )
+
+        # Returns a 404 HTTP response if the datastream does not exist.
+        if content is None:
+            raise Http404
+
+        if isinstance(content, Blob):
+            response = self.get_file_response_object(blob_store.get_path(content))
+            if response is not None:
+                return response
+            content = self.get_datastream_content()
+        elif not isinstance(content, bytes):
+            return StreamingHttpResponse(content, content_type=self.content_type)
+
+        response = self.get_response_object()
+        self.write_datastream_content(response, content)
+        return response
+
+    def get_file_response_object(self, path):
+        """
+        Returns a response serving the file of the blob store without copying it in memory.
+
+        The file is served by nginx if ``FEDORA_BLOB_STORE_ACCEL_REDIRECT_URL`` is set, otherwise
+        it is sent with the ``sendfile`` system call if the WSGI server supports it.
+        """
+        if settings.FEDORA_BLOB_STORE_ACCEL_REDIRECT_URL:
+            response = self.get_response_object()
+            response["X-Accel-Redirect"] = settings.FEDORA_BLOB_STORE_ACCEL_REDIRECT_URL + (
+                os.path.relpath(path, settings.FEDORA_BLOB_STORE_ROOT)
+            )
+            return response
+        try:
+            response = FileResponse(open(path, "rb"), content_type=self.content_type)
+        except FileNotFoundError:
+            # The file was evicted from the blob store in the meantime.
+            return None
+        # FileResponse names the file after its path in the blob store, which is a checksum.
+        content_disposition = self.get_content_disposition()
+        if content_disposition is not None:
+            response["Content-Disposition"] = content_disposition
+        elif response.has_header("Content-Disposition"):
+            del response["Content-Disposition"]
+        return response
+
     def get_response_object(self):
         """
         Returns the HttpResponse object that will contain the content of datastream.
@@ -78,14 +238,24 @@ class FedoraFileDatastreamView(SingleObjectMixin, View):
         This method can be overriden in order to add extra headers if applicable.
         """
         response = HttpResponse(content_type=self.content_type)
+        content_disposition = self.get_content_disposition()
+        if content_disposition is not None:
+            response["Content-Disposition"] = content_disposition
         return response
 
+    def get_content_disposition(self) -> typing.Optional[str]:
+        """
+        Returns the value of the Content-Disposition header of the responses, if any.
+        """
+        return None
+
     def get_datastream_content(self):
         """
         Returns the content of the considered Fedora datastream.
 
         By default this requires `self.datastream_name` to be specified but
-        subclasses can override this to change this.
+        subclasses can override this to change this. Subclasses that send a content stored in the
+        blob store can return its ``Blob``, the file of the blob store is then served directly.
         """
         content = get_cached_datastream_content(self._object_pid, self.datastream_name)
 
@@ -2,12 +2,12 @@
 from datetime import datetime
 from dateutil.parser import parse
 from django.core.management.base import BaseCommand
-from django.conf import settings
 from erudit.models import Issue
 from erudit.models import Journal
-import pysolr
 import structlog
 
+from erudit.solr.client import get_client
+
 logger = structlog.getLogger(__name__)
 
 
@@ -50,7 +50,7 @@ class Command(BaseCommand):
         for option in options:
             assert option is not None
 
-        self.client = pysolr.Solr(settings.SOLR_ROOT, timeout=settings.SOLR_TIMEOUT)
+        self.client = get_client("import-issues")
         self.journal_localidentifier = options.get("journal_localidentifier", None)
         self.year_min = options.get("year_min", None)
         self.year_max = datetime.now().year
@@ -484,6 +484,11 @@ class Command(BaseCommand):
         issue.is_published = issue_pid in journal_erudit_object.get_published_issues_pids()
         issue.save()
 
+        # STEP 3: records the PDFs of the articles of the issue
+        # --
+
+        issue.record_article_pdfs()
+
         # STEP 4: patches the journal associated with the issue
         # --
 
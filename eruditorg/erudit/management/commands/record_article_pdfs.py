@@ -0,0 +1,62 @@
+import structlog
+from django.core.management.base import BaseCommand
+
+from ...models import Issue
+
+logger = structlog.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Records the PDFs of the articles of the issues that are already imported.
+
+    The PDFs of the articles are recorded when their issue is imported by the
+    ``import_journals_from_fedora`` command. This command records them for the issues that were
+    imported before, so that the views do not have to open the PDFs of their articles.
+
+    By default, only the issues whose PDFs were never recorded are handled. If the `all` switch is
+    passed, the PDFs of every issue are recorded again.
+    """
+
+    help = "Record the PDFs of the articles of the imported issues"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="all",
+            default=False,
+            help="Record the PDFs of the issues whose PDFs are already recorded.",
+        )
+        parser.add_argument(
+            "--journal-pid", action="store", dest="journal_pid", help="Journal PID to handle."
+        )
+        parser.add_argument(
+            "--issue-pid", action="store", dest="issue_pid", help="Issue PID to handle."
+        )
+
+    def handle(self, *args, **options):
+        issues = Issue.internal_objects.select_related("journal__collection")
+        if options.get("journal_pid"):
+            issues = issues.filter(
+                journal__localidentifier=options["journal_pid"].split(".")[-1]
+            )
+        if options.get("issue_pid"):
+            issues = issues.filter(localidentifier=options["issue_pid"].split(".")[-1])
+        if not options.get("all"):
+            issues = issues.filter(article_pdfs__isnull=True)
+        logger.info("record.started", **options)
+
+        issue_count, issue_errored_count = 0, 0
+        for issue in issues.distinct().iterator():
+            try:
+                issue.record_article_pdfs()
+            except Exception as e:
+                issue_errored_count += 1
+                logger.exception("issue.pdfs.record.error", issue_pid=issue.pid, error=e)
+            else:
+                issue_count += 1
+                logger.info("issue.pdfs.recorded", issue_pid=issue.pid)
+
+        logger.info(
+            "record.finished", issue_count=issue_count, issue_errored_count=issue_errored_count
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.3 on 2026-10-17 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('erudit', '0130_auto_20210607_1454'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticlePdf',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('localidentifier', models.CharField(max_length=100, verbose_name='Identifiant Fedora')),
+                ('datastream_name', models.CharField(max_length=20, verbose_name='Flux de données')),
+                ('size', models.PositiveIntegerField(verbose_name='Taille')),
+                ('page_count', models.PositiveIntegerField(verbose_name='Nombre de pages')),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_pdfs', to='erudit.issue', verbose_name='Numéro')),
+            ],
+            options={
+                'verbose_name': "PDF d'article",
+                'verbose_name_plural': "PDF d'articles",
+                'unique_together': {('issue', 'localidentifier')},
+            },
+        ),
+    ]
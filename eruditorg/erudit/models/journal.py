@@ -3,11 +3,8 @@ import dateutil.relativedelta as dr
 import lxml.etree as et
 from collections import OrderedDict
 from hashlib import md5
-from io import BytesIO
 from functools import wraps
 import structlog
-import pikepdf
-import fitz
 import typing
 import re
 
@@ -25,11 +22,13 @@ from eruditarticle.objects import EruditJournal
 from eruditarticle.objects import EruditPublication, SummaryArticle
 from urllib.parse import urlparse
 from eruditarticle.objects.exceptions import LiberuditarticleError
+from base.pdf import get_pdf_page_count
 
 from ..abstract_models import FedoraDated
 from ..conf import settings as erudit_settings
 from ..fedora.modelmixins import FedoraMixin
 from ..fedora.cache import cache_fedora_result
+from ..fedora.cache import fetch_datastream_content
 from ..fedora.cache import get_cached_datastream_content
 from ..fedora.utils import localidentifier_from_pid
 
@@ -669,6 +668,22 @@ class Issue(FedoraMixin, FedoraDated):
             if first_article.erudit_object.is_of_type_roc:
                 self.force_free_access = True
 
+    def record_article_pdfs(self):
+        """Records the page count, the size and the datastream name of the PDFs of the articles of
+        the issue, so that the views do not have to open the PDFs."""
+        localidentifiers = []
+        for article in self.get_articles_from_fedora():
+            localidentifiers.append(article.localidentifier)
+            try:
+                article.record_pdf_info()
+            except Exception as e:
+                logger.exception(
+                    "article.pdf.import.error",
+                    article_pid=article.pid,
+                    error=e,
+                )
+        self.article_pdfs.exclude(localidentifier__in=localidentifiers).delete()
+
     def get_articles_from_fedora(self):
         for article in self.erudit_object.get_summary_articles():
             try:
@@ -1282,16 +1297,74 @@ class Article(FedoraMixin):
         return get_cached_datastream_content(self.get_full_identifier(), self.pdf_datastream_name)
 
     @cached_property
-    def can_display_first_pdf_page(self):
+    def pdf_info(self) -> typing.Optional["ArticlePdf"]:
+        """Returns the information about the PDF of the article recorded when its issue was
+        imported, or None if the article has no PDF.
+
+        If the issue is not imported, or was imported before the PDFs were recorded and the
+        ``record_article_pdfs`` command was not run since, the information is computed from the PDF,
+        but it is not recorded. This fallback is temporary, until the PDFs of all the imported
+        issues are recorded."""
         if not self.has_pdf:
-            return False
-        try:
-            with fitz.Document(stream=self.pdf, filetype="pdf") as pdf:
-                return len(pdf) > 1
-        except RuntimeError:
-            logger.error("RuntimeError in fitz", exc_info=True)
-            with pikepdf.open(BytesIO(self.pdf)) as pdf:
-                return len(pdf.pages) > 1
+            return None
+        if self.issue.pk is not None:
+            try:
+                return ArticlePdf.objects.get(
+                    issue=self.issue, localidentifier=self.localidentifier
+                )
+            except ArticlePdf.DoesNotExist:
+                pass
+        return self.get_pdf_info()
+
+    def get_pdf_info(self, cache_pdf: bool = True) -> typing.Optional["ArticlePdf"]:
+        """Returns the page count, the size and the datastream name of the PDF of the article,
+        computed from the PDF, in an unsaved ArticlePdf, or None if the article has no PDF.
+
+        If ``cache_pdf`` is False, the PDF is not cached if it is fetched from Fedora."""
+        if not self.has_pdf:
+            return None
+        if cache_pdf:
+            content = self.pdf
+        else:
+            content = fetch_datastream_content(
+                self.get_full_identifier(), self.pdf_datastream_name
+            )
+        if not content:
+            return None
+        return ArticlePdf(
+            issue=self.issue,
+            localidentifier=self.localidentifier,
+            datastream_name=self.pdf_datastream_name,
+            size=len(content),
+            page_count=get_pdf_page_count(content),
+        )
+
+    def record_pdf_info(self) -> typing.Optional["ArticlePdf"]:
+        """Records the page count, the size and the datastream name of the PDF of the article, so
+        that the PDF does not have to be fetched from Fedora to know them.
+
+        The PDF is not cached, since it is read when the issue is imported, not when it is
+        served."""
+        pdf_info = self.get_pdf_info(cache_pdf=False)
+        if pdf_info is None:
+            ArticlePdf.objects.filter(
+                issue=self.issue, localidentifier=self.localidentifier
+            ).delete()
+            return None
+        pdf_info, _created = ArticlePdf.objects.update_or_create(
+            issue=self.issue,
+            localidentifier=self.localidentifier,
+            defaults={
+                "datastream_name": pdf_info.datastream_name,
+                "size": pdf_info.size,
+                "page_count": pdf_info.page_count,
+            },
+        )
+        return pdf_info
+
+    @cached_property
+    def can_display_first_pdf_page(self):
+        return self.pdf_info is not None and self.pdf_info.page_count > 1
 
     @property
     @catch_and_log
@@ -1548,6 +1621,32 @@ class Article(FedoraMixin):
         return infoimg_dict
 
 
+class ArticlePdf(models.Model):
+    """Stores the information about the PDF of an article.
+
+    It is recorded when the issue of the article is imported from Fedora, so that the views do not
+    have to fetch and open the PDF.
+    """
+
+    issue = models.ForeignKey(
+        Issue, verbose_name=_("Numéro"), related_name="article_pdfs", on_delete=models.CASCADE
+    )
+    localidentifier = models.CharField(max_length=100, verbose_name=_("Identifiant Fedora"))
+    """ The ``Fedora`` identifier of the article """
+
+    datastream_name = models.CharField(max_length=20, verbose_name=_("Flux de données"))
+    size = models.PositiveIntegerField(verbose_name=_("Taille"))
+    page_count = models.PositiveIntegerField(verbose_name=_("Nombre de pages"))
+
+    class Meta:
+        unique_together = ("issue", "localidentifier")
+        verbose_name = _("PDF d'article")
+        verbose_name_plural = _("PDF d'articles")
+
+    def __str__(self):
+        return self.localidentifier
+
+
 class JournalInformation(models.Model):
     """ Stores the information related to a specific Journal instance. """
 
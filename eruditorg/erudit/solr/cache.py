@@ -0,0 +1,72 @@
+import hashlib
+import json
+import pickle
+
+import pysolr
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from prometheus_client import Counter
+
+logger = structlog.getLogger(__name__)
+
+solr_cache_requests = Counter(
+    "eruditorg_solr_cache_requests",
+    "Nombre de requêtes Solr pouvant être servies par la cache, par origine et par résultat "
+    "(hit ou miss)",
+    ["call_site", "result"],
+)
+
+# Parameters whose values are lists in which the order does not matter.
+UNORDERED_PARAMS = {"fq", "facet.field"}
+
+
+def get_search_cache_key(solr_url: str, q: str, params: dict) -> str:
+    """Returns the cache key of a Solr request.
+
+    The parameters are put in a canonical form so that equivalent requests get the same key: the
+    whitespace is normalised and the filter queries and the facet fields are sorted.
+    """
+
+    def normalise(value):
+        if isinstance(value, (list, tuple)):
+            return [normalise(v) for v in value]
+        return " ".join(str(value).split())
+
+    canonical_params = {"q": normalise(q)}
+    for name, value in params.items():
+        value = normalise(value)
+        if name in UNORDERED_PARAMS and isinstance(value, list):
+            value = sorted(value)
+        canonical_params[name] = value
+    digest = hashlib.blake2b(
+        json.dumps([solr_url, canonical_params], sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    return f"solr-search-{digest}"
+
+
+def cached_search(call_site: str, client: pysolr.Solr, q: str, **params) -> pysolr.Results:
+    """Sends a search request to Solr, or returns the results of an identical request if they
+    were sent less than ``SOLR_CACHE_TIMEOUTS[call_site]`` seconds ago.
+
+    The results are not cached if the call site has no timeout or if they are larger than
+    ``SOLR_CACHE_MAX_SIZE`` bytes once pickled.
+    """
+    timeout = settings.SOLR_CACHE_TIMEOUTS.get(call_site)
+    if not timeout:
+        return client.search(q, **params)
+
+    key = get_search_cache_key(client.url, q, params)
+    results = cache.get(key)
+    if results is not None:
+        solr_cache_requests.labels(call_site=call_site, result="hit").inc()
+        return results
+
+    solr_cache_requests.labels(call_site=call_site, result="miss").inc()
+    results = client.search(q, **params)
+    pickled_results = pickle.dumps(results, pickle.HIGHEST_PROTOCOL)
+    if len(pickled_results) > settings.SOLR_CACHE_MAX_SIZE:
+        logger.info("solr.cache.too-large", call_site=call_site, size=len(pickled_results))
+    else:
+        cache.set(key, results, timeout)
+    return results
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+import pysolr
+import requests
+from django.conf import settings as django_settings
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..conf import settings
+
+solr_requests = Counter(
+    "eruditorg_solr_requests",
+    "Nombre de requêtes HTTP envoyées à Solr, par origine",
+    ["call_site", "method"],
+)
+solr_request_errors = Counter(
+    "eruditorg_solr_request_errors",
+    "Nombre de requêtes HTTP vers Solr ayant échoué, par origine",
+    ["call_site"],
+)
+solr_request_duration = Histogram(
+    "eruditorg_solr_request_duration_seconds",
+    "Durée des requêtes HTTP envoyées à Solr, par origine",
+    ["call_site"],
+)
+
+
+class SolrHTTPAdapter(HTTPAdapter):
+    """HTTP adapter used for all the requests sent to Solr.
+
+    Connections are kept alive in a pool of ``SOLR_POOL_MAXSIZE`` connections. GET requests are
+    retried ``SOLR_MAX_RETRIES`` times, with an exponential backoff, on connection errors and on
+    gateway errors.
+    """
+
+    def __init__(self):
+        super().__init__(
+            pool_maxsize=settings.SOLR_POOL_MAXSIZE,
+            max_retries=Retry(
+                total=settings.SOLR_MAX_RETRIES,
+                backoff_factor=settings.SOLR_RETRY_BACKOFF_FACTOR,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(("GET", "HEAD")),
+                raise_on_status=False,
+            ),
+        )
+
+
+class MeteredSolr(pysolr.Solr):
+    """ Solr client that keeps track of the requests sent by its call site. """
+
+    def __init__(self, call_site: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.call_site = call_site
+
+    def _send_request(self, method, *args, **kwargs):
+        solr_requests.labels(call_site=self.call_site, method=method.upper()).inc()
+        started_at = time.monotonic()
+        try:
+            return super()._send_request(method, *args, **kwargs)
+        except pysolr.SolrError:
+            solr_request_errors.labels(call_site=self.call_site).inc()
+            raise
+        finally:
+            solr_request_duration.labels(call_site=self.call_site).observe(
+                time.monotonic() - started_at
+            )
+
+
+_session = None
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_client(call_site: str) -> pysolr.Solr:
+    """Returns the Solr client of a call site.
+
+    The clients are created on first use and kept for the lifetime of the process. They all send
+    their requests through the same session, so that their connections are reused. The requests
+    are counted and timed by call site.
+    """
+    client = _clients.get(call_site)
+    if client is None:
+        with _lock:
+            client = _clients.get(call_site)
+            if client is None:
+                client = _clients[call_site] = _create_client(call_site)
+    return client
+
+
+def _create_client(call_site: str) -> pysolr.Solr:
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = SolrHTTPAdapter()
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return MeteredSolr(
+        call_site,
+        django_settings.SOLR_ROOT,
+        timeout=(settings.SOLR_CONNECT_TIMEOUT, django_settings.SOLR_TIMEOUT),
+        session=_session,
+    )
+
+
+def _reset_clients():
+    global _session
+    # Connections must not be shared between processes, so forked processes create their own.
+    _session = None
+    _clients.clear()
+
+
+os.register_at_fork(after_in_child=_reset_clients)
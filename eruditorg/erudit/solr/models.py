@@ -7,18 +7,18 @@ from typing import (
 )
 
 from django.conf import settings
+from django.db.models import Q
 from django.urls import reverse
 from django.utils.translation import get_language, gettext as _
 from django.core.cache import cache
 import pysolr
 
 from core.solrq.query import solr_escape
+from erudit.solr.cache import cached_search
+from erudit.solr.client import get_client
 from erudit import models as erudit_models
 from erudit.templatetags.model_formatters import person_list
 
-# This is the object that will be used to query the Solr index.
-client = pysolr.Solr(settings.SOLR_ROOT, timeout=settings.SOLR_TIMEOUT)
-
 
 LANGUAGE_LABELS = {
     "ar": _("Arabe"),
@@ -209,6 +209,12 @@ class BaseArticle(SolrDocument):
 class ExternalArticle(BaseArticle):
     """ External articles are those from the Persée & NRC collections. """
 
+    def __init__(
+        self, solr_data: Dict[str, Any], journal: Optional[erudit_models.Journal] = None
+    ) -> None:
+        super().__init__(solr_data)
+        self._journal = journal
+
     @property
     def journal_type(self) -> str:
         # All journals from the Persée & NRC collections are `scientific` journals.
@@ -216,10 +222,12 @@ class ExternalArticle(BaseArticle):
 
     @property
     def journal_url(self) -> str:
-        localidentifier = self.solr_data["RevueID"]
-        if self.solr_data["Fonds_fac"] == "Persée":
-            localidentifier = "persee" + localidentifier
-        journal = erudit_models.Journal.legacy_objects.get_by_id(localidentifier)
+        journal = self._journal
+        if journal is None:
+            localidentifier = self.solr_data["RevueID"]
+            if self.solr_data["Fonds_fac"] == "Persée":
+                localidentifier = "persee" + localidentifier
+            journal = erudit_models.Journal.legacy_objects.get_by_id(localidentifier)
         if journal.external_url:
             return journal.external_url
         return reverse("public:journal:journal_detail", args=(journal.code,))
@@ -376,6 +384,113 @@ def get_model_instance(solr_data):
         return SolrDocument(solr_data)
 
 
+def get_model_instances(solr_documents: List[Dict[str, Any]]) -> List[SolrDocument]:
+    """Returns the model instances of a page of Solr documents.
+
+    This is the same as calling ``get_model_instance`` on each document, but the issues and the
+    journals of the articles are fetched in two queries instead of one or two queries per article.
+    The issues that are neither in the database nor in Fedora are remembered for
+    ``FEDORA_NEGATIVE_CACHE_TIMEOUT`` seconds, so that Fedora is not requested for them on every
+    search.
+    """
+    article_documents = [
+        solr_data
+        for solr_data in solr_documents
+        if SolrDocument(solr_data).document_type == "article"
+    ]
+
+    # Fetch all results' issues in one query to avoid one query per result.
+    issue_qs = erudit_models.Issue.objects.select_related(
+        "journal__collection",
+        "journal__type",
+    ).filter(localidentifier__in={solr_data.get("NumeroID") for solr_data in article_documents})
+    issues = {issue.localidentifier: issue for issue in issue_qs}
+
+    # Fetch the journals of the other results in one query. They are needed to get their issues
+    # from Fedora, or to link to the journals of external articles.
+    other_documents = [
+        solr_data for solr_data in article_documents if solr_data.get("NumeroID") not in issues
+    ]
+    journals = _get_journals(
+        {solr_data.get("RevueID") for solr_data in other_documents}
+        | {_get_external_journal_id(solr_data) for solr_data in other_documents}
+    )
+    issues.update(_get_fedora_issues(other_documents, journals))
+
+    def get(solr_data):
+        if SolrDocument(solr_data).document_type != "article":
+            return get_model_instance(solr_data)
+        issue = issues.get(solr_data.get("NumeroID"))
+        if issue is not None:
+            return InternalArticle(solr_data, issue)
+        return ExternalArticle(solr_data, journals.get(_get_external_journal_id(solr_data)))
+
+    return [get(solr_data) for solr_data in solr_documents]
+
+
+def _get_fedora_issues(
+    article_documents: List[Dict[str, Any]], journals: Dict[str, erudit_models.Journal]
+) -> Dict[str, erudit_models.Issue]:
+    # Returns the ephemeral issues of the articles that are in Fedora, like
+    # ``Issue.from_fedora_ids`` would, but remembers the issues that are not.
+    missing_keys = {
+        f"solr-missing-issue-{solr_data['NumeroID']}": solr_data
+        for solr_data in article_documents
+        if solr_data.get("NumeroID")
+    }
+    for key in cache.get_many(missing_keys):
+        del missing_keys[key]
+
+    issues = {}
+    missing_issues = {}
+    for key, solr_data in missing_keys.items():
+        journal = journals.get(solr_data.get("RevueID"))
+        if journal is not None:
+            issue = erudit_models.Issue()
+            issue.journal = journal
+            issue.localidentifier = solr_data["NumeroID"]
+            if issue.is_in_fedora:
+                issue.sync_with_erudit_object()
+                issues[issue.localidentifier] = issue
+                continue
+        missing_issues[key] = True
+    if missing_issues:
+        cache.set_many(missing_issues, settings.FEDORA_NEGATIVE_CACHE_TIMEOUT)
+    return issues
+
+
+def _get_external_journal_id(solr_data: Dict[str, Any]) -> Optional[str]:
+    localidentifier = solr_data.get("RevueID")
+    if localidentifier and solr_data.get("Fonds_fac") == "Persée":
+        localidentifier = "persee" + localidentifier
+    return localidentifier
+
+
+def _get_journals(journal_ids: set) -> Dict[str, erudit_models.Journal]:
+    # Returns the journals by id, like ``Journal.legacy_objects.get_by_id`` would.
+    journal_ids.discard(None)
+    if not journal_ids:
+        return {}
+    codes = {"cd1" if journal_id == "cd" else journal_id for journal_id in journal_ids}
+    journal_qs = erudit_models.Journal.legacy_objects.select_related(
+        "collection",
+        "type",
+    ).filter(Q(code__in=codes) | Q(localidentifier__in=codes))
+    journals = {}
+    for journal in journal_qs:
+        for journal_id in {journal.code, journal.localidentifier}:
+            if journal_id in journals:
+                # ``get_by_id`` would raise MultipleObjectsReturned.
+                journals[journal_id] = None
+            else:
+                journals[journal_id] = journal
+    if "cd" in journal_ids:
+        journals["cd"] = journals.get("cd1")
+    return {
+        journal_id: journal for journal_id, journal in journals.items() if journal is not None
+    }
+
+
 def get_all_articles(rows, page):
     query = "Fonds_fac:Érudit Corpus_fac:(Article OR Culturel)"
     args = {
@@ -384,7 +499,7 @@ def get_all_articles(rows, page):
         "rows": str(rows),
         "start": str((page - 1) * rows),
     }
-    solr_results = client.search(**args)
+    solr_results = cached_search("articles", get_client("articles"), **args)
 
     # Fetch all results' issues in one query to avoid one query per result.
     issue_ids = {doc["NumeroID"] for doc in solr_results.docs}
@@ -411,7 +526,9 @@ def get_all_articles(rows, page):
 
 
 def get_solr_data_from_id(solr_id):
-    results = client.search(q='ID:"{}"'.format(solr_escape(solr_id)))
+    results = cached_search(
+        "document", get_client("document"), q='ID:"{}"'.format(solr_escape(solr_id))
+    )
     if not results.hits:
         raise ValueError("No Solr object found")
     elif results.hits > 1:
@@ -430,7 +547,7 @@ class SolrData:
             "facet.limit": "0",
             "fl": "ID,NumeroID,RevueID",
         }
-        solr_results = self.client.search(**args)
+        solr_results = cached_search("document", self.client, **args)
         if solr_results.hits:
             doc = solr_results.docs[0]
             return doc["RevueID"], doc["NumeroID"], doc["ID"]
@@ -473,4 +590,4 @@ class SolrData:
 
 
 def get_solr_data() -> SolrData:
-    return SolrData(pysolr.Solr(settings.SOLR_ROOT, timeout=settings.SOLR_TIMEOUT))
+    return SolrData(get_client("solr-data"))
@@ -107,11 +107,19 @@ class FakeResponse:
         self.content = content
         self.url = FakeAPI.BASE_URL + path
         self.text = ""
+        self.headers = {"Content-Length": str(len(content))} if content else {}
 
     def raise_for_status(self):
         if self.status_code != 200:
             raise HTTPError(f"{self.status_code}: {self.url}", response=self)
 
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self):
+        pass
+
 
 class FakeAPI(ApiFacade):
     BASE_URL = "http://fakeurl/"
@@ -1,5 +1,5 @@
 {% load adv_cache i18n public_journal_tags static waffle_tags %}<?xml version="1.0" encoding="UTF-8"?>
-<xsl:stylesheet xmlns:xsl="http://www.w3.org/1999/XSL/Transform" version="2.0">
+<xsl:stylesheet xmlns:xsl="http://www.w3.org/1999/XSL/Transform" xmlns:erudit="http://erudit.org/xslt/extensions" exclude-result-prefixes="erudit" version="2.0">
   <xsl:output method="html" indent="yes" encoding="UTF-8"/>
 
   <!--=========== VARIABLES & PARAMETERS ===========-->
@@ -25,18 +25,74 @@
   <xsl:variable name="uriStart">https://id.erudit.org/iderudit/</xsl:variable>
   <xsl:variable name="doiStart">https://doi.org/</xsl:variable>
 
-  <v:variables xmlns:v="variables-node">
-    {% for imid, infoimg in article.infoimg_dict.items %}
-    <v:variable n="plgr-{{ imid }}" value="{{ infoimg.plgr }}" xmlns:v="variables-node" />
-    <v:variable n="width-{{ imid }}" value="{{ infoimg.width }}" xmlns:v="variables-node" />
-    <v:variable n="height-{{ imid }}" value="{{ infoimg.height }}" xmlns:v="variables-node" />
-    {% endfor %}
-  </v:variables>
-  <xsl:variable name="vars" select="document('')//v:variables/v:variable" xmlns:v="variables-node" />
-
   <!-- Savante, culturelle, ... -->
   <xsl:param name="typecoll" />
 
+  <!--
+    This stylesheet is compiled once per language (see apps.public.journal.xslt). Everything that
+    depends on the article or on the request is passed as a parameter when the stylesheet is
+    applied: Django template tags are only used for translations below this point.
+  -->
+  <xsl:param name="content_access_granted" select="false()" />
+  <xsl:param name="display_full_article" select="false()" />
+  <xsl:param name="display_abstracts" select="false()" />
+  <xsl:param name="display_biblio" select="false()" />
+  <xsl:param name="display_full_toc" select="false()" />
+  <xsl:param name="page_title_suffix" select="''" />
+  <xsl:param name="in_citation_list" select="false()" />
+  <xsl:param name="maintenance" select="false()" />
+  <xsl:param name="media_url_prefix" select="''" />
+
+  <xsl:param name="article_localidentifier" select="''" />
+  <xsl:param name="article_slug" select="''" />
+  <xsl:param name="article_title" select="''" />
+  <xsl:param name="article_url" select="''" />
+  <xsl:param name="processing" select="''" />
+  <xsl:param name="publication_allowed" select="false()" />
+  <xsl:param name="has_abstracts" select="false()" />
+  <xsl:param name="is_of_type_roc" select="false()" />
+  <xsl:param name="peer_reviewed" select="false()" />
+  <xsl:param name="url_doi" select="''" />
+  <!-- The article's body, as HTML markup, only set when its first 600 words are displayed. -->
+  <xsl:param name="html_body" select="''" />
+  <!-- The article's images dimensions, as v:variable elements built from INFOIMG. -->
+  <xsl:param name="infoimg" select="''" />
+
+  <xsl:param name="pdf_exists" select="false()" />
+  <xsl:param name="can_display_first_pdf_page" select="false()" />
+  <xsl:param name="pdf_url" select="''" />
+  <xsl:param name="pdf_viewer_url" select="''" />
+  <xsl:param name="pdf_first_page_viewer_url" select="''" />
+
+  <xsl:param name="issue_url" select="''" />
+  <xsl:param name="issue_is_published" select="false()" />
+  <xsl:param name="issue_html_title" select="''" />
+  <xsl:param name="issue_volume_title_with_pages" select="''" />
+  <xsl:param name="issue_date_published" select="''" />
+  <xsl:param name="has_coverpage" select="false()" />
+  <xsl:param name="coverpage_url" select="''" />
+  <xsl:param name="coverpage_width" select="''" />
+  <xsl:param name="coverpage_height" select="''" />
+
+  <xsl:param name="journal_code" select="''" />
+  <xsl:param name="journal_url" select="''" />
+  <xsl:param name="journal_formatted_title" select="''" />
+  <xsl:param name="journal_has_logo" select="false()" />
+  <xsl:param name="journal_logo_url" select="''" />
+
+  <!--
+    Previous and next articles navigation. Their titles are HTML markup and their URLs fall back
+    to the issue's URL.
+  -->
+  <xsl:param name="has_previous_article" select="false()" />
+  <xsl:param name="previous_article_title" select="''" />
+  <xsl:param name="previous_url" select="''" />
+  <xsl:param name="has_next_article" select="false()" />
+  <xsl:param name="next_article_title" select="''" />
+  <xsl:param name="next_url" select="''" />
+
+  <xsl:variable name="vars" select="erudit:fragment($infoimg)/v:variables/v:variable" xmlns:v="variables-node" />
+
   <xsl:template match="/">
     <div class="article-wrapper">
       <xsl:apply-templates select="article"/>
@@ -61,7 +117,7 @@
             <xsl:apply-templates select="liminaire/grtitre/titre | liminaire/grtitre/sstitre" mode="title"/>
             <xsl:apply-templates select="liminaire/grtitre/titreparal | liminaire/grtitre/sstitreparal" mode="title"/>
             <xsl:apply-templates select="liminaire/grtitre/trefbiblio" mode="title"/>
-            {% if page_title_suffix %}<span><em>[{{ page_title_suffix }}]</em></span>{% endif %}
+            <xsl:if test="$page_title_suffix != ''"><span><em>[<xsl:value-of select="$page_title_suffix"/>]</em></span></xsl:if>
           </h1>
           <xsl:if test="liminaire/grauteur">
             <ul class="grauteur doc-head__authors">
@@ -79,19 +135,25 @@
           <div class="row">
             <div class="col-sm-8">
               <xsl:apply-templates select="liminaire/notegen"/>
-              {% if not content_access_granted and display_full_article %}
+              <xsl:if test="not($content_access_granted) and $display_full_article">
               <div class="alert">
                 <div>
                   <p>
                     <strong>
                     {% translate "L’accès à cet article est réservé aux abonnés." %}
-                    {% if article.abstracts %}
+                    <xsl:choose>
+                    <xsl:when test="$has_abstracts">
                     {% translate "Seul le résumé sera affiché." %}
-                    {% elif article.processing == 'C' %}
+                    </xsl:when>
+                    <xsl:when test="$processing = 'C'">
                     {% translate "Seuls les 600 premiers mots du texte seront affichés." %}
-                    {% elif can_display_first_pdf_page %}
+                    </xsl:when>
+                    <xsl:when test="$can_display_first_pdf_page">
                     {% translate "Seule la première page du PDF sera affichée." %}
-                    {% endif %}
+                    </xsl:when>
+                    </xsl:choose>
+                    <xsl:text>
+                    </xsl:text>
                     </strong>
                   </p>
                   <p>{% translate "Options d’accès&#160;:" %}</p>
@@ -100,7 +162,7 @@
                     <li><p>{% translate "via un accès individuel. Certaines revues proposent un abonnement individuel numérique. <a href='https://www.erudit.org/fr/compte/connexion/'>Connectez-vous</a> si vous possédez déjà un abonnement, ou cliquez sur le bouton “Options d’accès” pour obtenir plus d’informations sur l’abonnement individuel." %}</p></li>
                   </ul>
                   <p>
-                    {% blocktranslate trimmed with code=article.issue.journal.code %}
+                    {% blocktranslate trimmed with code="{$journal_code}" %}
                     Dans le cadre de l’engagement d’Érudit en faveur du libre accès, seuls les derniers numéros de cette revue sont sous restriction. <a href="https://www.erudit.org/fr/revues/{{ code }}/#back-issues">L’ensemble des numéros antérieurs</a> est consultable librement sur la plateforme.
                     {% endblocktranslate %}
                   </p>
@@ -109,49 +171,59 @@
                   </a>
                 </div>
               </div>
-              {% endif %}
-              {% if not article.publication_allowed %}
+              </xsl:if>
+              <xsl:if test="not($publication_allowed)">
               <div class="alert">
                 <p>
                   {% translate 'Le contenu de ce document est inaccessible en raison du droit d’auteur.' %}
                 </p>
               </div>
-              {% endif %}
+              </xsl:if>
             </div>
           </div>
         </div>
 
         <!-- issue cover image or journal logo -->
         <div class="col-md-3">
-          <a href="{% url 'public:journal:issue_detail' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier %}" title="{% blocktranslate with journal=article.issue.journal_formatted_title %}Consulter ce numéro de la revue {{ journal|escape }}{% endblocktranslate %}">
-            {% if article.issue.has_coverpage %}
+          {# The journal's title replaces the placeholder of the translated title. #}
+          <xsl:variable name="issue_link_title">{% translate "Consulter ce numéro de la revue %(journal|escape)s" %}</xsl:variable>
+          <a href="{$issue_url}" title="{concat(substring-before($issue_link_title, '%(journal|escape)s'), $journal_formatted_title, substring-after($issue_link_title, '%(journal|escape)s'))}">
+            <xsl:choose>
+            <xsl:when test="$has_coverpage">
             <div class="doc-head__img coverpage">
               {# The image's src is a transparent pixel placeholder. #}
               <img
                 src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
-                data-srcset="{% issue_coverpage_url article.issue %} {{ ISSUE_COVERPAGE_AVERAGE_SIZE.width }}w"
-                data-aspectratio="{{ ISSUE_COVERPAGE_AVERAGE_SIZE.width }}/{{ ISSUE_COVERPAGE_AVERAGE_SIZE.height }}"
-                width="{{ ISSUE_COVERPAGE_AVERAGE_SIZE.width }}"
-                height="{{ ISSUE_COVERPAGE_AVERAGE_SIZE.height }}"
+                data-srcset="{$coverpage_url} {$coverpage_width}w"
+                data-aspectratio="{$coverpage_width}/{$coverpage_height}"
+                width="{$coverpage_width}"
+                height="{$coverpage_height}"
                 class="lazyload img-responsive"
-                alt="{% translate 'Couverture de' %} {% if article.issue.html_title %}{{ article.issue.html_title|escape }}, {% endif %}{{ article.issue.volume_title_with_pages|escape }}, {{ article.issue.journal_formatted_title }}"
-              />
+              >
+                <xsl:attribute name="alt">
+                  <xsl:text>{% translate 'Couverture de' %} </xsl:text>
+                  <xsl:if test="$issue_html_title != ''"><xsl:value-of select="$issue_html_title"/>, </xsl:if>
+                  <xsl:value-of select="concat($issue_volume_title_with_pages, ', ', $journal_formatted_title)"/>
+                </xsl:attribute>
+              </img>
             </div>
-            {% elif article.issue.journal.has_logo %}
+            </xsl:when>
+            <xsl:when test="$journal_has_logo">
             <div class="doc-head__img logo">
               {# The image's src is a transparent pixel placeholder. #}
               <img
                 src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
-                data-src="{% journal_logo_url article.issue.journal %}"
+                data-src="{$journal_logo_url}"
                 class="lazyload img-responsive"
-                alt="{% translate 'Logo de' %} {{ article.issue.journal_formatted_title }}"
+                alt="{% translate 'Logo de' %} {$journal_formatted_title}"
               />
             </div>
-            {% endif %}
+            </xsl:when>
+            </xsl:choose>
           </a>
-          {% if not display_full_article and article.publication_allowed %}
-          <a href="{% url 'public:journal:article_detail' journal_code=article.issue.journal.code issue_slug=article.issue.volume_slug issue_localid=article.issue.localidentifier localid=article.localidentifier %}" class="btn btn-primary btn-full-text">{% translate "Lire le texte intégral" %} <span class="ion ion-arrow-right-c"></span></a>
-          {% endif %}
+          <xsl:if test="not($display_full_article) and $publication_allowed">
+          <a href="{$article_url}" class="btn btn-primary btn-full-text">{% translate "Lire le texte intégral" %} <span class="ion ion-arrow-right-c"></span></a>
+          </xsl:if>
         </div>
       </div>
 
@@ -160,31 +232,30 @@
         <div class="col-sm-6 doc-head__metadata">
           <xsl:apply-templates select="liminaire/erratum"/>
           <xsl:apply-templates select="admin/histpapier"/>
-          <p>{% translate "Diffusion numérique&#160;" %}: {{ article.issue.date_published }}</p>
+          <p>{% translate "Diffusion numérique&#160;" %}: <xsl:value-of select="$issue_date_published"/></p>
           <dl class="mono-space idpublic">
             <dt>URI</dt>
             <dd>
               <span class="hint--top hint--no-animate" data-hint="{% blocktranslate %}Cliquez pour copier l'URI de cet article.{% endblocktranslate %}">
-                <a href="https://id.erudit.org/iderudit/{{ article.localidentifier }}" class="clipboard-data">
-                  https://id.erudit.org/iderudit/{{ article.localidentifier }}
-                  <span class="clipboard-msg clipboard-success">{% translate "adresse copiée" %}</span>
+                <a href="https://id.erudit.org/iderudit/{$article_localidentifier}" class="clipboard-data">
+                  https://id.erudit.org/iderudit/<xsl:value-of select="$article_localidentifier"/><xsl:text>
+                  </xsl:text><span class="clipboard-msg clipboard-success">{% translate "adresse copiée" %}</span>
                   <span class="clipboard-msg clipboard-error">{% translate "une erreur s'est produite" %}</span>
                 </a>
               </span>
             </dd>
 
-            {% if article.url_doi %}
+            <xsl:if test="$url_doi != ''">
               <dt>DOI</dt>
               <dd>
                 <span class="hint--top hint--no-animate" data-hint="{% blocktranslate %}Cliquez pour copier le DOI de cet article.{% endblocktranslate %}">
-                  <a href="{{ article.url_doi }}" class="clipboard-data">
-                    {{ article.url_doi }}
-                    <span class="clipboard-msg clipboard-success">{% translate "adresse copiée" %}</span>
+                  <a href="{$url_doi}" class="clipboard-data">
+                    <xsl:value-of select="concat('&#10;                    ', $url_doi, '&#10;                    ')"/><span class="clipboard-msg clipboard-success">{% translate "adresse copiée" %}</span>
                     <span class="clipboard-msg clipboard-error">{% translate "une erreur s'est produite" %}</span>
                   </a>
                 </span>
               </dd>
-            {% endif %}
+            </xsl:if>
           </dl>
         </div>
 
@@ -192,14 +263,14 @@
         <div class="col-sm-6 doc-head__metadata">
           <p>
             {% blocktranslate %}<xsl:apply-templates select="../article/@typeart"/> de la revue{% endblocktranslate %}
-            <a href="{{ request.is_secure|yesno:'https,http' }}://{{ request.site.domain }}{% url 'public:journal:journal_detail' article.issue.journal.code %}">{{ article.issue.journal_formatted_title }}</a>
+            <a href="{$journal_url}"><xsl:value-of select="$journal_formatted_title"/></a>
             {# Peer review seal #}
-            {% if article.issue.journal.type.code == 'S' and article.erudit_object.get_article_type == 'article' %}
+            <xsl:if test="$peer_reviewed">
             <xsl:text>&#160;</xsl:text>
             <span class="hint--bottom-left hint--no-animate" data-hint="{% translate 'Tous les articles de cette revue sont soumis à un processus d’évaluation par les pairs.' %}">
               <i class="icon ion-ios-checkmark-circle"></i>
             </span>
-            {% endif %}
+            </xsl:if>
           </p>
           <xsl:if test="../article/@typeart = 'compterendu'">
             <p><small>{% translate "Ce document est le compte-rendu d'une autre oeuvre tel qu'un livre ou un film. L'oeuvre originale discutée ici n'est pas disponible sur cette plateforme." %}</small></p>
@@ -228,7 +299,7 @@
 
       <xsl:if test="//corps">
         <!-- article outline -->
-        {% if article.publication_allowed %}
+        <xsl:if test="$publication_allowed">
         <nav class="hidden-xs hidden-sm hidden-md col-md-3 article-table-of-contents">
           <h2>{% translate "Plan de l’article" %}</h2>
           <ul class="unstyled">
@@ -237,14 +308,14 @@
                 <em>{% translate "Retour au début" %}</em>
               </a>
             </li>
-            {% if display_abstracts %}
+            <xsl:if test="$display_abstracts">
             <xsl:if test="//resume">
               <li>
                 <a href="#resume">{% translate "Résumé" %}</a>
               </li>
             </xsl:if>
-            {% endif %}
-            {% if content_access_granted and display_full_article %}
+            </xsl:if>
+            <xsl:if test="$content_access_granted and $display_full_article">
             <xsl:if test="//section1/titre[not(@traitementparticulier='oui')]">
               <li class="article-toc--body">
                 <ul class="unstyled">
@@ -252,17 +323,17 @@
                 </ul>
               </li>
             </xsl:if>
-            {% endif %}
-            {% if article.processing == 'M' and article.localidentifier and article.publication_allowed %}
-              {% if content_access_granted and display_full_article or not article.abstracts and display_abstracts and can_display_first_pdf_page %}
+            </xsl:if>
+            <xsl:if test="$processing = 'M' and $article_localidentifier != '' and $publication_allowed">
+              <xsl:if test="($content_access_granted and $display_full_article) or (not($has_abstracts) and $display_abstracts and $can_display_first_pdf_page)">
               <li>
                 <a href="#pdf-viewer" id="pdf-viewer-menu-link">{% translate 'Texte intégral (PDF)' %}</a>
-                <a href="{% url 'public:journal:article_raw_pdf' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}{% if not article.issue.is_published %}?ticket={{ article.issue.prepublication_ticket }}{% endif %}" id="pdf-download-menu-link" target="_blank">{% translate 'Texte intégral (PDF)' %}</a>
+                <a href="{$pdf_url}" id="pdf-download-menu-link" target="_blank">{% translate 'Texte intégral (PDF)' %}</a>
               </li>
-              {% endif %}
-            {% endif %}
+              </xsl:if>
+            </xsl:if>
             <xsl:for-each select="partiesann[1]">
-              {% if content_access_granted and display_full_article %}
+              <xsl:if test="$content_access_granted and $display_full_article">
               <xsl:if test="grannexe">
                 <li>
                   <a href="#grannexe">
@@ -291,8 +362,8 @@
                   </a>
                 </li>
               </xsl:if>
-              {% endif %}
-              {% if not is_of_type_roc and display_biblio or display_biblio and not display_abstracts %}
+              </xsl:if>
+              <xsl:if test="(not($is_of_type_roc) and $display_biblio) or ($display_biblio and not($display_abstracts))">
               <xsl:if test="grbiblio">
                 <xsl:for-each select="grbiblio/biblio">
                 <li>
@@ -306,9 +377,9 @@
                 </li>
                 </xsl:for-each>
               </xsl:if>
-              {% endif %}
+              </xsl:if>
             </xsl:for-each>
-            {% if content_access_granted and display_full_article %}
+            <xsl:if test="$content_access_granted and $display_full_article">
             <xsl:if test="//figure">
               <li>
                 <a href="#figures">{% translate "Liste des figures" %}</a>
@@ -329,18 +400,22 @@
                 <a href="#audios">{% translate "Liste des fichiers audio" %}</a>
               </li>
             </xsl:if>
-            {% endif %}
+            </xsl:if>
           </ul>
-          {% switch "maintenance" %}
-          {% else %}
-          {% if article.issue.is_published %}
+          <xsl:if test="not($maintenance)">
+          <xsl:text>
+          </xsl:text>
+          <xsl:if test="$issue_is_published">
           <!-- promotional campaign -->
-          {% nocache %}
+          <xsl:text/>{% nocache %}
           {% include "public/journal/partials/article_active_campaign.html" %}
-          {% endnocache %}
-          {% endif %}
-          {% endswitch %}
-          {% nocache %}
+          {% endnocache %}<xsl:text/>
+          </xsl:if>
+          </xsl:if>
+          <xsl:text>
+          
+          
+          </xsl:text>{% nocache %}
           {% if content_access_granted and subscription_type == 'individual' %}
           <div class="text-center">
             <p><em>{% translate "Vous êtes abonné à cette revue." %}</em></p>
@@ -353,10 +428,10 @@
           {% include "public/partials/subscription_sponsor_badge.html" %}
           {% endnocache %}
         </nav>
-        {% endif %}
+        </xsl:if>
 
         <!-- toolbox -->
-        {% if article.publication_allowed %}
+        <xsl:if test="$publication_allowed">
         <aside class="pull-right toolbox-wrapper">
           <h2 class="sr-only">{% translate "Boîte à outils" %}</h2>
           {% spaceless %}
@@ -366,37 +441,38 @@
                 <i class="icon ion-ios-arrow-up toolbox-top"></i>
               </a>
             </li>
-            {% switch "maintenance" %}
-            {% else %}
+            <xsl:if test="not($maintenance)">
             <li>
-              <a class="tool-btn" id="tool-citation-save-{{ article.localidentifier }}" data-citation-save="#article-{{ article.localidentifier }}"{% if article.solr_id in request.saved_citations %} style="display:none;"{% endif %}>
+              <a class="tool-btn" id="tool-citation-save-{$article_localidentifier}" data-citation-save="#article-{$article_localidentifier}">
+                <xsl:if test="$in_citation_list"><xsl:attribute name="style">display:none;</xsl:attribute></xsl:if>
                 <i class="icon ion-ios-bookmark toolbox-save"></i>
                 <span class="tools-label">{% translate "Sauvegarder" %}</span>
               </a>
-              <a class="tool-btn saved" id="tool-citation-remove-{{ article.localidentifier }}" data-citation-remove="#article-{{ article.localidentifier }}"{% if not article.solr_id in request.saved_citations %} style="display:none;"{% endif %}>
+              <a class="tool-btn saved" id="tool-citation-remove-{$article_localidentifier}" data-citation-remove="#article-{$article_localidentifier}">
+                <xsl:if test="not($in_citation_list)"><xsl:attribute name="style">display:none;</xsl:attribute></xsl:if>
                 <i class="icon ion-ios-bookmark toolbox-save"></i>
                 <span class="tools-label">{% translate "Supprimer" %}</span>
               </a>
             </li>
-            {% endswitch %}
-            {% if content_access_granted and pdf_exists %}
+            </xsl:if>
+            <xsl:if test="$content_access_granted and $pdf_exists">
             <li>
-              <a class="tool-btn tool-download" data-href="{% url 'public:journal:article_raw_pdf' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}{% if not article.issue.is_published %}?ticket={{ article.issue.prepublication_ticket }}{% endif %}">
+              <a class="tool-btn tool-download" data-href="{$pdf_url}">
                 <span class="toolbox-pdf">PDF</span>
                 <span class="tools-label">{% translate "Télécharger" %}</span>
               </a>
             </li>
-            {% endif %}
+            </xsl:if>
             <li>
-              <a class="tool-btn tool-cite inline" data-modal-id="#id_cite_modal_{{ article.localidentifier|slugify }}">
+              <a class="tool-btn tool-cite inline" data-modal-id="#id_cite_modal_{$article_slug}">
                 <i class="icon ion-ios-quote toolbox-cite"></i>
                 <span class="tools-label">{% translate "Citer cet article" %}</span>
               </a>
             </li>
             <li>
-              <a class="tool-btn tool-share" data-cite="#id_cite_mla_{{ article.localidentifier }}">
+              <a class="tool-btn tool-share" data-cite="#id_cite_mla_{$article_localidentifier}">
                 <xsl:attribute name="data-title">
-                  {{ article.title|escape }}
+                  <xsl:value-of select="concat('&#10;                  ', $article_title, '&#10;                ')"/>
                 </xsl:attribute>
                 <i class="icon ion-ios-share-alt toolbox-share"></i>
                 <span class="tools-label">{% translate "Partager" %}</span>
@@ -405,12 +481,13 @@
           </ul>
           {% endspaceless %}
         </aside>
-        {% endif %}
+        </xsl:if>
       </xsl:if>
 
-      {% if article.publication_allowed %}
-      <div class="full-article {% if article.processing == 'C' %}col-md-7 col-md-offset-1{% else %} col-md-11 col-lg-8{% endif %}">
-        {% if display_abstracts %}
+      <xsl:if test="$publication_allowed">
+      <div>
+        <xsl:attribute name="class">full-article <xsl:choose><xsl:when test="$processing = 'C'">col-md-7 col-md-offset-1</xsl:when><xsl:otherwise> col-md-11 col-lg-8</xsl:otherwise></xsl:choose></xsl:attribute>
+        <xsl:if test="$display_abstracts">
         <!-- abstracts & keywords -->
         <xsl:if test="//resume | //grmotcle">
           <section id="resume" role="complementary" class="article-section grresume">
@@ -436,36 +513,45 @@
             </xsl:for-each>
           </section>
         </xsl:if>
-        {% endif %}
+        </xsl:if>
 
-        {% if content_access_granted and display_full_article %}
-          {% if article.processing == 'C' %}
+        <xsl:choose>
+        <xsl:when test="$content_access_granted and $display_full_article">
+          <xsl:choose>
+          <xsl:when test="$processing = 'C'">
           <!-- body -->
           <section id="corps" class="article-section corps" role="main">
             <h2 class="sr-only">{% translate "Corps de l’article" %}</h2>
             <xsl:apply-templates select="//corps"/>
           </section>
-          {% elif article.localidentifier %}
+          </xsl:when>
+          <xsl:when test="$article_localidentifier != ''">
           <section id="pdf">
-            <object id="pdf-viewer" data="{% url 'public:journal:article_raw_pdf' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}?embed&amp;ds_name={{ article.pdf_datastream_name }}{% if not article.issue.is_published %}&amp;ticket={{ article.issue.prepublication_ticket }}{% endif %}" type="application/pdf" style="width: 100%; height: 700px;"></object>
+            <object id="pdf-viewer" data="{$pdf_viewer_url}" type="application/pdf" style="width: 100%; height: 700px;"></object>
             <div id="pdf-download" class="text-center alert-warning">
-              <p>{% translate 'Veuillez télécharger l’article en PDF pour le lire.' %}<br/><br/><a href="{% url 'public:journal:article_raw_pdf' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}{% if not article.issue.is_published %}?ticket={{ article.issue.prepublication_ticket }}{% endif %}" class="btn btn-secondary" target="_blank">{% translate 'Télécharger' %}</a></p>
+              <p>{% translate 'Veuillez télécharger l’article en PDF pour le lire.' %}<br/><br/><a href="{$pdf_url}" class="btn btn-secondary" target="_blank">{% translate 'Télécharger' %}</a></p>
             </div>
           </section>
-          {% endif %}
-        {% elif not article.abstracts and display_abstracts %}
-          {% if article.processing == 'C' %}
+          </xsl:when>
+          </xsl:choose>
+        </xsl:when>
+        <xsl:when test="not($has_abstracts) and $display_abstracts">
+          <xsl:choose>
+          <xsl:when test="$processing = 'C'">
           <section id="first-600-words" class="corps">
             <p class="alinea">
-            {{ article.html_body|safe|truncatewords_html:600 }}
+            <xsl:copy-of select="erudit:fragment(concat('&#10;            ', $html_body, '&#10;            '))/node()"/>
             </p>
           </section>
-          {% elif can_display_first_pdf_page %}
+          </xsl:when>
+          <xsl:when test="$can_display_first_pdf_page">
           <section id="first-pdf-page">
-            <object id="pdf-viewer" data="{% url 'public:journal:article_raw_pdf_firstpage' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}?embed&amp;ds_name={{ article.pdf_datastream_name }}{% if not article.issue.is_published %}&amp;ticket={{ article.issue.prepublication_ticket }}{% endif %}" type="application/pdf" style="width: 100%; height: 700px;"></object>
+            <object id="pdf-viewer" data="{$pdf_first_page_viewer_url}" type="application/pdf" style="width: 100%; height: 700px;"></object>
           </section>
-          {% endif %}
-        {% endif %}
+          </xsl:when>
+          </xsl:choose>
+        </xsl:when>
+        </xsl:choose>
 
 
         <!-- appendices -->
@@ -474,7 +560,7 @@
         </div>
 
         <!-- lists of tables & figures -->
-        {% if content_access_granted and display_full_article %}
+        <xsl:if test="$content_access_granted and $display_full_article">
         <xsl:if test="//figure">
           <section id="figures" class="article-section figures" role="complementary">
             <h2>{% translate "Liste des figures" %}</h2>
@@ -518,18 +604,18 @@
             </xsl:for-each>
           </section>
         </xsl:if>
-        {% endif %}
+        </xsl:if>
 
-        {% if content_access_granted and display_full_toc %}
+        <xsl:if test="$content_access_granted and $display_full_toc">
         <section id="article-toc--full">
           <ul class="unstyled">
             <xsl:apply-templates select="corps/section1/titre[not(@traitementparticulier='oui')]" mode="toc-full"/>
           </ul>
         </section>
-        {% endif %}
+        </xsl:if>
 
       </div>
-      {% endif %}
+      </xsl:if>
     </div>
 
   </xsl:template>
@@ -800,7 +886,7 @@
     <span class="{name()}">
       <br/>
       <strong>
-        <a href="{% url 'public:journal:issue_detail' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier %}"><xsl:apply-templates select="."/></a>
+        <a href="{$issue_url}"><xsl:apply-templates select="."/></a>
       </strong>
     </span>
   </xsl:template>
@@ -832,7 +918,7 @@
   <!--*** ARTICLE FULL TOC ***-->
   <xsl:template match="section1/titre[not(@traitementparticulier='oui')]" mode="toc-full">
     <li>
-      <a href="{% url 'public:journal:article_detail' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}#{../@id}">
+      <a href="{$article_url}#{../@id}">
         <h2><xsl:apply-templates mode="toc-heading"/></h2>
       </a>
       <ul class="unstyled">
@@ -842,7 +928,7 @@
   </xsl:template>
   <xsl:template match="section2/titre[not(@traitementparticulier='oui')]" mode="toc-full">
     <li>
-      <a href="{% url 'public:journal:article_detail' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}#{../@id}">
+      <a href="{$article_url}#{../@id}">
         <h3><xsl:apply-templates mode="toc-heading"/></h3>
       </a>
       <ul class="unstyled">
@@ -852,7 +938,7 @@
   </xsl:template>
   <xsl:template match="section3/titre[not(@traitementparticulier='oui')]" mode="toc-full">
     <li>
-      <a href="{% url 'public:journal:article_detail' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}#{../@id}">
+      <a href="{$article_url}#{../@id}">
         <h4><xsl:apply-templates mode="toc-heading"/></h4>
       </a>
       <ul class="unstyled">
@@ -862,7 +948,7 @@
   </xsl:template>
   <xsl:template match="section4/titre[not(@traitementparticulier='oui')]" mode="toc-full">
     <li>
-      <a href="{% url 'public:journal:article_detail' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}#{../@id}">
+      <a href="{$article_url}#{../@id}">
         <h5><xsl:apply-templates mode="toc-heading"/></h5>
       </a>
       <ul class="unstyled">
@@ -872,7 +958,7 @@
   </xsl:template>
   <xsl:template match="section5/titre[not(@traitementparticulier='oui')]" mode="toc-full">
     <li>
-      <a href="{% url 'public:journal:article_detail' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}#{../@id}">
+      <a href="{$article_url}#{../@id}">
         <h6><xsl:apply-templates mode="toc-heading"/></h6>
       </a>
       <ul class="unstyled">
@@ -882,7 +968,7 @@
   </xsl:template>
   <xsl:template match="section6/titre[not(@traitementparticulier='oui')]" mode="toc-full">
     <li>
-      <a href="{% url 'public:journal:article_detail' article.issue.journal.code article.issue.volume_slug article.issue.localidentifier article.localidentifier %}#{../@id}">
+      <a href="{$article_url}#{../@id}">
         <h6 class="h7"><xsl:apply-templates mode="toc-heading"/></h6>
       </a>
     </li>
@@ -1466,11 +1552,11 @@
     <xsl:variable name="imgPlGr" select="$vars[@n = $imgPlGrId]/@value" />
     <xsl:variable name="imgWidth" select="$vars[@n = $imgPlGrWidth]/@value"/>
     <xsl:variable name="imgHeight" select="$vars[@n = $imgPlGrHeight]/@value"/>
-    <a href="{{ media_url_prefix }}{$imgPlGr}" class="lightbox {name()}"  title="{normalize-space(../legende/titre)}">
+    <a href="{$media_url_prefix}{$imgPlGr}" class="lightbox {name()}"  title="{normalize-space(../legende/titre)}">
       {# The image's src is a transparent pixel placeholder. #}
       <img
         src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
-        data-srcset="{{ media_url_prefix }}{$imgPlGr} {$imgWidth}w"
+        data-srcset="{$media_url_prefix}{$imgPlGr} {$imgWidth}w"
         data-aspectratio="{$imgWidth}/{$imgHeight}"
         width="{$imgWidth}"
         height="{$imgHeight}"
@@ -1797,7 +1883,7 @@
             <xsl:text>data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII=</xsl:text>
           </xsl:attribute>
           <xsl:attribute name="data-srcset">
-            <xsl:if test="not(starts-with($nomImg , 'http'))">{{ media_url_prefix }}</xsl:if><xsl:value-of select="$nomImg"/><xsl:text> </xsl:text><xsl:value-of select="@dimx"/><xsl:text>w</xsl:text>
+            <xsl:if test="not(starts-with($nomImg , 'http'))"><xsl:value-of select="$media_url_prefix"/></xsl:if><xsl:value-of select="$nomImg"/><xsl:text> </xsl:text><xsl:value-of select="@dimx"/><xsl:text>w</xsl:text>
           </xsl:attribute>
           <xsl:attribute name="data-aspectratio">
             <xsl:value-of select="@dimx div @dimy"/>
@@ -2330,15 +2416,15 @@
   <xsl:template match="partiesann">
     <section class="{name()} col-xs-12">
       <h2 class="sr-only">{% translate 'Parties annexes' %}</h2>
-      {% if content_access_granted and display_full_article %}
+      <xsl:if test="$content_access_granted and $display_full_article">
       <xsl:apply-templates select="grannexe"/>
       <xsl:apply-templates select="merci"/>
       <xsl:apply-templates select="grnotebio"/>
       <xsl:apply-templates select="grnote"/>
-      {% endif %}
-      {% if not is_of_type_roc and display_biblio or display_biblio and not display_abstracts %}
+      </xsl:if>
+      <xsl:if test="(not($is_of_type_roc) and $display_biblio) or ($display_biblio and not($display_abstracts))">
       <xsl:apply-templates select="grbiblio"/>
-      {% endif %}
+      </xsl:if>
     </section>
   </xsl:template>
 
@@ -1,6 +1,7 @@
 import os
 import pytest
 import pysolr
+import requests
 
 from django.core.cache import cache
 
@@ -11,6 +12,7 @@ from erudit.test.fedora import FakeAPI
 from erudit.test.solr import FakeSolrClient
 
 import erudit.fedora.repository
+import erudit.fedora.session
 import erudit.fedora.utils
 import erudit.management.commands.import_journals_from_fedora
 
@@ -28,7 +30,8 @@ def mock_fedora_api(monkeypatch):
 
     monkeypatch.setattr(erudit.fedora.repository.repo.api, "_make_request", shouldnt_call)
     mocked_api = FakeAPI()
-    monkeypatch.setattr(erudit.fedora.cache.requests, "get", mocked_api.get)
+    monkeypatch.setattr(requests, "get", mocked_api.get)
+    monkeypatch.setattr(erudit.fedora.session.session, "get", mocked_api.get)
     monkeypatch.setattr(erudit.fedora.repository.repo.api, "get", mocked_api.get)
     monkeypatch.setattr(erudit.fedora.repository.repo, "api", mocked_api)
     monkeypatch.setattr(erudit.fedora.repository, "api", mocked_api)
@@ -38,11 +41,12 @@ def mock_fedora_api(monkeypatch):
 
 @pytest.fixture(autouse=True)
 def mock_solr_client(monkeypatch):
-    import erudit.solr.models
+    import erudit.solr.client
 
     client = FakeSolrClient()
     monkeypatch.setattr(pysolr, "Solr", lambda *a, **kw: client)
-    monkeypatch.setattr(erudit.solr.models, "client", client)
+    monkeypatch.setattr(erudit.solr.client, "_clients", {})
+    monkeypatch.setattr(erudit.solr.client, "_create_client", lambda call_site: client)
 
 
 @pytest.fixture
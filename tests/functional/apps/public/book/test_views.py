@@ -132,6 +132,25 @@ def test_chapter_pdf(client):
     assert response["Content-Type"] == "application/pdf"
 
 
+@pytest.mark.django_db
+def test_chapter_pdf_byte_range(client):
+    book = BookFactory()
+    response = client.get(
+        reverse(
+            "public:book:chapter_pdf",
+            kwargs={
+                "collection_slug": book.collection.slug,
+                "slug": book.slug,
+                "chapter_id": "000274li",
+            },
+        ),
+        HTTP_RANGE="bytes=0-4",
+    )
+    assert response.status_code == 206
+    assert response["Content-Range"].startswith("bytes 0-4/")
+    assert b"".join(response.streaming_content) == b"%PDF-"
+
+
 def test_short_slug_cuts_over_80_chars():
     title = " ".join(["a"] * 50)
     assert len(short_slug(title, None)) < 80
@@ -1202,7 +1202,7 @@ class TestArticleDetailView:
             response = Client().get(url)
             assert response.status_code == 200
             # Assert that the cache has not be called.
-            assert cache_mock.get.call_count == 4
+            assert cache_mock.get.call_count == 5
 
     def test_allow_ephemeral_articles(self):
         # When receiving a request for an article that doesn't exist in the DB, try querying fedora
@@ -1297,7 +1297,7 @@ class TestArticleDetailView:
         mock_cache.get.reset_mock()
 
         Client().get(url)
-        assert mock_cache.get.call_count == 3
+        assert mock_cache.get.call_count == 5
 
     @unittest.mock.patch("erudit.fedora.cache.cache")
     @pytest.mark.parametrize(
@@ -3301,6 +3301,48 @@ class TestArticleRawPdfView:
         assert response.status_code == 200
         assert response["Content-Type"] == "application/pdf"
 
+    def test_can_retrieve_a_byte_range_of_the_pdf(self):
+        article = ArticleFactory(with_pdf=True, issue__journal__open_access=True)
+        url = reverse(
+            "public:journal:article_raw_pdf",
+            args=(
+                article.issue.journal_id,
+                article.issue.volume_slug,
+                article.issue.localidentifier,
+                article.localidentifier,
+            ),
+        )
+        response = Client().get(url, HTTP_RANGE="bytes=0-99")
+
+        assert response.status_code == 206
+        assert response["Accept-Ranges"] == "bytes"
+        assert response["Content-Range"].startswith("bytes 0-99/")
+        assert response.content[:5] == b"%PDF-"
+        assert len(response.content) == 100
+
+    @override_settings(CACHES=settings.LOCMEM_CACHES)
+    def test_coverpage_is_cached(self):
+        article = ArticleFactory(
+            with_pdf=True, with_pdf_erudit=True, issue__journal__open_access=True
+        )
+        url = reverse(
+            "public:journal:article_raw_pdf",
+            args=(
+                article.issue.journal_id,
+                article.issue.volume_slug,
+                article.issue.localidentifier,
+                article.localidentifier,
+            ),
+        )
+        with open(os.path.join(FIXTURE_ROOT, "dummy-multipages.pdf"), "rb") as f:
+            coverpage = f.read()
+        with unittest.mock.patch(
+            "apps.public.journal.coverpage.get_coverpage", return_value=coverpage
+        ) as mock_get_coverpage:
+            assert Client().get(url, {"ds_name": "PDF"}).status_code == 200
+            assert Client().get(url, {"ds_name": "PDF_ERUDIT"}).status_code == 200
+        assert mock_get_coverpage.call_count == 1
+
     def test_cannot_retrieve_the_pdf_of_inexistant_articles(self):
         # Note: as there is no Erudit fedora repository used during the
         # test, any tentative of retrieving the PDF of an article should
@@ -67,6 +67,8 @@ USE_DEBUG_EMAIL = False
 
 FEDORA_ROOT = "http://erudit.org/"
 SOLR_ROOT = "http://erudit.org/"
+# The fake Solr client is filled during the tests, its responses must not be cached.
+SOLR_CACHE_TIMEOUTS = {}
 
 POST_OFFICE = {
     "DEFAULT_PRIORITY": "now",
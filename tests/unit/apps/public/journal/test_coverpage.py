@@ -0,0 +1,42 @@
+import importlib
+import unittest.mock
+
+from apps.public.journal import coverpage
+
+
+def test_does_not_load_the_fonts_when_the_module_is_imported():
+    with unittest.mock.patch(
+        "reportlab.pdfbase.ttfonts.TTFont"
+    ) as mock_ttfont, unittest.mock.patch(
+        "reportlab.pdfbase.pdfmetrics.registerFont"
+    ) as mock_register_font:
+        importlib.reload(coverpage)
+    # Import the actual ReportLab functions again.
+    importlib.reload(coverpage)
+    assert mock_ttfont.call_count == 0
+    assert mock_register_font.call_count == 0
+
+
+def test_registers_the_fonts_of_a_family_the_first_time_they_are_used(monkeypatch):
+    monkeypatch.setattr(coverpage, "_registered_font_families", set())
+    with unittest.mock.patch.object(coverpage, "registerFont") as mock_register_font:
+        coverpage.get_stylesheet("fr")
+        coverpage.get_stylesheet("fr")
+    assert [call[0][0].fontName for call in mock_register_font.call_args_list] == [
+        "NotoSerif",
+        "NotoSerif-Bold",
+        "NotoSerif-Italic",
+        "NotoSerif-BoldItalic",
+    ]
+
+
+def test_registers_the_fonts_of_other_scripts_only_if_the_text_needs_them(monkeypatch):
+    monkeypatch.setattr(coverpage, "_registered_font_families", set())
+    with unittest.mock.patch.object(coverpage, "registerFont"):
+        coverpage.clean("Un titre", article=None)
+        assert coverpage._registered_font_families == set()
+
+        assert coverpage.clean("汉字", article=None) == (
+            '<span fontName="NotoSerifCJKsc">汉</span><span fontName="NotoSerifCJKsc">字</span>'
+        )
+        assert coverpage._registered_font_families == {"NotoSerifCJKsc"}
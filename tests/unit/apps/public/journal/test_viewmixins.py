@@ -660,3 +660,38 @@ class TestArticleAccessLogMixin:
         view = MyView()
         view.dispatch(request)
         mock_logger.info.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "content_range, logged",
+        (
+            ("bytes 0-99/1000", True),
+            ("bytes 100-199/1000", False),
+        ),
+    )
+    @unittest.mock.patch("apps.public.journal.viewmixins.logger")
+    def test_log_only_the_first_range_of_partial_contents(self, mock_logger, content_range, logged):
+        article = ArticleFactory()
+
+        class MyView(ArticleAccessLogMixin, View):
+            def get_object(self):
+                return article
+
+            def get_access_type(self):
+                return ArticleAccessType.pdf_full_view
+
+            @property
+            def content_access_granted(self):
+                return True
+
+            def get(self, request, *args, **kwargs):
+                response = HttpResponse("", status=206)
+                response["Content-Range"] = content_range
+                return response
+
+        request = RequestFactory().get("/myview")
+        request.session = {}
+        request.subscriptions = UserSubscriptions()
+        request.user = AnonymousUser()
+        view = MyView()
+        view.dispatch(request)
+        assert mock_logger.info.called == logged
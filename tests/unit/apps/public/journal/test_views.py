@@ -4,6 +4,7 @@ import os
 import pytest
 import unittest.mock
 
+from django.conf import settings
 from django.http import Http404
 from django.test import Client, override_settings, RequestFactory
 from django.urls import reverse
@@ -543,7 +544,14 @@ class TestIssueDetailSummary:
                 "ticket": article.issue.prepublication_ticket,
             },
         )
-        assert mock_cache.get.call_count == expected_count
+        # The single-flight locks, read when they are released, and the datastream lists, which do
+        # not depend on the publication of the issue, are not counted.
+        content_reads = [
+            args
+            for args, _kwargs in mock_cache.get.call_args_list
+            if not args[0].startswith(("single-flight-", "erudit-fedora-datastreams-"))
+        ]
+        assert len(content_reads) == expected_count
 
     @unittest.mock.patch("eruditarticle.objects.publication.EruditPublication.get_summary_articles")
     def test_main_title_and_paral_title(self, mock_get_summary_articles):
@@ -940,6 +948,34 @@ class TestRenderArticleTemplateTag:
         fp.close()
         assert ret is not None
 
+    @override_settings(CACHES=settings.LOCMEM_CACHES)
+    def test_rendered_article_html_is_cached(self):
+        article = ArticleFactory()
+        view = ArticleDetailView()
+        view.request = unittest.mock.MagicMock()
+        view.object = article
+        article.issue.get_previous_and_next_articles = lambda localid: (None, None)
+        view.get_object = unittest.mock.MagicMock(return_value=article)
+        context = view.get_context_data()
+        html = view.render_xml_content(context)
+
+        with unittest.mock.patch(
+            "apps.public.journal.views.get_article_html_transform", side_effect=AssertionError
+        ):
+            assert view.render_xml_content(context) == html
+
+    def test_rendered_article_html_cache_key_depends_on_the_scheme_and_domain(self):
+        article = ArticleFactory()
+        view = ArticleDetailView()
+        view.request = unittest.mock.MagicMock(scheme="https")
+        view.request.site.domain = "www.erudit.org"
+        key = view.get_render_xml_content_cache_key(article, {})
+        view.request.scheme = "http"
+        assert view.get_render_xml_content_cache_key(article, {}) != key
+        view.request.scheme = "https"
+        view.request.site.domain = "erudit.org"
+        assert view.get_render_xml_content_cache_key(article, {}) != key
+
     def test_html_tags_in_transformed_article_biblio_titles(self):
         ret = self.render_article_detail_html()
         # Check that HTML tags in biblio titles are not stripped.
@@ -0,0 +1,33 @@
+from lxml import etree as et
+from django.utils import translation
+
+from apps.public.journal.xslt import fragment
+from apps.public.journal.xslt import get_article_html_transform
+
+
+def test_get_article_html_transform_is_compiled_once_per_language():
+    with translation.override("fr"):
+        fr_transform = get_article_html_transform()
+        assert get_article_html_transform() is fr_transform
+    with translation.override("en"):
+        en_transform = get_article_html_transform()
+        assert get_article_html_transform() is en_transform
+    assert fr_transform is not en_transform
+
+
+def test_fragment_drops_whitespace_only_text_nodes():
+    (root,) = fragment(None, "\n  Un <em>titre</em> <strong> </strong>\n")
+    assert et.tostring(root, encoding="unicode") == (
+        "<fragment>\n  Un <em>titre</em><strong/></fragment>"
+    )
+
+
+def test_article_html_links_to_the_issue_with_the_journal_title():
+    with translation.override("en"):
+        html = get_article_html_transform()(
+            et.fromstring("<article/>"),
+            issue_url=et.XSLT.strparam("/fr/revues/foo/2020-v1-n1-foo01/"),
+            journal_formatted_title=et.XSLT.strparam("Revue Foo"),
+        )
+    (link,) = html.xpath("//a[@href='/fr/revues/foo/2020-v1-n1-foo01/'][@title]")
+    assert link.get("title") == "Consult this issue of Revue Foo"
@@ -108,11 +108,11 @@ class TestSearchResultsView:
 
     def test_search_results_do_not_call_fedora(self):
         ArticleFactory(title="foo")
-        with unittest.mock.patch("erudit.fedora.cache.requests") as mock_requests:
+        with unittest.mock.patch("erudit.fedora.cache.session") as mock_session:
             fake_api = FakeAPI()
-            mock_requests.get.side_effect = fake_api.get
+            mock_session.get.side_effect = fake_api.get
             Client().get(reverse("public:search:results"), data={"basic_search_term": "foo"})
-            assert mock_requests.get.call_count == 0
+            assert mock_session.get.call_count == 0
 
     @pytest.mark.parametrize(
         "is_internal, html_string, presence_in_html",
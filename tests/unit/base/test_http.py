@@ -0,0 +1,81 @@
+import pytest
+from django.http import FileResponse
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+
+from base.http import get_byte_range_response
+from base.http import parse_byte_range
+
+
+@pytest.mark.parametrize(
+    "header, expected_byte_range",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=900-2000", (900, 999)),
+        ("bytes=-2000", (0, 999)),
+        # Malformed headers and multiple ranges are ignored.
+        ("bytes=-", None),
+        ("bytes=99-0", None),
+        ("items=0-99", None),
+        ("bytes=0-99,200-299", None),
+    ],
+)
+def test_parse_byte_range(header, expected_byte_range):
+    assert parse_byte_range(header, 1000) == expected_byte_range
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+def test_parse_byte_range_raises_for_unsatisfiable_ranges(header):
+    with pytest.raises(ValueError):
+        parse_byte_range(header, 1000)
+
+
+class TestGetByteRangeResponse:
+    def test_advertises_byte_ranges_support(self):
+        request = RequestFactory().get("/")
+        response = get_byte_range_response(request, HttpResponse(b"0123456789"))
+        assert response.status_code == 200
+        assert response["Accept-Ranges"] == "bytes"
+        assert response.content == b"0123456789"
+
+    def test_can_return_a_byte_range_of_the_content(self):
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=2-5")
+        response = get_byte_range_response(request, HttpResponse(b"0123456789"))
+        assert response.status_code == 206
+        assert response["Content-Range"] == "bytes 2-5/10"
+        assert response["Content-Length"] == "4"
+        assert response.content == b"2345"
+
+    def test_can_return_a_byte_range_of_a_file(self, tmpdir):
+        path = tmpdir.join("file")
+        path.write_binary(b"0123456789")
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=-3")
+        response = get_byte_range_response(request, FileResponse(open(str(path), "rb")))
+        assert response.status_code == 206
+        assert response["Content-Range"] == "bytes 7-9/10"
+        assert response["Content-Length"] == "3"
+        assert b"".join(response.streaming_content) == b"789"
+        response.close()
+
+    def test_returns_a_416_response_for_unsatisfiable_ranges(self):
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=10-")
+        response = get_byte_range_response(request, HttpResponse(b"0123456789"))
+        assert response.status_code == 416
+        assert response["Content-Range"] == "bytes */10"
+
+    def test_returns_the_whole_content_if_it_changed(self):
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"old"')
+        response = HttpResponse(b"0123456789")
+        response["ETag"] = '"new"'
+        response = get_byte_range_response(request, response)
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+
+    def test_does_not_support_byte_ranges_of_streamed_contents(self):
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=2-5")
+        response = get_byte_range_response(request, StreamingHttpResponse([b"0123456789"]))
+        assert response.status_code == 200
+        assert not response.has_header("Accept-Ranges")
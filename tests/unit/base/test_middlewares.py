@@ -1,6 +1,8 @@
 import pytest
 
 from base.middleware import PolyglotLocaleMiddleware
+from base.middleware import ProcessPoolBusyMiddleware
+from base.process_pool import ProcessPoolBusy
 from django.test import RequestFactory
 from django.http.response import HttpResponse
 from django.utils import translation
@@ -44,3 +46,17 @@ class TestPolyglotLocaleMiddleware:
         response.headers = {}
         response = middleware.process_response(request, response)
         assert translation.get_language() == language
+
+
+class TestProcessPoolBusyMiddleware:
+    def test_returns_a_503_response_when_a_process_pool_is_busy(self):
+        middleware = ProcessPoolBusyMiddleware()
+        request = RequestFactory().get("/")
+        response = middleware.process_exception(request, ProcessPoolBusy("Busy", retry_after=10))
+        assert response.status_code == 503
+        assert response["Retry-After"] == "10"
+
+    def test_ignores_other_exceptions(self):
+        middleware = ProcessPoolBusyMiddleware()
+        request = RequestFactory().get("/")
+        assert middleware.process_exception(request, ValueError()) is None
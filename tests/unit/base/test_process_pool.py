@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+
+from base.process_pool import ProcessPool
+from base.process_pool import ProcessPoolBusy
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make_pool(**kwargs):
+        pool = ProcessPool("test", **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make_pool
+    # Wait for the jobs that timed out, so that no process outlives the test.
+    for pool in pools:
+        pool.shutdown()
+
+
+class TestProcessPool:
+    def test_runs_jobs_in_the_current_process_if_the_pool_is_disabled(self, make_pool):
+        pool = make_pool(max_workers=0, timeout=1, max_queue_size=0, retry_after=5)
+        assert not pool.enabled
+        assert pool.run(threading.get_ident) == threading.get_ident()
+
+    def test_runs_jobs_in_the_processes_of_the_pool(self, make_pool):
+        pool = make_pool(max_workers=1, timeout=30, max_queue_size=0, retry_after=5)
+        assert pool.run(pow, 2, 10) == 1024
+
+    def test_raises_if_the_job_is_not_run_in_time(self, make_pool):
+        pool = make_pool(max_workers=1, timeout=0.01, max_queue_size=0, retry_after=5)
+        with pytest.raises(ProcessPoolBusy) as excinfo:
+            pool.run(time.sleep, 1)
+        assert excinfo.value.retry_after == 5
+
+    def test_raises_if_the_pool_is_full(self, make_pool):
+        pool = make_pool(max_workers=1, timeout=30, max_queue_size=0, retry_after=5)
+        thread = threading.Thread(target=pool.run, args=(time.sleep, 1))
+        thread.start()
+        while not pool.jobs:
+            time.sleep(0.01)
+        with pytest.raises(ProcessPoolBusy):
+            pool.run(pow, 2, 10)
+        thread.join()
@@ -0,0 +1,115 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.subscription.indexes import IPAddressIndex
+from core.subscription.indexes import RefererIndex
+from core.subscription.indexes import get_subscription_id_for_ip_address
+from core.subscription.indexes import get_subscription_id_for_referer
+from core.subscription.test.factories import InstitutionIPAddressRangeFactory
+from core.subscription.test.factories import JournalAccessSubscriptionFactory
+
+
+class TestIPAddressIndex:
+    @pytest.mark.parametrize(
+        "ip, subscription_id",
+        (
+            ("10.0.0.0", None),
+            ("10.0.0.1", 2),
+            ("10.0.0.4", 2),
+            ("10.0.0.5", 1),
+            ("10.0.0.10", 1),
+            ("10.0.0.11", 3),
+            ("10.0.0.20", 3),
+            ("10.0.0.21", None),
+            ("10.0.1.1", 4),
+            ("2001:db8::1", 5),
+            ("2001:db8::ffff", 5),
+            ("2001:db9::", None),
+            ("::ffff:10.0.0.1", None),
+            ("not an ip", None),
+        ),
+    )
+    def test_get(self, ip, subscription_id):
+        index = IPAddressIndex(
+            [
+                ("10.0.0.5", "10.0.0.10", 1),
+                ("10.0.0.1", "10.0.0.4", 2),
+                ("10.0.0.1", "10.0.0.20", 3),
+                ("10.0.1.1", "10.0.1.1", 4),
+                ("2001:db8::", "2001:db8::ffff", 5),
+                ("2001:db8::", "10.0.0.1", 6),
+                ("10.0.0.9", "10.0.0.1", 7),
+            ]
+        )
+        assert index.get(ip) == subscription_id
+
+
+class TestRefererIndex:
+    @pytest.mark.parametrize(
+        "referer, subscription_id",
+        (
+            ("http://umontreal.ca", 1),
+            ("https://www.UMontreal.ca/", 1),
+            ("http://www.umontreal.ca/bib", 2),
+            ("http://www.umontreal.ca/bib/proxy?url=x", 3),
+            ("http://www.umontreal.ca/bibliotheque", 2),
+            ("http://proxy.umontreal.ca/bib/proxy", None),
+            ("http://ulaval.ca/proxy", None),
+            ("http://ulaval.ca/proxy/login", 4),
+            ("umontreal.ca", None),
+            ("", None),
+            (None, None),
+        ),
+    )
+    def test_get(self, referer, subscription_id):
+        index = RefererIndex(
+            [
+                ("http://www.umontreal.ca", 1),
+                ("http://umontreal.ca/bib", 2),
+                ("http://umontreal.ca/bib/proxy", 3),
+                ("http://www.ulaval.ca/proxy/login", 5),
+                ("http://ulaval.ca/proxy/login", 4),
+                ("not a referer", 6),
+            ]
+        )
+        assert index.get(referer) == subscription_id
+
+
+@pytest.mark.django_db
+class TestGetSubscriptionIdForIPAddress:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.CACHES = settings.LOCMEM_CACHES
+
+    def test_ip_address_index_is_refreshed_when_subscriptions_change(self):
+        subscription = JournalAccessSubscriptionFactory(post__valid=True)
+        ip_range = InstitutionIPAddressRangeFactory(
+            subscription=subscription, ip_start="192.168.1.1", ip_end="192.168.1.10"
+        )
+        assert get_subscription_id_for_ip_address("192.168.1.5") == subscription.pk
+        with CaptureQueriesContext(connection) as queries:
+            assert get_subscription_id_for_ip_address("192.168.1.5") == subscription.pk
+            assert get_subscription_id_for_ip_address("192.168.2.5") is None
+        assert len(queries) == 0
+
+        ip_range.ip_end = "192.168.1.4"
+        ip_range.save()
+        assert get_subscription_id_for_ip_address("192.168.1.5") is None
+
+        subscription.journals.clear()
+        assert get_subscription_id_for_ip_address("192.168.1.1") is None
+
+    def test_referer_index_is_refreshed_when_subscriptions_change(self):
+        subscription = JournalAccessSubscriptionFactory(
+            post__valid=True, referer="http://www.umontreal.ca/bib"
+        )
+        assert get_subscription_id_for_referer("http://umontreal.ca/bib/x") == subscription.pk
+        with CaptureQueriesContext(connection) as queries:
+            assert get_subscription_id_for_referer("http://umontreal.ca/bib/x") == subscription.pk
+            assert get_subscription_id_for_referer("http://ulaval.ca/bib/x") is None
+        assert len(queries) == 0
+
+        subscription.referer = "http://www.umontreal.ca/proxy"
+        subscription.save()
+        assert get_subscription_id_for_referer("http://umontreal.ca/bib/x") is None
@@ -230,6 +230,29 @@ class TestSubscriptionMiddleware:
         # Check
         assert request.subscriptions._subscriptions == []
 
+    @unittest.mock.patch("core.subscription.middleware.logger")
+    def test_subscriptions_are_only_resolved_when_needed(self, mock_log):
+        JournalAccessSubscriptionFactory(
+            post__valid=True,
+            post__ip_start="1.1.1.1",
+            post__ip_end="1.1.1.1",
+            referer="http://www.umontreal.ca",
+        )
+        request = get_anonymous_request()
+        request.META["HTTP_X_FORWARDED_FOR"] = "1.1.1.1"
+        request.META["HTTP_REFERER"] = "http://www.umontreal.ca"
+
+        middleware = SubscriptionMiddleware()
+        with unittest.mock.patch.object(
+            middleware, "_get_user_subscriptions"
+        ) as mock_get_user_subscriptions:
+            middleware.process_request(request)
+            middleware.log_http_transaction(request, HttpResponse())
+        assert mock_get_user_subscriptions.call_count == 0
+        assert mock_log.info.call_count == 0
+        # The referer is kept in the session even if the subscriptions were not resolved.
+        assert request.session["HTTP_REFERER"] == "http://www.umontreal.ca"
+
     def test_staff_users_can_fake_ip(self):
         request = RequestFactory().get("/")
         request.user = UserFactory(is_staff=True)
@@ -302,3 +325,17 @@ class TestSubscriptionMiddleware:
             assert subscription in request.subscriptions._subscriptions
         else:
             assert subscription not in request.subscriptions._subscriptions
+
+    @override_settings(REDIS_HOST=None, REDIS_PORT=None, REDIS_INDEX=None)
+    def test_nonce_count_without_redis(self):
+        assert SubscriptionMiddleware()._nonce_count(b"nonce") == 0
+
+    @unittest.mock.patch("core.subscription.middleware.get_redis_client")
+    def test_nonce_count_is_incremented_atomically(self, mock_get_redis_client):
+        pipeline = mock_get_redis_client.return_value.pipeline.return_value.__enter__.return_value
+        pipeline.incr.return_value = pipeline
+        pipeline.expire.return_value = pipeline
+        pipeline.execute.return_value = [2, True]
+        assert SubscriptionMiddleware()._nonce_count(b"nonce") == 2
+        pipeline.incr.assert_called_once_with("google_casa_nonce_b'nonce'")
+        pipeline.expire.assert_called_once_with("google_casa_nonce_b'nonce'", 3600)
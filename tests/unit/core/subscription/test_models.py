@@ -3,7 +3,9 @@ import pytest
 import datetime as dt
 import ipaddress
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.test import override_settings
 
 from account_actions.test.factories import AccountActionTokenFactory
 
@@ -48,6 +50,28 @@ class TestJournalAccessSubscription:
         assert sub.provides_access_to(journal=j2)
         assert not sub.provides_access_to(journal=j3)
 
+    @override_settings(CACHES=settings.LOCMEM_CACHES)
+    def test_journal_ids_are_cached_until_the_journals_change(self, django_assert_num_queries):
+        j1, j2, j3 = JournalFactory.create_batch(3)
+        basket = AccessBasketFactory.create(journals=[j1])
+        sub = JournalAccessSubscriptionFactory.create(basket=basket, journals=[j2])
+        assert JournalAccessSubscription.objects.get(pk=sub.pk).journal_ids == {j1.pk, j2.pk}
+        with django_assert_num_queries(0):
+            assert sub.provides_access_to(journal=j1)
+            assert not sub.provides_access_to(journal=j3)
+
+        basket.journals.add(j3)
+        assert JournalAccessSubscription.objects.get(pk=sub.pk).journal_ids == {
+            j1.pk,
+            j2.pk,
+            j3.pk,
+        }
+        sub.journals.remove(j2)
+        assert JournalAccessSubscription.objects.get(pk=sub.pk).journal_ids == {j1.pk, j3.pk}
+        sub.basket = None
+        sub.save()
+        assert JournalAccessSubscription.objects.get(pk=sub.pk).journal_ids == set()
+
     @pytest.mark.parametrize("subscription_referer", ("https://erudit.org",))
     @pytest.mark.parametrize(
         "user_referer",
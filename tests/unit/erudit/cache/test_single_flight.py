@@ -0,0 +1,43 @@
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+
+from erudit.cache import single_flight
+
+
+class TestSingleFlight:
+    def setup_method(self):
+        self.cache = LocMemCache("single-flight", {})
+        self.cache.clear()
+
+    def test_first_process_computes_the_value_and_releases_the_lock(self):
+        with single_flight(self.cache, "key") as value:
+            assert value is None
+            assert self.cache.get("single-flight-key") is not None
+        assert self.cache.get("single-flight-key") is None
+
+    def test_lock_is_released_on_error(self):
+        try:
+            with single_flight(self.cache, "key"):
+                raise ValueError
+        except ValueError:
+            pass
+        assert self.cache.get("single-flight-key") is None
+
+    def test_lock_of_another_process_is_not_released(self):
+        with single_flight(self.cache, "key") as value:
+            assert value is None
+            # The lock expires and is acquired by another process.
+            self.cache.set("single-flight-key", "token-of-another-process")
+        assert self.cache.get("single-flight-key") == "token-of-another-process"
+
+    def test_other_processes_get_the_value_of_the_first_process(self):
+        self.cache.add("single-flight-key", 1)
+        self.cache.set("key", "value")
+        with single_flight(self.cache, "key") as value:
+            assert value == "value"
+
+    @override_settings(SINGLE_FLIGHT_WAIT_TIMEOUT=0.1)
+    def test_other_processes_fall_through_after_waiting(self):
+        self.cache.add("single-flight-key", 1)
+        with single_flight(self.cache, "key") as value:
+            assert value is None
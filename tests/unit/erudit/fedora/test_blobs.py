@@ -0,0 +1,33 @@
+import os
+
+from erudit.fedora.blobs import Blob
+from erudit.fedora.blobs import BlobStore
+
+
+class TestBlobStore:
+    def test_can_store_and_read_a_content(self, tmp_path):
+        blob_store = BlobStore(str(tmp_path), max_size=1000)
+        blob = blob_store.put(b"content")
+        assert blob == Blob(
+            "ed7002b439e9ac845f22357d822bac1444730fbdb6016d3ec9432297b9ec9f73", len(b"content")
+        )
+        assert blob_store.read(blob) == b"content"
+        assert blob_store.open(blob) == str(
+            tmp_path / "ed" / "ed7002b439e9ac845f22357d822bac1444730fbdb6016d3ec9432297b9ec9f73"
+        )
+
+    def test_returns_none_for_blobs_not_in_the_store(self, tmp_path):
+        blob_store = BlobStore(str(tmp_path), max_size=1000)
+        blob = Blob("ed7002b439e9ac845f22357d822bac1444730fbdb6016d3ec9432297b9ec9f73", 7)
+        assert blob_store.open(blob) is None
+        assert blob_store.read(blob) is None
+
+    def test_evicts_the_least_recently_used_contents(self, tmp_path):
+        blob_store = BlobStore(str(tmp_path), max_size=20)
+        blob1 = blob_store.put(b"content1")
+        blob2 = blob_store.put(b"content2")
+        os.utime(blob_store.get_path(blob1), (0, 0))
+        blob3 = blob_store.put(b"content3")
+        assert blob_store.open(blob1) is None
+        assert blob_store.read(blob2) == b"content2"
+        assert blob_store.read(blob3) == b"content3"
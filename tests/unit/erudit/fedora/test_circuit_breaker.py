@@ -0,0 +1,49 @@
+import pytest
+import unittest.mock
+
+from erudit.fedora.circuit_breaker import CircuitBreaker
+from erudit.fedora.circuit_breaker import CircuitBreakerOpen
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        circuit_breaker.record_failure()
+        circuit_breaker.before_request()
+        circuit_breaker.record_failure()
+        assert circuit_breaker.is_open
+        with pytest.raises(CircuitBreakerOpen):
+            circuit_breaker.before_request()
+
+    def test_successes_reset_the_failures(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+        assert not circuit_breaker.is_open
+
+    @unittest.mock.patch("erudit.fedora.circuit_breaker.time.monotonic")
+    def test_lets_a_single_probe_through_after_the_reset_timeout(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        circuit_breaker.record_failure()
+        mock_monotonic.return_value = 131
+        circuit_breaker.before_request()
+        with pytest.raises(CircuitBreakerOpen):
+            circuit_breaker.before_request()
+        circuit_breaker.record_success()
+        assert not circuit_breaker.is_open
+        circuit_breaker.before_request()
+
+    @unittest.mock.patch("erudit.fedora.circuit_breaker.time.monotonic")
+    def test_opens_again_if_the_probe_fails(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        circuit_breaker.record_failure()
+        mock_monotonic.return_value = 131
+        circuit_breaker.before_request()
+        circuit_breaker.record_failure()
+        with pytest.raises(CircuitBreakerOpen):
+            circuit_breaker.before_request()
+        mock_monotonic.return_value = 162
+        circuit_breaker.before_request()
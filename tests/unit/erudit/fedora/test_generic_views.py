@@ -1,9 +1,15 @@
+import datetime as dt
 import unittest.mock
 
 import pytest
+from django.http import FileResponse
 from django.http import Http404
+from django.http import StreamingHttpResponse
 from django.test import RequestFactory
+from django.test import override_settings
 
+from erudit.fedora.blobs import Blob
+from erudit.fedora.blobs import BlobStore
 from erudit.fedora.views.generic import FedoraFileDatastreamView
 from erudit.models import Journal
 from erudit.test.factories import JournalFactory
@@ -142,3 +148,166 @@ class TestFedoraFileDatastreamView:
         # Run & check
         with pytest.raises(Http404):
             view.get_datastream_content()
+
+    @pytest.mark.parametrize("datastream_passthrough", (True, False))
+    def test_can_serve_the_file_of_the_blob_store(self, datastream_passthrough, tmp_path):
+        blob_store = BlobStore(str(tmp_path), max_size=1000)
+        blob = blob_store.put(b"content")
+
+        class MyView(FedoraFileDatastreamView):
+            model = Journal
+            content_type = "application/pdf"
+            datastream_name = "PDF"
+
+            def get_datastream_content(self):
+                return b"dummy"
+
+        MyView.datastream_passthrough = datastream_passthrough
+        request = RequestFactory().get("/")
+        journal = JournalFactory()
+
+        with unittest.mock.patch(
+            "erudit.fedora.views.generic.stream_datastream_content", return_value=blob
+        ), unittest.mock.patch("erudit.fedora.views.generic.blob_store", blob_store):
+            response = MyView.as_view()(request, pk=journal.pk)
+        assert isinstance(response, FileResponse) == datastream_passthrough
+        assert b"".join(response) == (b"content" if datastream_passthrough else b"dummy")
+
+    def test_asks_to_retry_later_if_the_file_of_the_blob_store_is_evicted_again(self, tmp_path):
+        blob_store = BlobStore(str(tmp_path), max_size=1000)
+        evicted_blob = Blob("abcd", 4)
+
+        class MyView(FedoraFileDatastreamView):
+            model = Journal
+            content_type = "application/pdf"
+            datastream_name = "PDF"
+
+            def get_datastream_content(self):
+                return evicted_blob
+
+        request = RequestFactory().get("/")
+        journal = JournalFactory()
+
+        with unittest.mock.patch("erudit.fedora.views.generic.blob_store", blob_store):
+            response = MyView.as_view()(request, pk=journal.pk)
+        assert response.status_code == 503
+        assert response["Retry-After"] == "1"
+        assert response.content == b""
+
+    @override_settings(
+        FEDORA_BLOB_STORE_ROOT="/var/cache/fedora",
+        FEDORA_BLOB_STORE_ACCEL_REDIRECT_URL="/fedora-blobs/",
+    )
+    def test_can_delegate_serving_the_file_of_the_blob_store_to_nginx(self):
+        class MyView(FedoraFileDatastreamView):
+            model = Journal
+            content_type = "application/pdf"
+            datastream_name = "PDF"
+            datastream_passthrough = True
+
+        request = RequestFactory().get("/")
+        journal = JournalFactory()
+
+        with unittest.mock.patch(
+            "erudit.fedora.views.generic.stream_datastream_content",
+            return_value=Blob("abcd", 4),
+        ), unittest.mock.patch(
+            "erudit.fedora.views.generic.blob_store", BlobStore("/var/cache/fedora", 1000)
+        ):
+            response = MyView.as_view()(request, pk=journal.pk)
+        assert response["X-Accel-Redirect"] == "/fedora-blobs/ab/abcd"
+        assert response["Content-Type"] == "application/pdf"
+
+    def test_can_stream_the_content_of_large_datastreams(self):
+        class MyView(FedoraFileDatastreamView):
+            model = Journal
+            content_type = "application/pdf"
+            datastream_name = "PDF"
+            datastream_passthrough = True
+
+        request = RequestFactory().get("/")
+        journal = JournalFactory()
+
+        with unittest.mock.patch(
+            "erudit.fedora.views.generic.stream_datastream_content",
+            return_value=iter([b"con", b"tent"]),
+        ):
+            response = MyView.as_view()(request, pk=journal.pk)
+        assert isinstance(response, StreamingHttpResponse)
+        assert b"".join(response) == b"content"
+
+    def test_can_serve_a_byte_range_of_the_file_of_the_blob_store(self, tmp_path):
+        blob_store = BlobStore(str(tmp_path), max_size=1000)
+        blob = blob_store.put(b"content")
+
+        class MyView(FedoraFileDatastreamView):
+            model = Journal
+            content_type = "application/pdf"
+            datastream_name = "PDF"
+            datastream_passthrough = True
+            accept_byte_ranges = True
+
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=3-")
+        journal = JournalFactory()
+
+        with unittest.mock.patch(
+            "erudit.fedora.views.generic.stream_datastream_content", return_value=blob
+        ) as mock_stream_datastream_content, unittest.mock.patch(
+            "erudit.fedora.views.generic.blob_store", blob_store
+        ):
+            response = MyView.as_view()(request, pk=journal.pk)
+        # The content is not streamed from Fedora when a byte range is requested.
+        assert mock_stream_datastream_content.call_args[1] == {"stream": False}
+        assert response.status_code == 206
+        assert response["Content-Range"] == "bytes 3-6/7"
+        assert b"".join(response) == b"tent"
+
+    def test_provides_validators_when_the_last_modification_date_is_known(self):
+        class MyView(FedoraFileDatastreamView):
+            model = Journal
+            content_type = "application/xml"
+            datastream_name = "SUMMARY"
+
+            def get_datastream_content(self):
+                return b"content"
+
+            def get_last_modified(self):
+                return dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+
+        journal = JournalFactory()
+        response = MyView.as_view()(RequestFactory().get("/"), pk=journal.pk)
+        assert response.status_code == 200
+        assert response["ETag"].startswith('"')
+        assert response["Last-Modified"] == "Wed, 01 Jan 2020 00:00:00 GMT"
+        assert response["Cache-Control"] == "private, no-cache"
+
+        MyView.max_age = 3600
+        response = MyView.as_view()(RequestFactory().get("/"), pk=journal.pk)
+        assert response["Cache-Control"] == "public, max-age=3600"
+
+    @pytest.mark.parametrize(
+        "headers",
+        (
+            {"HTTP_IF_MODIFIED_SINCE": "Wed, 01 Jan 2020 00:00:00 GMT"},
+            {"HTTP_IF_NONE_MATCH": "etag"},
+        ),
+    )
+    def test_answers_conditional_requests_without_getting_the_content(self, headers):
+        class MyView(FedoraFileDatastreamView):
+            model = Journal
+            content_type = "application/xml"
+            datastream_name = "SUMMARY"
+            get_datastream_content = unittest.mock.Mock(return_value=b"content")
+
+            def get_last_modified(self):
+                return dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+
+        journal = JournalFactory()
+        if "HTTP_IF_NONE_MATCH" in headers:
+            response = MyView.as_view()(RequestFactory().get("/"), pk=journal.pk)
+            headers = {"HTTP_IF_NONE_MATCH": response["ETag"]}
+            MyView.get_datastream_content.reset_mock()
+        response = MyView.as_view()(RequestFactory().get("/", **headers), pk=journal.pk)
+        assert response.status_code == 304
+        assert response["Last-Modified"] == "Wed, 01 Jan 2020 00:00:00 GMT"
+        assert not MyView.get_datastream_content.called
@@ -3,6 +3,7 @@ import pytest
 
 import unittest.mock
 
+from django.conf import settings
 from eruditarticle.objects import EruditArticle
 
 from erudit.fedora import repository
@@ -57,8 +58,11 @@ class TestFedoraMixin:
         # Run
         obj.erudit_object
         # Check
-        assert mock_cache.get.call_count == 1
+        # The single-flight lock is also read when it is released, only the content is counted.
+        assert mock_cache.get.call_args_list.count(unittest.mock.call(obj.localidentifier)) == 1
         assert mock_cache.set.call_count == 1
+        key, cached_content, timeout = mock_cache.set.call_args[0]
+        assert timeout == settings.FEDORA_CACHE_TIMEOUT + settings.FEDORA_STALE_CACHE_TIMEOUT
 
     @unittest.mock.patch("erudit.fedora.cache.cache")
     def test_can_fetch_the_xml_content_from_the_cache_if_applicable(self, mock_cache):
@@ -83,3 +87,23 @@ class TestFedoraMixin:
         mock_name, call_args, call_kwargs = mock_cache.set.mock_calls[0]
         key, content, duration = call_args
         assert key == model.localidentifier
+
+    @unittest.mock.patch("erudit.fedora.cache.cache")
+    def test_can_set_the_datastream_list_in_the_cache_if_it_is_not_there_already(self, mock_cache):
+        mock_cache.get.return_value = None
+        obj = DummyModel()
+        assert obj.has_datastream("ERUDITXSD300")
+        assert not obj.has_datastream("PDF")
+        key, cached_content, _ = mock_cache.set.call_args[0]
+        assert key == "erudit-fedora-datastreams-erudit:erudit.ae49.ae3958.045074ar"
+        # The single-flight lock is also read when it is released, only the list is counted.
+        assert mock_cache.get.call_args_list.count(unittest.mock.call(key)) == 1
+        assert cached_content.content == obj.datastream_list
+
+    @unittest.mock.patch("erudit.fedora.cache.cache")
+    def test_can_fetch_the_datastream_list_from_the_cache_if_applicable(self, mock_cache):
+        mock_cache.get.return_value = {"PDF": "application/pdf"}
+        obj = DummyModel()
+        assert obj.has_datastream("PDF")
+        assert not obj.has_datastream("ERUDITXSD300")
+        assert mock_cache.set.call_count == 0
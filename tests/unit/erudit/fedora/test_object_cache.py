@@ -0,0 +1,50 @@
+import unittest.mock
+
+from erudit.fedora.object_cache import EruditObjectCache
+
+
+class TestEruditObjectCache:
+    def test_parses_the_content_only_once(self):
+        cache = EruditObjectCache(max_entries=10, max_size=1000)
+        parse = unittest.mock.Mock(side_effect=lambda content: object())
+        erudit_object = cache.get("pid", b"<article/>", parse)
+        assert cache.get("pid", b"<article/>", parse) is erudit_object
+        assert parse.call_count == 1
+
+    def test_parses_new_versions_of_the_content(self):
+        cache = EruditObjectCache(max_entries=10, max_size=1000)
+        parse = unittest.mock.Mock(side_effect=lambda content: object())
+        erudit_object = cache.get("pid", b"<article/>", parse)
+        assert cache.get("pid", b"<article></article>", parse) is not erudit_object
+        assert parse.call_count == 2
+        # The object parsed from the previous version of the content is not kept.
+        assert len(cache) == 1
+        assert cache.size == len(b"<article></article>")
+
+    def test_evicts_the_least_recently_used_objects_when_there_are_too_many_objects(self):
+        cache = EruditObjectCache(max_entries=2, max_size=1000)
+        parse = unittest.mock.Mock(side_effect=lambda content: object())
+        cache.get("pid1", b"<article/>", parse)
+        cache.get("pid2", b"<article/>", parse)
+        cache.get("pid1", b"<article/>", parse)
+        cache.get("pid3", b"<article/>", parse)
+        assert parse.call_count == 3
+        cache.get("pid1", b"<article/>", parse)
+        assert parse.call_count == 3
+        cache.get("pid2", b"<article/>", parse)
+        assert parse.call_count == 4
+
+    def test_evicts_the_least_recently_used_objects_when_the_contents_are_too_large(self):
+        cache = EruditObjectCache(max_entries=10, max_size=25)
+        parse = unittest.mock.Mock(side_effect=lambda content: object())
+        cache.get("pid1", b"<article/>", parse)
+        cache.get("pid2", b"<article/>", parse)
+        cache.get("pid3", b"<article/>", parse)
+        assert len(cache) == 2
+        assert cache.size == 20
+
+    def test_does_not_cache_contents_larger_than_the_maximum_size(self):
+        cache = EruditObjectCache(max_entries=10, max_size=5)
+        parse = unittest.mock.Mock(side_effect=lambda content: object())
+        cache.get("pid", b"<article/>", parse)
+        assert len(cache) == 0
@@ -0,0 +1,49 @@
+from unittest import mock
+
+import pytest
+import requests
+from requests.exceptions import ChunkedEncodingError
+
+from erudit.fedora.session import adapter, session, FedoraHTTPAdapter, TIMEOUT
+
+
+@mock.patch("requests.Session.request")
+def test_session_uses_default_timeout(mock_request):
+    session.request("GET", "http://erudit.org/objects")
+    mock_request.assert_called_once_with("GET", "http://erudit.org/objects", timeout=TIMEOUT)
+
+
+@mock.patch("requests.Session.request")
+def test_session_timeout_can_be_overridden(mock_request):
+    session.request("GET", "http://erudit.org/objects", timeout=1)
+    mock_request.assert_called_once_with("GET", "http://erudit.org/objects", timeout=1)
+
+
+def test_session_retries_only_idempotent_requests():
+    assert adapter.max_retries.allowed_methods == {"GET", "HEAD"}
+    assert session.get_adapter("https://erudit.org/") is adapter
+
+
+@mock.patch("requests.adapters.HTTPAdapter.send")
+def test_adapter_records_any_error_as_a_failure(mock_send):
+    fedora_adapter = FedoraHTTPAdapter()
+    fedora_adapter.circuit_breaker.failure_threshold = 1
+    mock_send.side_effect = ChunkedEncodingError
+    request = requests.Request("GET", "http://erudit.org/objects").prepare()
+    with pytest.raises(ChunkedEncodingError):
+        fedora_adapter.send(request)
+    assert fedora_adapter.circuit_breaker.is_open
+    assert not fedora_adapter.circuit_breaker.probing
+
+
+@mock.patch("requests.adapters.HTTPAdapter.send")
+def test_adapter_only_records_gateway_errors_as_failures(mock_send):
+    fedora_adapter = FedoraHTTPAdapter()
+    fedora_adapter.circuit_breaker.failure_threshold = 1
+    request = requests.Request("GET", "http://erudit.org/objects").prepare()
+    mock_send.return_value = mock.Mock(status_code=500)
+    fedora_adapter.send(request)
+    assert not fedora_adapter.circuit_breaker.is_open
+    mock_send.return_value = mock.Mock(status_code=503)
+    fedora_adapter.send(request)
+    assert fedora_adapter.circuit_breaker.is_open
@@ -1,7 +1,19 @@
+import pytest
 import unittest.mock
 
+from django.conf import settings
+from django.test import override_settings
+from requests.exceptions import ConnectionError
+
 from erudit.fedora import repository
+from erudit.fedora.blobs import Blob
+from erudit.fedora.blobs import BlobStore
+from erudit.fedora.cache import CachedContent
+from erudit.fedora.cache import MISSING_DATASTREAM
+from erudit.fedora.cache import fetch_datastream_content
 from erudit.fedora.cache import get_cached_datastream_content
+from erudit.fedora.cache import get_cached_derived_content
+from erudit.fedora.cache import stream_datastream_content
 
 
 def test_can_set_the_content_of_the_file_in_the_cache_if_it_is_not_there_already():
@@ -15,8 +27,68 @@ def test_can_set_the_content_of_the_file_in_the_cache_if_it_is_not_there_already
     with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache:
         mock_cache.get.return_value = None
         get_cached_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY")
-        assert mock_cache.get.call_count == 1
+        # The single-flight lock is also read when it is released, only the content is counted.
+        assert mock_cache.get.call_args_list.count(
+            unittest.mock.call("erudit-fedora-file-erudit:erudit.foo123.bar456-SUMMARY")
+        ) == 1
         assert mock_cache.set.call_count == 1
+        key, cached_content, timeout = mock_cache.set.call_args[0]
+        assert cached_content.content == b"dummy"
+        # The content is kept after it expires, to be served if Fedora is unavailable.
+        assert timeout == settings.FEDORA_CACHE_TIMEOUT + settings.FEDORA_STALE_CACHE_TIMEOUT
+
+
+@override_settings(FEDORA_STALE_CACHE_TIMEOUT=0)
+def test_does_not_keep_the_content_after_it_expires_if_stale_contents_are_disabled():
+    repository.api.register_pid("erudit:erudit.foo123.bar456")
+    repository.api.register_datastream(
+        "erudit:erudit.foo123.bar456",
+        "/SUMMARY/content",
+        "dummy",
+    )
+
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache:
+        mock_cache.get.return_value = None
+        get_cached_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY")
+        mock_cache.set.assert_called_once_with(
+            "erudit-fedora-file-erudit:erudit.foo123.bar456-SUMMARY",
+            b"dummy",
+            settings.FEDORA_CACHE_TIMEOUT,
+        )
+
+
+def test_does_not_keep_large_files_after_they_expire_if_there_is_no_blob_store():
+    repository.api.register_pid("erudit:erudit.foo123.bar456")
+    repository.api.register_datastream(
+        "erudit:erudit.foo123.bar456",
+        "/PDF/content",
+        "dummy",
+    )
+
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.blob_store", None
+    ):
+        mock_cache.get.return_value = None
+        get_cached_datastream_content("erudit:erudit.foo123.bar456", "PDF")
+        mock_cache.set.assert_called_once_with(
+            "erudit-fedora-file-erudit:erudit.foo123.bar456-PDF",
+            b"dummy",
+            settings.FEDORA_CACHE_TIMEOUT,
+        )
+
+
+def test_fetches_the_content_of_the_file_again_once_it_expires():
+    repository.api.register_pid("erudit:erudit.foo123.bar456")
+    repository.api.register_datastream(
+        "erudit:erudit.foo123.bar456",
+        "/SUMMARY/content",
+        "fresh",
+    )
+
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache:
+        mock_cache.get.return_value = CachedContent(b"expired", 0)
+        mock_cache.add.return_value = True
+        assert get_cached_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY") == b"fresh"
 
 
 def test_can_use_the_content_of_the_file_in_the_cache_if_applicable():
@@ -32,3 +104,164 @@ def test_can_use_the_content_of_the_file_in_the_cache_if_applicable():
         get_cached_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY")
         assert mock_cache.get.call_count == 1
         assert mock_cache.set.call_count == 0
+
+
+def test_fetches_the_content_of_the_file_again_if_its_blob_is_evicted_before_it_is_read(tmp_path):
+    repository.api.register_pid("erudit:erudit.foo123.bar456")
+    repository.api.register_datastream(
+        "erudit:erudit.foo123.bar456",
+        "/PDF/content",
+        "dummy",
+    )
+    blob_store = BlobStore(str(tmp_path), max_size=1000)
+    evicted_blob = blob_store.put(b"evicted")
+    read = blob_store.read
+
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.blob_store", blob_store
+    ), unittest.mock.patch.object(
+        blob_store, "read", side_effect=lambda blob: None if blob == evicted_blob else read(blob)
+    ):
+        mock_cache.get.return_value = evicted_blob
+        assert get_cached_datastream_content("erudit:erudit.foo123.bar456", "PDF") == b"dummy"
+
+
+def test_caches_the_absence_of_the_file_if_it_is_not_in_fedora():
+    repository.api.register_pid("erudit:erudit.foo123.bar456")
+
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache:
+        mock_cache.get.return_value = None
+        assert get_cached_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY") is None
+        mock_cache.set.assert_called_once_with(
+            "erudit-fedora-file-erudit:erudit.foo123.bar456-SUMMARY",
+            MISSING_DATASTREAM,
+            settings.FEDORA_NEGATIVE_CACHE_TIMEOUT,
+        )
+
+
+def test_does_not_query_fedora_if_the_absence_of_the_file_is_cached():
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.session"
+    ) as mock_session:
+        mock_cache.get.return_value = MISSING_DATASTREAM
+        assert get_cached_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY") is None
+        assert mock_session.get.call_count == 0
+        assert mock_cache.set.call_count == 0
+
+
+def test_serves_the_stale_copy_of_the_file_if_fedora_is_unavailable():
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.session"
+    ) as mock_session:
+        mock_cache.get.return_value = CachedContent(b"stale", 0)
+        mock_cache.add.return_value = True
+        mock_session.get.side_effect = ConnectionError
+        content = get_cached_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY")
+        assert content == b"stale"
+
+
+def test_raises_if_fedora_is_unavailable_and_there_is_no_stale_copy_of_the_file():
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.session"
+    ) as mock_session:
+        mock_cache.get.return_value = None
+        mock_session.get.side_effect = ConnectionError
+        with pytest.raises(ConnectionError):
+            get_cached_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY")
+
+
+@override_settings(FEDORA_STREAMING_THRESHOLD=3)
+def test_streams_the_content_of_large_files_without_caching_it_if_there_is_no_blob_store():
+    repository.api.register_pid("erudit:erudit.foo123.bar456")
+    repository.api.register_datastream(
+        "erudit:erudit.foo123.bar456",
+        "/SUMMARY/content",
+        b"dummy",
+    )
+
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache:
+        mock_cache.get.return_value = None
+        content = stream_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY")
+        assert not isinstance(content, bytes)
+        assert b"".join(content) == b"dummy"
+        assert mock_cache.set.call_count == 0
+
+
+@override_settings(FEDORA_STREAMING_THRESHOLD=3, FEDORA_BLOB_DATASTREAMS=["PDF"])
+def test_streams_the_content_of_large_files_and_caches_it_once_it_is_entirely_streamed(tmp_path):
+    repository.api.register_pid("erudit:erudit.foo123.bar456")
+    repository.api.register_datastream(
+        "erudit:erudit.foo123.bar456",
+        "/PDF/content",
+        b"dummy",
+    )
+    blob_store = BlobStore(str(tmp_path), max_size=1000)
+
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.blob_store", blob_store
+    ):
+        mock_cache.get.return_value = None
+        content = stream_datastream_content("erudit:erudit.foo123.bar456", "PDF")
+        assert not isinstance(content, bytes)
+        assert mock_cache.set.call_count == 0
+        assert b"".join(content) == b"dummy"
+        key, cached_content, _ = mock_cache.set.call_args[0]
+    assert key == "erudit-fedora-file-erudit:erudit.foo123.bar456-PDF"
+    assert blob_store.read(cached_content.content) == b"dummy"
+
+
+def test_fetches_the_content_of_the_file_without_caching_it():
+    repository.api.register_pid("erudit:erudit.foo123.bar456")
+    repository.api.register_datastream(
+        "erudit:erudit.foo123.bar456",
+        "/PDF/content",
+        "dummy",
+    )
+
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache:
+        mock_cache.get.return_value = None
+        assert fetch_datastream_content("erudit:erudit.foo123.bar456", "PDF") == b"dummy"
+        assert fetch_datastream_content("erudit:erudit.foo123.bar456", "SUMMARY") is None
+        assert mock_cache.set.call_count == 0
+
+
+def test_fetches_the_content_of_the_file_from_the_cache_if_it_is_there_already():
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.session"
+    ) as mock_session:
+        mock_cache.get.return_value = CachedContent(b"expired", 0)
+        assert fetch_datastream_content("erudit:erudit.foo123.bar456", "PDF") == b"expired"
+        assert mock_session.get.call_count == 0
+
+
+def test_generates_derived_contents_only_if_they_are_not_cached(tmp_path):
+    blob_store = BlobStore(str(tmp_path), max_size=1000)
+    get_content = unittest.mock.Mock(return_value=b"content")
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.blob_store", blob_store
+    ):
+        mock_cache.get.return_value = None
+        blob = get_cached_derived_content("key", get_content, pids=["pid"])
+        mock_cache.set.assert_called_once_with("key", blob, settings.FEDORA_CACHE_TIMEOUT)
+
+        mock_cache.get.return_value = blob
+        assert get_cached_derived_content("key", get_content, pids=["pid"]) == blob
+    assert get_content.call_count == 1
+
+
+def test_does_not_cache_derived_contents_if_there_is_no_blob_store():
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache:
+        assert get_cached_derived_content("key", lambda: b"content", pids=["pid"]) == b"content"
+        assert mock_cache.get.call_count == 0
+        assert mock_cache.set.call_count == 0
+
+
+def test_stores_derived_contents_in_the_blob_store(tmp_path):
+    blob_store = BlobStore(str(tmp_path), max_size=1000)
+    with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache, unittest.mock.patch(
+        "erudit.fedora.cache.blob_store", blob_store
+    ):
+        mock_cache.get.return_value = None
+        blob = get_cached_derived_content("key", lambda: b"content", pids=["pid"])
+    assert isinstance(blob, Blob)
+    assert blob_store.read(blob) == b"content"
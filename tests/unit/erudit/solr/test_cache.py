@@ -0,0 +1,66 @@
+import unittest.mock
+
+import pytest
+
+from erudit.solr.cache import cached_search
+from erudit.solr.cache import get_search_cache_key
+
+
+class TestGetSearchCacheKey:
+    def test_same_key_for_equivalent_requests(self):
+        assert get_search_cache_key(
+            "http://solr/",
+            "Titre:foo   AND  Auteur:bar",
+            {"fq": ["Corpus_fac:Article", "Fonds_fac:Érudit"], "rows": 10},
+        ) == get_search_cache_key(
+            "http://solr/",
+            " Titre:foo AND Auteur:bar",
+            {"rows": "10", "fq": ["Fonds_fac:Érudit", "Corpus_fac:Article"]},
+        )
+
+    @pytest.mark.parametrize(
+        "solr_url, q, params",
+        (
+            ("http://other-solr/", "Titre:foo", {"rows": 10, "sort": ["Annee desc", "ID asc"]}),
+            ("http://solr/", "Titre:bar", {"rows": 10, "sort": ["Annee desc", "ID asc"]}),
+            ("http://solr/", "Titre:foo", {"rows": 20, "sort": ["Annee desc", "ID asc"]}),
+            ("http://solr/", "Titre:foo", {"rows": 10, "sort": ["ID asc", "Annee desc"]}),
+        ),
+    )
+    def test_different_keys_for_different_requests(self, solr_url, q, params):
+        assert get_search_cache_key(
+            "http://solr/", "Titre:foo", {"rows": 10, "sort": ["Annee desc", "ID asc"]}
+        ) != get_search_cache_key(solr_url, q, params)
+
+
+class TestCachedSearch:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.CACHES = settings.LOCMEM_CACHES
+        settings.SOLR_CACHE_TIMEOUTS = {"search": 60}
+        settings.SOLR_CACHE_MAX_SIZE = 1024
+
+    def get_client(self, results):
+        client = unittest.mock.Mock(url="http://solr/")
+        client.search.return_value = results
+        return client
+
+    def test_caches_results(self):
+        client = self.get_client({"hits": 1})
+        assert cached_search("search", client, "Titre:foo", rows=10) == {"hits": 1}
+        assert cached_search("search", client, "Titre:foo", rows=10) == {"hits": 1}
+        assert client.search.call_count == 1
+        cached_search("search", client, "Titre:bar", rows=10)
+        assert client.search.call_count == 2
+
+    def test_does_not_cache_results_of_call_sites_without_timeout(self):
+        client = self.get_client({"hits": 1})
+        cached_search("theses", client, "Titre:foo")
+        cached_search("theses", client, "Titre:foo")
+        assert client.search.call_count == 2
+
+    def test_does_not_cache_large_results(self):
+        client = self.get_client({"docs": ["x" * 2048]})
+        cached_search("search", client, "Titre:foo")
+        cached_search("search", client, "Titre:foo")
+        assert client.search.call_count == 2
@@ -0,0 +1,26 @@
+import unittest.mock
+
+from erudit.solr import client as solr_client
+
+# The tests use a fake Solr client, keep the function creating the actual clients.
+create_client = solr_client._create_client
+
+
+class TestGetClient:
+    def test_creates_one_client_per_call_site(self, monkeypatch):
+        create_client = unittest.mock.Mock(side_effect=lambda call_site: object())
+        monkeypatch.setattr(solr_client, "_create_client", create_client)
+        assert solr_client.get_client("search") is solr_client.get_client("search")
+        assert solr_client.get_client("search") is not solr_client.get_client("theses")
+        assert create_client.call_count == 2
+
+    def test_clients_share_the_same_session(self, monkeypatch):
+        monkeypatch.setattr(solr_client, "_session", None)
+        search_client = create_client("search")
+        theses_client = create_client("theses")
+        assert search_client.call_site == "search"
+        assert theses_client.call_site == "theses"
+        assert search_client.session is theses_client.session
+        assert isinstance(
+            search_client.session.get_adapter("http://solr/"), solr_client.SolrHTTPAdapter
+        )
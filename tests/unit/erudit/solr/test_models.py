@@ -1,9 +1,18 @@
+import unittest.mock
+
 import pytest
 
+from django.conf import settings
 from django.test import override_settings
 
-from erudit.models.journal import Article
-from erudit.solr.models import ExternalArticle, InternalArticle, SolrDocument
+from erudit.models.journal import Article, Issue
+from erudit.solr.models import (
+    Book,
+    ExternalArticle,
+    InternalArticle,
+    SolrDocument,
+    get_model_instances,
+)
 from erudit.test.factories import IssueFactory, JournalFactory
 
 
@@ -287,3 +296,56 @@ class TestInternalArticle:
             issue,
         )
         assert article.can_cite == has_fedora_created
+
+
+@pytest.mark.django_db
+class TestGetModelInstances:
+    def test_fetches_issues_and_journals_in_two_queries(self, django_assert_num_queries):
+        issue_1 = IssueFactory(journal__code="journal1", localidentifier="issue1")
+        issue_2 = IssueFactory(journal__code="journal2", localidentifier="issue2")
+        JournalFactory(code="persee", localidentifier="perseejournal3")
+        solr_documents = [
+            {
+                "ID": "article1",
+                "Corpus_fac": "Article",
+                "RevueID": "journal1",
+                "NumeroID": "issue1",
+            },
+            {"ID": "book", "Corpus_fac": "Livres"},
+            {
+                "ID": "article2",
+                "Corpus_fac": "Article",
+                "RevueID": "journal2",
+                "NumeroID": "issue2",
+            },
+            {
+                "ID": "article3",
+                "Corpus_fac": "Article",
+                "Fonds_fac": "Persée",
+                "RevueID": "journal3",
+                "NumeroID": "issue3",
+            },
+        ]
+        with unittest.mock.patch.object(
+            Issue, "is_in_fedora", new_callable=unittest.mock.PropertyMock, return_value=False
+        ), django_assert_num_queries(2):
+            article_1, book, article_2, article_3 = get_model_instances(solr_documents)
+            assert article_1.issue == issue_1
+            assert article_1.journal_url == "/fr/revues/journal1/"
+            assert isinstance(book, Book)
+            assert article_2.issue == issue_2
+            assert isinstance(article_3, ExternalArticle)
+            assert article_3.journal_url == "/fr/revues/persee/"
+
+    @override_settings(CACHES=settings.LOCMEM_CACHES)
+    def test_remembers_issues_that_are_not_in_fedora(self):
+        JournalFactory(code="journal")
+        solr_documents = [
+            {"ID": "article", "Corpus_fac": "Article", "RevueID": "journal", "NumeroID": "issue"},
+        ]
+        with unittest.mock.patch.object(
+            Issue, "is_in_fedora", new_callable=unittest.mock.PropertyMock, return_value=False
+        ) as is_in_fedora:
+            assert isinstance(get_model_instances(solr_documents)[0], ExternalArticle)
+            assert isinstance(get_model_instances(solr_documents)[0], ExternalArticle)
+        assert is_in_fedora.call_count == 1
@@ -4,8 +4,13 @@ import pytest
 from django.core.management import call_command
 from erudit.fedora import repository
 
-from erudit.test.factories import IssueFactory, CollectionFactory, JournalTypeFactory
-from erudit.models import Journal
+from erudit.test.factories import (
+    ArticleFactory,
+    IssueFactory,
+    CollectionFactory,
+    JournalTypeFactory,
+)
+from erudit.models import ArticlePdf, Journal
 
 
 pytestmark = pytest.mark.django_db
@@ -81,3 +86,20 @@ def test_import_nonexisting_journal_creates_code():
     repository.api.register_pid("erudit:erudit.bc1000004.bc1000451")
     call_command("import_journals_from_fedora", *[], **{"pid": "erudit:erudit.bc1000004"})
     assert Journal.objects.filter(code="bc").exists()
+
+
+def test_import_journals_from_fedora_records_article_pdfs():
+    issue = IssueFactory(journal__localidentifier="journal_test", add_to_fedora_journal=True)
+    article_1 = ArticleFactory(issue=issue, with_pdf=True)
+    ArticleFactory(issue=issue)
+    # The PDF of an article that is no longer in the issue should be forgotten.
+    ArticlePdf.objects.create(
+        issue=issue, localidentifier="removed", datastream_name="PDF", size=1, page_count=1
+    )
+
+    call_command("import_journals_from_fedora", *[], **{"pid": "erudit:erudit.journal_test"})
+
+    pdf_info = ArticlePdf.objects.get(issue=issue)
+    assert pdf_info.localidentifier == article_1.localidentifier
+    assert pdf_info.datastream_name == "PDF"
+    assert pdf_info.page_count == 15
@@ -9,7 +9,7 @@ from eruditarticle.objects import EruditJournal
 from eruditarticle.objects import EruditPublication
 from eruditarticle.objects import EruditArticle
 
-from erudit.models import Issue, Article
+from erudit.models import Issue, Article, ArticlePdf
 from erudit.fedora import modelmixins
 from erudit.fedora import repository
 from erudit.test.factories import (
@@ -641,6 +641,49 @@ class TestArticle:
         article = ArticleFactory()
         assert article.pdf_url is None
 
+    def test_can_display_first_pdf_page_from_recorded_pdf_info(self, monkeypatch):
+        article = ArticleFactory(with_pdf=True)
+        ArticlePdf.objects.create(
+            issue=article.issue,
+            localidentifier=article.localidentifier,
+            datastream_name="PDF",
+            size=1234,
+            page_count=1,
+        )
+        get_pdf_page_count = unittest.mock.Mock()
+        monkeypatch.setattr("erudit.models.journal.get_pdf_page_count", get_pdf_page_count)
+        assert not article.can_display_first_pdf_page
+        assert not get_pdf_page_count.called
+
+    def test_can_display_first_pdf_page_computes_missing_pdf_info_without_recording_it(self):
+        article = ArticleFactory(with_pdf=True)
+        assert article.can_display_first_pdf_page
+        assert article.pdf_info.datastream_name == "PDF"
+        assert article.pdf_info.size == len(article.pdf)
+        assert article.pdf_info.page_count == 15
+        assert not ArticlePdf.objects.exists()
+
+    def test_can_display_first_pdf_page_of_an_article_of_an_issue_that_is_not_imported(self):
+        imported_article = ArticleFactory(with_pdf=True)
+        issue = Issue(
+            journal=imported_article.issue.journal,
+            localidentifier=imported_article.issue.localidentifier,
+        )
+        article = Article(issue, imported_article.localidentifier)
+        assert article.can_display_first_pdf_page
+        assert not ArticlePdf.objects.exists()
+
+    def test_records_pdf_info_without_caching_the_pdf(self):
+        article = ArticleFactory(with_pdf=True)
+        with unittest.mock.patch("erudit.fedora.cache.cache") as mock_cache:
+            mock_cache.get.return_value = None
+            pdf_info = article.record_pdf_info()
+        assert pdf_info.page_count == 15
+        assert ArticlePdf.objects.get(localidentifier=article.localidentifier) == pdf_info
+        assert f"erudit-fedora-file-{article.pid}-PDF" not in [
+            call[0][0] for call in mock_cache.set.call_args_list
+        ]
+
     def test_pdf_url_when_fedora_pdf(self):
         article = ArticleFactory(with_pdf=True)
         assert article.pdf_url
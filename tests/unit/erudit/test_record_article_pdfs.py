@@ -0,0 +1,49 @@
+import pytest
+
+from django.core.management import call_command
+
+from erudit.test.factories import ArticleFactory, IssueFactory
+from erudit.models import ArticlePdf
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_record_article_pdfs_records_the_pdfs_of_the_issues_that_are_already_imported():
+    issue = IssueFactory()
+    article = ArticleFactory(issue=issue, with_pdf=True)
+    ArticleFactory(issue=issue)
+
+    call_command("record_article_pdfs")
+
+    pdf_info = ArticlePdf.objects.get(issue=issue)
+    assert pdf_info.localidentifier == article.localidentifier
+    assert pdf_info.page_count == 15
+
+
+@pytest.mark.parametrize("kwargs, recorded_again", [({}, False), ({"all": True}, True)])
+def test_record_article_pdfs_handles_the_issues_whose_pdfs_are_recorded_only_if_asked(
+    kwargs, recorded_again
+):
+    article = ArticleFactory(with_pdf=True)
+    ArticlePdf.objects.create(
+        issue=article.issue,
+        localidentifier=article.localidentifier,
+        datastream_name="PDF",
+        size=1,
+        page_count=1,
+    )
+
+    call_command("record_article_pdfs", **kwargs)
+
+    assert (ArticlePdf.objects.get(issue=article.issue).page_count == 15) == recorded_again
+
+
+def test_record_article_pdfs_can_handle_a_single_issue():
+    article_1 = ArticleFactory(with_pdf=True)
+    article_2 = ArticleFactory(with_pdf=True)
+
+    call_command("record_article_pdfs", issue_pid=article_1.issue.pid)
+
+    assert ArticlePdf.objects.filter(issue=article_1.issue).exists()
+    assert not ArticlePdf.objects.filter(issue=article_2.issue).exists()